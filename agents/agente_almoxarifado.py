@@ -1,12 +1,79 @@
 # Arquivo: agents/agente_almoxarifado.py
 
+import os
+import time
+from collections import OrderedDict
+
 from aima.agents import Agent
-from aima.search import astar_search
-from problems.problema_almoxarifado import ProblemaAlmoxarifado
+from aima.search import (
+    Node, ProfiledProblem, SearchResult, astar_search_steps,
+    bidirectional_astar_search, anytime_astar_search, finish_search, ida_star_search,
+)
+from problems.problema_almoxarifado import ProblemaAlmoxarifado, ProblemaMultiAlvo, faces_de_acesso
+from problems.grade_almoxarifado import prateleira_mais_proxima
+from problems.adjacencia_csr import AdjacenciaCSR
+from problems.campo_distancias import CampoDistancias
+from problems.jps_almoxarifado import jps_busca
+from problems.hpa_almoxarifado import HierarquiaAlmoxarifado
+from problems.dstar_almoxarifado import DStarLite
+from problems.marcos_alt import MarcosALT
+from problems.heuristica_perfeita import HeuristicaPerfeita
+from agents.cache_caminhos import CacheCaminhos
+from agents.perfil_buscas import VARIAVEL_PERFIL, PerfilBuscas, medir_passos
+
+# Planejadores de rota disponíveis para _buscar_caminho:
+#   'astar' -> astar_search do AIMA sobre ProblemaAlmoxarifado (referência)
+#   'grade' -> A* nativo da grade com ids inteiros, sobre a tabela CSR de vizinhos do layout
+#   'campo' -> campos de distância (BFS vetorizada) + descida de gradiente
+#   'jps'   -> Jump Point Search (corredores longos, custo uniforme)
+#   'hpa'   -> HPA* hierárquico (pisos muito grandes; quase ótimo)
+#   'bidirecional' -> A* bidirecional (MM) do AIMA, encontrando-se no meio
+#   'dstar' -> D* Lite incremental: uma busca viva por alvo, reparada quando o layout muda
+#   'alt'   -> astar_search com a heurística ALT (marcos), em vez da Manhattan
+#   'perfeita' -> astar_search com h exata (campo reverso do alvo, em cache por alvo)
+#   'anytime' -> ARA*: plano epsilon-subótimo rápido, melhorado até o prazo da decisão
+#   'ida'   -> IDA* iterativo com tabela de transposição limitada (memória limitada, ótimo)
+PLANEJADORES = ('astar', 'grade', 'campo', 'jps', 'hpa', 'bidirecional', 'dstar', 'alt',
+                'perfeita', 'anytime', 'ida')
+# Planejadores próprios da grade (sem Problem do aima)
+PLANEJADORES_GRADE = ('grade', 'campo', 'jps', 'hpa', 'dstar')
+# Planejadores que aceitam estados_compactos (buscas do aima com a h do problema)
+PLANEJADORES_COMPACTOS = ('astar', 'bidirecional', 'anytime', 'ida')
+
+# Quantos campos de distância o planejador 'campo' mantém em memória
+MAX_CAMPOS = 8
+# Lado (em células) dos clusters do planejador 'hpa'
+TAMANHO_CLUSTER = 16
+# Quantas buscas D* Lite (uma por alvo) o planejador 'dstar' mantém vivas
+MAX_BUSCAS_DSTAR = 8
+# Marcos iniciais do planejador 'alt' (outros são criados nos alvos mal estimados)
+MARCOS_INICIAIS = 4
+# Quantos alvos frequentes o planejador 'perfeita' mantém com campo reverso
+ALVOS_HEURISTICA_PERFEITA = 8
+# Padrões do planejador 'anytime': tempo por decisão (s) e inflação inicial da heurística
+PRAZO_DECISAO = 0.05
+EPSILON_INICIAL = 2.5
+# Deslocamento (dx, dy) de cada ação de movimento
+DESLOCAMENTOS = {'N': (0, -1), 'S': (0, 1), 'O': (-1, 0), 'L': (1, 0)}
+# Estados guardados na tabela de transposição do planejador 'ida'
+TAMANHO_TABELA_IDA = 100_000
+# Quantos planos o cache LRU de rotas guarda (0 desliga o cache)
+TAMANHO_CACHE_CAMINHOS = 256
+# Resposta de _buscar_caminho quando a busca limitada por max_expansoes desistiu
+# do alvo: não é "sem caminho" e não vai para o cache
+ORCAMENTO_ESGOTADO = 'orcamento esgotado'
+# Expansões do A* entre duas pausas de decidir_em_passos (devolve o controle ao laço de eventos)
+EXPANSOES_POR_FATIA = 500
 
 class AgenteAlmoxarifado(Agent):
-    def __init__(self, pos_inicial, dados_prateleiras, pos_entrega, largura_grid, altura_grid):
+    def __init__(self, pos_inicial, dados_prateleiras, pos_entrega, largura_grid, altura_grid,
+                 planejador='astar', tamanho_cache=TAMANHO_CACHE_CAMINHOS,
+                 prazo_decisao=PRAZO_DECISAO, epsilon=EPSILON_INICIAL, max_expansoes=None,
+                 expansoes_por_fatia=EXPANSOES_POR_FATIA, perfil=None, estados_compactos=False):
         super().__init__(self.programa_agente)
+        if planejador not in PLANEJADORES:
+            raise ValueError(f"Planejador deve ser um de {PLANEJADORES}, recebido {planejador!r}.")
+        self.planejador = planejador
         self.largura_grid = largura_grid
         self.altura_grid = altura_grid
         # dados_prateleiras é um dicionário {(x,y): quantidade}
@@ -18,33 +85,348 @@ class AgenteAlmoxarifado(Agent):
         self._inacessiveis = set()
         # Sinaliza ao ambiente que não há mais nada a fazer (layout impossível)
         self.missao_impossivel = False
+        # Campos de distância por origem, válidos para um conjunto de obstáculos
+        self._campos = OrderedDict()
+        self._obstaculos_campos = None
+        # Tabela CSR de vizinhos do planejador 'grade', corrigida quando o layout muda
+        self._adjacencia = None
+        self._obstaculos_adjacencia = set()
+        self._versao_adjacencia = None
+        # Hierarquia HPA* mantida viva entre decisões
+        self._hierarquia = None
+        self._obstaculos_hierarquia = set()
+        # Buscas D* Lite por alvo, todas sobre o mesmo conjunto de prateleiras
+        self._buscas_dstar = OrderedDict()
+        self._obstaculos_dstar = set()
+        # Marcos ALT do layout atual
+        self._marcos = None
+        self._obstaculos_marcos = None
+        # Campos reversos dos alvos frequentes (heurística exata)
+        self._heuristica_perfeita = HeuristicaPerfeita(ALVOS_HEURISTICA_PERFEITA)
+        # Orçamento do 'anytime': prazo_decisao vale para todas as buscas de uma decisão
+        self.prazo_decisao = prazo_decisao
+        self.epsilon = epsilon
+        self._prazo = None
+        # Plano do 'anytime' cortado pelo prazo antes de epsilon = 1: não vai para o cache
+        self._rota_provisoria = False
+        # Planos já calculados por (início, alvo, versão do layout)
+        self.cache_caminhos = CacheCaminhos(tamanho_cache)
+        self._versao_percebida = None
+        # Limite de expansões por prateleira candidata nos planejadores sobre astar_search
+        # ('astar', 'alt', 'perfeita'); None busca sem limite
+        self.max_expansoes = max_expansoes
+        self.expansoes_por_fatia = expansoes_por_fatia
+        # Perfil das buscas (PerfilBuscas) ou None; sem o parâmetro, segue a variável de ambiente
+        if perfil is None:
+            perfil = bool(os.environ.get(VARIAVEL_PERFIL))
+        self.perfil = PerfilBuscas() if perfil else None
+        self._problema_medido = None
+        # Estados inteiros (ProblemaAlmoxarifadoCompacto) nos planejadores que usam a
+        # heurística do próprio problema; 'alt' e 'perfeita' leem (x, y) das tuplas
+        self.estados_compactos = estados_compactos
+
+    def _campo(self, origem):
+        """Retorna o campo de distâncias a partir de origem sobre o mapa de prateleiras.
+
+        Os campos são reaproveitados entre decisões (no máximo MAX_CAMPOS, saindo
+        o usado há mais tempo, como no CacheCaminhos) e descartados juntos quando
+        o conjunto de prateleiras da memória muda.
+        """
+        obstaculos = frozenset(self.memoria_prateleiras.keys())
+        if obstaculos != self._obstaculos_campos:
+            self._campos = OrderedDict()
+            self._obstaculos_campos = obstaculos
+        if origem in self._campos:
+            self._campos.move_to_end(origem)
+        else:
+            self._campos[origem] = CampoDistancias(
+                obstaculos, origem, self.largura_grid, self.altura_grid
+            )
+            while len(self._campos) > MAX_CAMPOS:
+                self._campos.popitem(last=False)
+        return self._campos[origem]
+
+    def _hierarquia_atual(self):
+        """Retorna a hierarquia HPA*, atualizando só as células de prateleira que mudaram."""
+        atuais = set(self.memoria_prateleiras.keys())
+        if self._hierarquia is None:
+            self._hierarquia = HierarquiaAlmoxarifado(
+                atuais, self.largura_grid, self.altura_grid, TAMANHO_CLUSTER
+            )
+        else:
+            for pos in atuais - self._obstaculos_hierarquia:
+                self._hierarquia.atualizar_celula(pos, True)
+            for pos in self._obstaculos_hierarquia - atuais:
+                self._hierarquia.atualizar_celula(pos, False)
+        self._obstaculos_hierarquia = atuais
+        return self._hierarquia
+
+    def _adjacencia_atual(self):
+        """Retorna a tabela CSR do layout, corrigindo só as células de prateleira que mudaram."""
+        versao = self._versao_layout()
+        if self._adjacencia is not None and versao == self._versao_adjacencia:
+            return self._adjacencia
+        atuais = set(self.memoria_prateleiras.keys())
+        if self._adjacencia is None:
+            self._adjacencia = AdjacenciaCSR(atuais, self.largura_grid, self.altura_grid)
+        else:
+            for pos in atuais - self._obstaculos_adjacencia:
+                self._adjacencia.atualizar_celula(pos, True)
+            for pos in self._obstaculos_adjacencia - atuais:
+                self._adjacencia.atualizar_celula(pos, False)
+        self._obstaculos_adjacencia = atuais
+        self._versao_adjacencia = versao
+        return self._adjacencia
+
+    def _marcos_atuais(self):
+        """Retorna os marcos ALT do layout atual, refazendo as tabelas só se as prateleiras mudaram."""
+        obstaculos = frozenset(self.memoria_prateleiras.keys())
+        if obstaculos != self._obstaculos_marcos:
+            self._marcos = MarcosALT(
+                obstaculos, self.largura_grid, self.altura_grid, quantidade=MARCOS_INICIAIS
+            )
+            self._obstaculos_marcos = obstaculos
+        return self._marcos
+
+    def _sincronizar_dstar(self):
+        """Repassa às buscas D* Lite vivas as prateleiras criadas/removidas. True se algo mudou."""
+        atuais = set(self.memoria_prateleiras.keys())
+        novas = atuais - self._obstaculos_dstar
+        removidas = self._obstaculos_dstar - atuais
+        for busca in self._buscas_dstar.values():
+            for pos in novas:
+                busca.atualizar_celula(pos, True)
+            for pos in removidas:
+                busca.atualizar_celula(pos, False)
+        self._obstaculos_dstar = atuais
+        return bool(novas or removidas)
+
+    def _busca_dstar(self, inicio, alvo):
+        """Retorna a busca D* Lite viva para alvo, já com o robô em inicio."""
+        self._sincronizar_dstar()
+        busca = self._buscas_dstar.get(alvo)
+        if busca is None:
+            busca = DStarLite(
+                self._obstaculos_dstar, alvo, inicio, self.largura_grid, self.altura_grid
+            )
+            self._buscas_dstar[alvo] = busca
+            # Como no _campo: sai a busca usada há mais tempo
+            while len(self._buscas_dstar) > MAX_BUSCAS_DSTAR:
+                self._buscas_dstar.popitem(last=False)
+        else:
+            self._buscas_dstar.move_to_end(alvo)
+            busca.mover_inicio(inicio)
+        return busca
+
+    def _versao_layout(self):
+        """Versão do layout informada pelo ambiente ou, na falta dela, uma impressão das prateleiras."""
+        if self._versao_percebida is not None:
+            return self._versao_percebida
+        return hash(frozenset(self.memoria_prateleiras.keys()))
+
+    def ativar_perfil(self):
+        """Liga o perfil das buscas durante a execução e o retorna (mantém os registros já feitos)."""
+        if self.perfil is None:
+            self.perfil = PerfilBuscas()
+        return self.perfil
+
+    def desativar_perfil(self):
+        """Desliga o perfil e retorna o que foi registrado até aqui (ou None)."""
+        perfil, self.perfil = self.perfil, None
+        return perfil
+
+    def _buscar_caminho_passos(self, estado_inicial, obstaculos, alvo, limitar=False, local='coleta'):
+        """Gerador que retorna a lista de ações até alvo (ou None), consultando antes o cache de rotas.
+
+        Os obstáculos são sempre derivados das prateleiras da memória e do alvo,
+        então (início, alvo, versão do layout) identifica o plano; planos do
+        'anytime' cortados pelo prazo não são guardados. Com limitar,
+        a busca respeita max_expansoes e pode retornar ORCAMENTO_ESGOTADO.
+        local ('coleta' ou 'entrega') identifica a perna no perfil das buscas.
+        """
+        if self.cache_caminhos.capacidade <= 0:
+            return (yield from self._planejar_rota_medida(estado_inicial, obstaculos, alvo, limitar, local))
+        inicio = (estado_inicial[0], estado_inicial[1])
+        versao = self._versao_layout()
+        encontrado, acoes = self.cache_caminhos.obter(inicio, alvo, versao)
+        if not encontrado:
+            self._rota_provisoria = False
+            acoes = yield from self._planejar_rota_medida(estado_inicial, obstaculos, alvo, limitar, local)
+            if acoes is not ORCAMENTO_ESGOTADO and not self._rota_provisoria:
+                self.cache_caminhos.guardar(inicio, alvo, versao, acoes)
+        return acoes
+
+    def _planejar_rota_medida(self, estado_inicial, obstaculos, alvo, limitar, local):
+        """_planejar_rota_passos com registro no perfil, quando ele está ligado."""
+        busca = self._planejar_rota_passos(estado_inicial, obstaculos, alvo, limitar)
+        if self.perfil is None:
+            return (yield from busca)
+        self._problema_medido = None
+        acoes, tempo = yield from medir_passos(busca)
+        if acoes is ORCAMENTO_ESGOTADO:
+            status = ORCAMENTO_ESGOTADO
+        else:
+            status = 'sem caminho' if acoes is None else 'ok'
+        medido = self._problema_medido
+        self.perfil.registrar(
+            local, self.planejador, (estado_inicial[0], estado_inicial[1]), alvo, status, tempo,
+            len(acoes) if isinstance(acoes, list) else None,
+            medido.stats() if medido is not None else None,
+        )
+        return acoes
 
-    def _buscar_caminho(self, estado_inicial, obstaculos, alvo):
-        """Tenta encontrar caminho via A*. Retorna lista de ações ou None."""
+    def _planejar_rota_passos(self, estado_inicial, obstaculos, alvo, limitar=False):
+        """Tenta encontrar caminho via A*. Retorna lista de ações, None ou ORCAMENTO_ESGOTADO.
+
+        É um gerador: os planejadores sobre astar_search pausam a cada
+        expansoes_por_fatia expansões; os demais rodam de uma vez. Uma tupla
+        de células no lugar do alvo pede a rota até a mais próxima delas.
+        """
+        if isinstance(alvo[0], tuple):
+            return (yield from self._planejar_multialvo_passos(estado_inicial, obstaculos, alvo))
+        if self.planejador == 'grade':
+            # Como no 'hpa', a tabela usa as prateleiras da memória (o alvo entra pela linha dele)
+            adjacencia = self._adjacencia_atual()
+            w = self.largura_grid
+            return adjacencia.astar(estado_inicial[1] * w + estado_inicial[0], alvo[1] * w + alvo[0])
+        if self.planejador == 'jps':
+            return jps_busca(estado_inicial, obstaculos, alvo, self.largura_grid, self.altura_grid)
+        if self.planejador == 'dstar':
+            # Como no 'hpa', as prateleiras da memória são os obstáculos (o alvo é sempre acessível)
+            return self._busca_dstar((estado_inicial[0], estado_inicial[1]), alvo).planejar()
+        if self.planejador == 'hpa':
+            # Como no 'campo', a hierarquia usa as prateleiras da memória como obstáculos
+            return self._hierarquia_atual().buscar((estado_inicial[0], estado_inicial[1]), alvo)
+        if self.planejador == 'campo':
+            # Os obstáculos recebidos são sempre as prateleiras da memória (menos o
+            # próprio alvo, que não muda a distância até ele), então os campos
+            # guardados valem: usa o do robô se existir, senão o do alvo.
+            inicio = (estado_inicial[0], estado_inicial[1])
+            if inicio in self._campos:
+                return self._campo(inicio).rota_desde_origem(alvo)
+            return self._campo(alvo).rota_ate_origem(inicio)
         prob = ProblemaAlmoxarifado(
             estado_inicial, obstaculos, alvo,
             self.pos_entrega, self.largura_grid, self.altura_grid
         )
-        no_solucao = astar_search(prob)
+        if self.estados_compactos and self.planejador in PLANEJADORES_COMPACTOS:
+            # As ações da solução não dependem da codificação dos estados
+            prob = prob.compactar()
+        if self.perfil is not None:
+            prob = self._problema_medido = ProfiledProblem(prob)
+        if self.planejador == 'bidirecional':
+            no_solucao = bidirectional_astar_search(prob, prob.problema_inverso())
+        elif self.planejador == 'ida':
+            no_solucao = ida_star_search(prob, table_size=TAMANHO_TABELA_IDA)
+        elif self.planejador == 'anytime':
+            no_solucao = self._buscar_anytime(prob)
+        else:
+            max_expansoes = self.max_expansoes if limitar else None
+            if self.planejador == 'perfeita':
+                h = self._heuristica_perfeita.para(prob)
+            elif self.planejador == 'alt':
+                marcos = self._marcos_atuais()
+                h = marcos.heuristica(alvo)
+            else:
+                h = None
+            if h is not None and self.perfil is not None:
+                h = prob.timed_h(h)
+            no_solucao = yield from astar_search_steps(
+                prob, h=h, steps=self.expansoes_por_fatia, max_expansions=max_expansoes
+            )
+            if isinstance(no_solucao, SearchResult):
+                if no_solucao.status == SearchResult.BUDGET_EXHAUSTED:
+                    return ORCAMENTO_ESGOTADO
+                no_solucao = no_solucao.node
+            if self.planejador == 'alt' and no_solucao is not None:
+                # Alvo mal estimado ganha um marco próprio para as próximas pernas
+                marcos.avaliar_consulta(alvo, h(Node(prob.initial)), no_solucao.path_cost)
         return no_solucao.solution() if no_solucao else None
 
+    def _buscar_anytime(self, prob):
+        """ARA* até o prazo da decisão, marcando _rota_provisoria se o plano pode ser subótimo.
+
+        O ARA* só para antes do prazo quando terminou a busca com epsilon = 1;
+        se o prazo passou, o plano é o melhor até ali e a próxima decisão deve
+        buscar de novo em vez de reaproveitá-lo do cache.
+        """
+        prazo = self._prazo if self._prazo is not None else time.perf_counter() + self.prazo_decisao
+        no_solucao = anytime_astar_search(prob, epsilon=self.epsilon, deadline=prazo)
+        self._rota_provisoria = self.epsilon > 1 and time.perf_counter() >= prazo
+        return no_solucao
+
     def _vizinhos_livres(self, pos, obstaculos):
         """Retorna as células adjacentes à posição que não são obstáculos."""
-        x, y = pos
-        candidatos = [
-            (x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)
-        ]
-        return [
-            p for p in candidatos
-            if 0 <= p[0] < self.largura_grid
-            and 0 <= p[1] < self.altura_grid
-            and p not in obstaculos
-        ]
+        return faces_de_acesso(pos, obstaculos, self.largura_grid, self.altura_grid)
+
+    def _buscar_mais_proximo_passos(self, estado_inicial, obstaculos, alvos):
+        """Gerador: rota até o alvo mais próximo do conjunto, numa única busca.
+
+        Passa por _buscar_caminho_passos como as demais pernas (cache de rotas
+        e perfil), com o conjunto ordenado numa tupla no lugar do alvo.
+        Retorna (alvo, ações) ou (None, None).
+        """
+        acoes = yield from self._buscar_caminho_passos(
+            estado_inicial, obstaculos, tuple(sorted(alvos)), local='entrega'
+        )
+        if acoes is None:
+            return None, None
+        x, y = estado_inicial[0], estado_inicial[1]
+        for acao in acoes:
+            dx, dy = DESLOCAMENTOS[acao]
+            x, y = x + dx, y + dy
+        return (x, y), acoes
+
+    def _planejar_multialvo_passos(self, estado_inicial, obstaculos, alvos):
+        """Rota até o mais próximo de alvos (tupla de células), numa única busca.
+
+        Os planejadores sobre Problems do aima buscam em ProblemaMultiAlvo:
+        'ida' e 'anytime' com as próprias buscas, os demais com astar_search
+        em fatias. 'alt' e 'perfeita' usam a Manhattan até o conjunto (suas
+        heurísticas são de um alvo só) e o 'bidirecional' recusa o multialvo,
+        que não tem problema inverso, e faz o A* comum. Os planejadores
+        próprios da grade usam a BFS multialvo de GradeAlmoxarifado.
+        """
+        if self.planejador in PLANEJADORES_GRADE:
+            _, acoes, _ = prateleira_mais_proxima(
+                estado_inicial, obstaculos, alvos, self.largura_grid, self.altura_grid
+            )
+            return acoes
+        prob = ProblemaMultiAlvo(
+            estado_inicial, obstaculos, alvos,
+            self.pos_entrega, self.largura_grid, self.altura_grid
+        )
+        if self.perfil is not None:
+            prob = self._problema_medido = ProfiledProblem(prob)
+        if self.planejador == 'ida':
+            no_solucao = ida_star_search(prob, table_size=TAMANHO_TABELA_IDA)
+        elif self.planejador == 'anytime':
+            no_solucao = self._buscar_anytime(prob)
+        else:
+            no_solucao = yield from astar_search_steps(prob, steps=self.expansoes_por_fatia)
+        return no_solucao.solution() if no_solucao else None
 
     def programa_agente(self, percepcao):
         """Decide qual ação tomar com base no que percebe do ambiente."""
+        return finish_search(self.decidir_em_passos(percepcao))
+
+    def decidir_em_passos(self, percepcao):
+        """Gerador com a decisão de programa_agente, pausando durante as buscas longas.
+
+        Cada next() avança no máximo expansoes_por_fatia expansões do A*; a
+        ação escolhida é o valor de retorno do gerador. Serve para retomar o
+        planejamento a partir de root.after no Tk, ou para intercalar as
+        decisões de vários agentes numa só thread (interleave_searches).
+        """
         pos_atual = percepcao['posicao']
         tem_caixa = percepcao['tem_caixa']
+        self._versao_percebida = percepcao.get('versao_layout')
+        self._prazo = time.perf_counter() + self.prazo_decisao
+
+        # Com o 'dstar', uma mudança no layout invalida o plano em curso; a nova
+        # decisão reaproveita a busca viva do alvo, reparando só o trecho afetado
+        if self.plano and self.planejador == 'dstar' and self._sincronizar_dstar():
+            self.plano = []
 
         # Se tem um plano na memória, apenas executa o próximo passo
         if self.plano:
@@ -62,9 +444,16 @@ class AgenteAlmoxarifado(Agent):
             # ----------------------------------------------------------------
             # Sub-objetivo: Levar caixa ao balcão
             # ----------------------------------------------------------------
+            componentes = percepcao.get('componentes')
+            if componentes is not None and not componentes.alcanca(pos_atual, self.pos_entrega):
+                # Nenhum lado do balcão está na componente do robô: nem tenta buscar
+                print("[AGENTE] AVISO: balcão totalmente inacessível. Encerrando.")
+                self.missao_impossivel = True
+                return 'NoOp'
+
             obstaculos = set(self.memoria_prateleiras.keys())
-            acoes = self._buscar_caminho(
-                (pos_atual[0], pos_atual[1], 1), obstaculos, self.pos_entrega
+            acoes = yield from self._buscar_caminho_passos(
+                (pos_atual[0], pos_atual[1], 1), obstaculos, self.pos_entrega, local='entrega'
             )
 
             if acoes is not None:
@@ -73,11 +462,11 @@ class AgenteAlmoxarifado(Agent):
                 return self.plano.pop(0)
 
             # ── Balcão inacessível diretamente: tenta chegar a um vizinho livre ──
+            # (uma só busca multialvo até o vizinho mais próximo, em vez de uma por vizinho)
             vizinhos = self._vizinhos_livres(self.pos_entrega, obstaculos)
-            vizinhos.sort(key=lambda p: abs(p[0] - pos_atual[0]) + abs(p[1] - pos_atual[1]))
-            for viz in vizinhos:
-                acoes = self._buscar_caminho(
-                    (pos_atual[0], pos_atual[1], 1), obstaculos, viz
+            if vizinhos:
+                viz, acoes = yield from self._buscar_mais_proximo_passos(
+                    (pos_atual[0], pos_atual[1], 1), obstaculos, vizinhos
                 )
                 if acoes is not None:
                     print(f"[AGENTE] Balcão cercado. Roteando para vizinho livre {viz}.")
@@ -101,28 +490,84 @@ class AgenteAlmoxarifado(Agent):
             ]
 
             if not prateleiras_disponiveis:
+                if any(qtd > 0 for qtd in self.memoria_prateleiras.values()):
+                    # Ainda há itens, mas só nas prateleiras já provadas inacessíveis
+                    # (p.ex. descartadas pelas componentes na primeira decisão)
+                    print("[AGENTE] AVISO: nenhuma prateleira acessível. Encerrando missão.")
+                    self.missao_impossivel = True
                 return 'NoOp'  # Sem itens restantes acessíveis
 
-            # Tenta cada prateleira em ordem crescente de distância Manhattan
-            prateleiras_disponiveis.sort(
-                key=lambda p: abs(p[0] - pos_atual[0]) + abs(p[1] - pos_atual[1])
-            )
+            componentes = percepcao.get('componentes')
+            if componentes is not None:
+                # Prateleiras fora da componente do robô saem sem nenhuma busca (O(1) cada)
+                inalcancaveis = set(componentes.inalcancaveis(pos_atual, prateleiras_disponiveis))
+                for alvo in sorted(inalcancaveis):
+                    print(f"[AGENTE] Prateleira {alvo} inacessível. Ignorando.")
+                    self._inacessiveis.add(alvo)
+                prateleiras_disponiveis = [p for p in prateleiras_disponiveis if p not in inalcancaveis]
 
-            for alvo in prateleiras_disponiveis:
-                obstaculos = set(self.memoria_prateleiras.keys()) - {alvo}
-                acoes = self._buscar_caminho(
-                    (pos_atual[0], pos_atual[1], 0), obstaculos, alvo
+            # Com vários candidatos, cada um tenta primeiro dentro de max_expansoes
+            limitar_primeira = True
+            matriz = percepcao.get('distancias')
+            if matriz is not None and pos_atual in matriz.indice:
+                # Distâncias reais pré-calculadas pelo ambiente: descarta de uma vez
+                # as prateleiras inalcançáveis e ordena as demais sem nenhuma busca
+                prateleiras_disponiveis, inalcancaveis = matriz.ordenar_por_distancia(
+                    pos_atual, prateleiras_disponiveis
                 )
+                for alvo in inalcancaveis:
+                    print(f"[AGENTE] Prateleira {alvo} inacessível. Ignorando.")
+                    self._inacessiveis.add(alvo)
+            elif self.planejador == 'campo':
+                # Um único campo a partir do robô dá a distância real (O(1)) até cada prateleira
+                campo = self._campo(pos_atual)
+                for alvo in prateleiras_disponiveis:
+                    if not campo.alcancavel(alvo):
+                        print(f"[AGENTE] Prateleira {alvo} inacessível. Ignorando.")
+                        self._inacessiveis.add(alvo)
+                prateleiras_disponiveis = [p for p in prateleiras_disponiveis if campo.alcancavel(p)]
+                prateleiras_disponiveis.sort(key=campo.distancia)
+            else:
+                # Uma única BFS a partir do robô acha a prateleira com item mais
+                # próxima pelo caminho real (a rota até ela fica com o planejador);
+                # se nenhuma é alcançada, a varredura prova que todas são inacessíveis
+                alvo, _, inalcancaveis = prateleira_mais_proxima(
+                    pos_atual, self.memoria_prateleiras.keys(), prateleiras_disponiveis,
+                    self.largura_grid, self.altura_grid
+                )
+                for inalcancavel in sorted(inalcancaveis):
+                    print(f"[AGENTE] Prateleira {inalcancavel} inacessível. Ignorando.")
+                    self._inacessiveis.add(inalcancavel)
+                prateleiras_disponiveis = [alvo] if alvo is not None else []
+                # Um único candidato, já provado alcançável: adiá-lo só repetiria a
+                # mesma busca sem limite, então ela já começa sem max_expansoes
+                limitar_primeira = False
 
-                if acoes is not None:
-                    self.plano = acoes
-                    self.plano.append('Pegar')
-                    self.alvo_atual = alvo
-                    return self.plano.pop(0)
+            # Alvos cuja busca estourou max_expansoes ficam para o fim, sem limite:
+            # um alvo sem caminho inunda a região toda antes de falhar, e não deve
+            # atrasar os alvos próximos que têm caminho
+            adiados = []
+            prateleiras = set(self.memoria_prateleiras.keys())
+            for limitar, candidatos in ((limitar_primeira, prateleiras_disponiveis), (False, adiados)):
+                for alvo in candidatos:
+                    obstaculos = prateleiras - {alvo}
+                    acoes = yield from self._buscar_caminho_passos(
+                        (pos_atual[0], pos_atual[1], 0), obstaculos, alvo, limitar
+                    )
+
+                    if acoes is ORCAMENTO_ESGOTADO:
+                        adiados.append(alvo)
+                        continue
+
+                    if acoes is not None:
+                        self.plano = acoes
+                        self.plano.append('Pegar')
+                        self.alvo_atual = alvo
+                        return self.plano.pop(0)
 
-                # Sem caminho para este alvo: marca como inacessível
-                print(f"[AGENTE] Prateleira {alvo} inacessível. Ignorando.")
-                self._inacessiveis.add(alvo)
+                    # Sem caminho para este alvo: marca como inacessível
+                    print(f"[AGENTE] Prateleira {alvo} inacessível. Ignorando.")
+                    self._inacessiveis.add(alvo)
 
             # Todas as prateleiras com item estão cercadas
             print("[AGENTE] AVISO: nenhuma prateleira acessível. Encerrando missão.")
@@ -0,0 +1,56 @@
+# Arquivo: agents/cache_caminhos.py
+
+from collections import OrderedDict
+
+
+class CacheCaminhos:
+    """Cache LRU de planos de rota, com contadores de acertos e faltas.
+
+    A chave é (início, alvo, versão do layout): quando o layout muda, a
+    versão muda junto e as entradas antigas simplesmente deixam de ser
+    consultadas até saírem pelo fim da fila LRU. Os planos ficam guardados
+    como tuplas e cada consulta devolve uma lista nova, então o plano.pop()
+    do agente nunca altera o que está no cache. "Sem caminho" (None) também
+    é guardado, para não repetir buscas que falham.
+    """
+
+    def __init__(self, capacidade=256):
+        self.capacidade = capacidade
+        self._planos = OrderedDict()
+        self.acertos = 0
+        self.faltas = 0
+
+    def __len__(self):
+        return len(self._planos)
+
+    def __contains__(self, chave):
+        return chave in self._planos
+
+    def obter(self, inicio, alvo, versao):
+        """Retorna (encontrado, plano); plano é uma lista nova, ou None se não há caminho."""
+        chave = (inicio, alvo, versao)
+        if chave not in self._planos:
+            self.faltas += 1
+            return False, None
+        self.acertos += 1
+        self._planos.move_to_end(chave)
+        plano = self._planos[chave]
+        return True, (None if plano is None else list(plano))
+
+    def guardar(self, inicio, alvo, versao, plano):
+        """Guarda uma cópia imutável do plano, descartando a entrada usada há mais tempo."""
+        if self.capacidade <= 0:
+            return
+        chave = (inicio, alvo, versao)
+        self._planos[chave] = None if plano is None else tuple(plano)
+        self._planos.move_to_end(chave)
+        while len(self._planos) > self.capacidade:
+            self._planos.popitem(last=False)
+
+    def limpar(self):
+        self._planos.clear()
+
+    def taxa_acertos(self):
+        """Fração das consultas respondidas pelo cache (0.0 sem consultas)."""
+        total = self.acertos + self.faltas
+        return self.acertos / total if total else 0.0
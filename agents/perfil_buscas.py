@@ -0,0 +1,116 @@
+# Arquivo: agents/perfil_buscas.py
+
+import csv
+import json
+import time
+
+# Variável de ambiente que liga o perfil em todo AgenteAlmoxarifado criado;
+# o valor é o arquivo de saída (.jsonl ou .csv) usado por exportar()
+VARIAVEL_PERFIL = 'ALMOXARIFADO_PERFIL'
+
+
+def medir_passos(busca):
+    """Delega ao gerador de busca e retorna (resultado, segundos ativos).
+
+    Só conta o tempo dentro de cada next(): as pausas entre fatias (em que o
+    laço de eventos da interface roda) ficam de fora da medição.
+    """
+    ativo = 0.0
+    while True:
+        inicio = time.perf_counter()
+        try:
+            passo = next(busca)
+        except StopIteration as fim:
+            return fim.value, ativo + time.perf_counter() - inicio
+        ativo += time.perf_counter() - inicio
+        yield passo
+
+
+class PerfilBuscas:
+    """Registro das buscas de rota do agente, agregado por local de chamada.
+
+    Cada busca planejada (faltas do cache) vira um registro com o local
+    ('coleta' para a perna até a prateleira, 'entrega' para a perna até o
+    balcão), o planejador, o resultado e as medidas do ProfiledProblem:
+    expansões, nós gerados, picos de fronteira e de fechados, tempo total,
+    tempo da heurística e comprimento da solução. Planejadores que não usam
+    um Problem do aima ('grade', 'jps', 'campo', ...) registram só tempo e
+    comprimento; os contadores ficam None.
+    """
+
+    CAMPOS = ('local', 'planejador', 'inicio', 'alvo', 'status', 'expansoes', 'gerados',
+              'testes_objetivo', 'pico_fronteira', 'pico_fechados', 'tempo',
+              'tempo_heuristica', 'comprimento')
+
+    def __init__(self):
+        self.registros = []
+
+    def __len__(self):
+        return len(self.registros)
+
+    def registrar(self, local, planejador, inicio, alvo, status, tempo, comprimento=None,
+                  estatisticas=None):
+        """Acrescenta um registro; estatisticas é o dict de ProfiledProblem.stats(), se houver."""
+        estatisticas = estatisticas or {}
+        registro = {
+            'local': local, 'planejador': planejador, 'inicio': inicio, 'alvo': alvo,
+            'status': status,
+            'expansoes': estatisticas.get('expansions'),
+            'gerados': estatisticas.get('generated'),
+            'testes_objetivo': estatisticas.get('goal_tests'),
+            'pico_fronteira': estatisticas.get('peak_frontier'),
+            'pico_fechados': estatisticas.get('peak_closed'),
+            'tempo': tempo,
+            'tempo_heuristica': estatisticas.get('h_time'),
+            'comprimento': comprimento,
+        }
+        self.registros.append(registro)
+        return registro
+
+    def resumo(self):
+        """Totais e picos por local: {local: {buscas, expansoes, ..., comprimento_medio}}."""
+        locais = {}
+        for r in self.registros:
+            total = locais.setdefault(r['local'], {
+                'buscas': 0, 'sem_caminho': 0, 'expansoes': 0, 'gerados': 0,
+                'pico_fronteira': 0, 'pico_fechados': 0, 'tempo': 0.0,
+                'tempo_heuristica': 0.0, 'comprimento_medio': None, '_comprimentos': [],
+            })
+            total['buscas'] += 1
+            if r['comprimento'] is None:
+                total['sem_caminho'] += 1
+            else:
+                total['_comprimentos'].append(r['comprimento'])
+            total['tempo'] += r['tempo']
+            for campo in ('expansoes', 'gerados', 'tempo_heuristica'):
+                total[campo] += r[campo] or 0
+            for campo in ('pico_fronteira', 'pico_fechados'):
+                total[campo] = max(total[campo], r[campo] or 0)
+        for total in locais.values():
+            comprimentos = total.pop('_comprimentos')
+            if comprimentos:
+                total['comprimento_medio'] = sum(comprimentos) / len(comprimentos)
+        return locais
+
+    def exportar_jsonl(self, caminho):
+        """Grava um registro JSON por linha."""
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            for r in self.registros:
+                arquivo.write(json.dumps(r, ensure_ascii=False) + '\n')
+
+    def exportar_csv(self, caminho):
+        """Grava os registros em CSV, com cabeçalho CAMPOS."""
+        with open(caminho, 'w', encoding='utf-8', newline='') as arquivo:
+            escritor = csv.DictWriter(arquivo, fieldnames=self.CAMPOS)
+            escritor.writeheader()
+            escritor.writerows(self.registros)
+
+    def exportar(self, caminho):
+        """CSV se caminho termina em .csv; senão JSON lines."""
+        if str(caminho).endswith('.csv'):
+            self.exportar_csv(caminho)
+        else:
+            self.exportar_jsonl(caminho)
+
+    def limpar(self):
+        self.registros.clear()
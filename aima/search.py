@@ -6,7 +6,15 @@ then create problem instances and solve them with calls to the various search
 functions.
 """
 
+import heapq
+import itertools
+import json
+import multiprocessing
+import signal
+import statistics
 import sys
+import time
+import tracemalloc
 from collections import deque
 
 from utils import *
@@ -73,7 +81,10 @@ class Node:
     the total path_cost (also known as g) to reach the node. Other functions
     may add an f and h value; see best_first_graph_search and astar_search for
     an explanation of how the f and h values are handled. You will not need to
-    subclass this class."""
+    subclass this class. Nodes use __slots__ (f and h included, for memoize)
+    so that large searches do not pay for a __dict__ per node."""
+
+    __slots__ = ('state', 'parent', 'action', 'path_cost', 'depth', 'f', 'h')
 
     def __init__(self, state, parent=None, action=None, path_cost=0):
         """Create a search tree Node, derived from a parent by an action."""
@@ -171,11 +182,140 @@ class SimpleProblemSolvingAgentProgram:
         raise NotImplementedError
 
 
+# ______________________________________________________________________________
+# Bounded search: expansion limits, deadlines and cancellation
+
+
+class SearchInterrupted(Exception):
+    """Raised inside a search when its SearchBudget runs out; status says why."""
+
+    def __init__(self, status):
+        super().__init__(status)
+        self.status = status
+
+
+class SearchResult:
+    """Outcome of a bounded search. status is one of SOLVED, NO_PATH,
+    BUDGET_EXHAUSTED, CANCELLED (or CUTOFF for depth_limited_search); node
+    is the solution Node when SOLVED; expansions counts expanded nodes.
+    A SearchResult is true only when the search found a solution."""
+
+    SOLVED = 'solved'
+    NO_PATH = 'no path'
+    BUDGET_EXHAUSTED = 'budget exhausted'
+    CANCELLED = 'cancelled'
+    CUTOFF = 'cutoff'
+
+    def __init__(self, status, node=None, expansions=0):
+        self.status = status
+        self.node = node
+        self.expansions = expansions
+
+    def __bool__(self):
+        return self.status == self.SOLVED
+
+    def __repr__(self):
+        return "<SearchResult {} after {} expansions>".format(self.status, self.expansions)
+
+    def solution(self):
+        return self.node.solution() if self.node is not None else None
+
+
+class SearchBudget:
+    """Limits shared by the search functions: at most max_expansions node
+    expansions, no work after deadline (an absolute time.perf_counter()
+    value), and stop as soon as cancel.is_set() (e.g. a threading.Event set
+    from another thread or a UI callback). With no limit given the budget is
+    inactive and run() returns the plain Node/None result, as before."""
+
+    def __init__(self, max_expansions=None, deadline=None, cancel=None):
+        self.max_expansions = max_expansions
+        self.deadline = deadline
+        self.cancel = cancel
+        self.expansions = 0
+        self.active = not (max_expansions is None and deadline is None and cancel is None)
+
+    def spend(self):
+        """Account for one expansion; raise SearchInterrupted if a limit is hit."""
+        if self.active:
+            if self.cancel is not None and self.cancel.is_set():
+                raise SearchInterrupted(SearchResult.CANCELLED)
+            if self.max_expansions is not None and self.expansions >= self.max_expansions:
+                raise SearchInterrupted(SearchResult.BUDGET_EXHAUSTED)
+            if self.deadline is not None and time.perf_counter() > self.deadline:
+                raise SearchInterrupted(SearchResult.BUDGET_EXHAUSTED)
+        self.expansions += 1
+
+    def run(self, search):
+        """Call search(); wrap its outcome in a SearchResult if the budget is active."""
+        if not self.active:
+            return search()
+        try:
+            node = search()
+        except SearchInterrupted as interrupted:
+            return SearchResult(interrupted.status, None, self.expansions)
+        return self.result(node)
+
+    def run_steps(self, search):
+        """Generator version of run(): delegate to the step-wise search generator."""
+        if not self.active:
+            return (yield from search)
+        try:
+            node = yield from search
+        except SearchInterrupted as interrupted:
+            return SearchResult(interrupted.status, None, self.expansions)
+        return self.result(node)
+
+    def result(self, node):
+        """SearchResult for the raw outcome (Node, None or 'cutoff') of a finished search."""
+        if node == 'cutoff':
+            return SearchResult(SearchResult.CUTOFF, None, self.expansions)
+        status = SearchResult.NO_PATH if node is None else SearchResult.SOLVED
+        return SearchResult(status, node, self.expansions)
+
+
+# ______________________________________________________________________________
+# Step-wise searches: generators that yield every few expansions
+#
+# A step-wise search (best_first_graph_search_steps, astar_search_steps) yields
+# the number of expansions done so far after every `steps` expansions, and its
+# result is the generator's return value. Resume it with next() from an event
+# loop callback (e.g. Tk's root.after), or multiplex many of them in one thread
+# with interleave_searches.
+
+
+def finish_search(search):
+    """Run a step-wise search generator to the end and return its result."""
+    while True:
+        try:
+            next(search)
+        except StopIteration as stop:
+            return stop.value
+
+
+def interleave_searches(searches):
+    """Cooperatively run a dict {key: step-wise search} in one thread, one slice
+    of each in turn (round robin). Yields (key, result) as each search finishes."""
+    pending = deque(searches.items())
+    while pending:
+        key, search = pending.popleft()
+        try:
+            next(search)
+        except StopIteration as stop:
+            yield key, stop.value
+        else:
+            pending.append((key, search))
+
+
 # ______________________________________________________________________________
 # Uninformed Search algorithms
+#
+# The graph and tree searches below (and best_first_graph_search, astar_search)
+# accept optional max_expansions, deadline and cancel arguments. When any of
+# them is given the search returns a SearchResult instead of a Node or None.
 
 
-def breadth_first_tree_search(problem):
+def breadth_first_tree_search(problem, max_expansions=None, deadline=None, cancel=None):
     """
     [Figure 3.7]
     Search the shallowest nodes in the search tree first.
@@ -183,18 +323,23 @@ def breadth_first_tree_search(problem):
     The argument frontier should be an empty queue.
     Repeats infinitely in case of loops.
     """
+    budget = SearchBudget(max_expansions, deadline, cancel)
 
-    frontier = deque([Node(problem.initial)])  # FIFO queue
+    def search():
+        frontier = deque([Node(problem.initial)])  # FIFO queue
 
-    while frontier:
-        node = frontier.popleft()
-        if problem.goal_test(node.state):
-            return node
-        frontier.extend(node.expand(problem))
-    return None
+        while frontier:
+            node = frontier.popleft()
+            if problem.goal_test(node.state):
+                return node
+            budget.spend()
+            frontier.extend(node.expand(problem))
+        return None
 
+    return budget.run(search)
 
-def depth_first_tree_search(problem):
+
+def depth_first_tree_search(problem, max_expansions=None, deadline=None, cancel=None):
     """
     [Figure 3.7]
     Search the deepest nodes in the search tree first.
@@ -202,18 +347,23 @@ def depth_first_tree_search(problem):
     The argument frontier should be an empty queue.
     Repeats infinitely in case of loops.
     """
+    budget = SearchBudget(max_expansions, deadline, cancel)
 
-    frontier = [Node(problem.initial)]  # Stack
+    def search():
+        frontier = [Node(problem.initial)]  # Stack
 
-    while frontier:
-        node = frontier.pop()
-        if problem.goal_test(node.state):
-            return node
-        frontier.extend(node.expand(problem))
-    return None
+        while frontier:
+            node = frontier.pop()
+            if problem.goal_test(node.state):
+                return node
+            budget.spend()
+            frontier.extend(node.expand(problem))
+        return None
+
+    return budget.run(search)
 
 
-def depth_first_graph_search(problem):
+def depth_first_graph_search(problem, came_from=False, max_expansions=None, deadline=None, cancel=None):
     """
     [Figure 3.7]
     Search the deepest nodes in the search tree first.
@@ -221,105 +371,221 @@ def depth_first_graph_search(problem):
     The argument frontier should be an empty queue.
     Does not get trapped by loops.
     If two paths reach a state, only use the first one.
+    With came_from=True no Node is built during the search (see
+    came_from_graph_search); the result is the same.
     """
-    frontier = [(Node(problem.initial))]  # Stack
+    budget = SearchBudget(max_expansions, deadline, cancel)
+
+    def search():
+        if came_from:
+            return came_from_graph_search(problem, lifo=True, budget=budget)
+        frontier = [(Node(problem.initial))]  # Stack
+        # Every state ever pushed: the explored ones plus the ones still on the
+        # stack. One set lookup replaces "not in explored and not in frontier",
+        # which scanned the whole stack for every child.
+        reached = {problem.initial}
+        while frontier:
+            node = frontier.pop()
+            if problem.goal_test(node.state):
+                return node
+            budget.spend()
+            for child in node.expand(problem):
+                if child.state not in reached:
+                    reached.add(child.state)
+                    frontier.append(child)
+        return None
 
-    explored = set()
-    while frontier:
-        node = frontier.pop()
-        if problem.goal_test(node.state):
-            return node
-        explored.add(node.state)
-        frontier.extend(child for child in node.expand(problem)
-                        if child.state not in explored and child not in frontier)
-    return None
+    return budget.run(search)
 
 
-def breadth_first_graph_search(problem):
+def breadth_first_graph_search(problem, came_from=False, max_expansions=None, deadline=None, cancel=None):
     """[Figure 3.11]
     Note that this function can be implemented in a
     single line as below:
     return graph_search(problem, FIFOQueue())
+    With came_from=True no Node is built during the search (see
+    came_from_graph_search); the result is the same.
     """
-    node = Node(problem.initial)
-    if problem.goal_test(node.state):
-        return node
-    frontier = deque([node])
-    explored = set()
+    budget = SearchBudget(max_expansions, deadline, cancel)
+
+    def search():
+        if came_from:
+            return came_from_graph_search(problem, lifo=False, budget=budget)
+        node = Node(problem.initial)
+        if problem.goal_test(node.state):
+            return node
+        frontier = deque([node])
+        # Explored and queued states together (as in depth_first_graph_search)
+        reached = {node.state}
+        while frontier:
+            node = frontier.popleft()
+            budget.spend()
+            for child in node.expand(problem):
+                if child.state not in reached:
+                    if problem.goal_test(child.state):
+                        return child
+                    reached.add(child.state)
+                    frontier.append(child)
+        return None
+
+    return budget.run(search)
+
+
+def came_from_graph_search(problem, lifo=False, budget=None):
+    """Node-free variant of breadth_first_graph_search (lifo=False) and
+    depth_first_graph_search (lifo=True). The frontier holds bare states and
+    a came_from dict maps each generated state to its parent state (no
+    per-state allocation at all). Every generated state is either explored
+    or on the frontier, so membership in came_from is the same test as "not
+    explored and not in frontier", and states are visited in the same order.
+    Only the solution path is turned into Nodes, by path_from_came_from.
+    budget is the caller's SearchBudget, if any."""
+    budget = budget or SearchBudget()
+    came_from = {problem.initial: None}
+    if not lifo and problem.goal_test(problem.initial):
+        return path_from_came_from(problem, came_from, problem.initial)
+    frontier = deque([problem.initial])
+    pop = frontier.pop if lifo else frontier.popleft
     while frontier:
-        node = frontier.popleft()
-        explored.add(node.state)
-        for child in node.expand(problem):
-            if child.state not in explored and child not in frontier:
-                if problem.goal_test(child.state):
-                    return child
+        state = pop()
+        if lifo and problem.goal_test(state):
+            return path_from_came_from(problem, came_from, state)
+        budget.spend()
+        for action in problem.actions(state):
+            child = problem.result(state, action)
+            if child not in came_from:
+                came_from[child] = state
+                if not lifo and problem.goal_test(child):
+                    return path_from_came_from(problem, came_from, child)
                 frontier.append(child)
     return None
 
 
-def best_first_graph_search(problem, f, display=False):
+def path_from_came_from(problem, came_from, state):
+    """Rebuild the Node chain (with path costs) that ends at state from a
+    came_from dict of state -> parent state (None at the root). The action
+    of each step is the first one in problem.actions(parent) that leads to
+    the child, which is the one the search used."""
+    states = [state]
+    while came_from[states[-1]] is not None:
+        states.append(came_from[states[-1]])
+    node = Node(states.pop())
+    while states:
+        child = states.pop()
+        action = first(a for a in problem.actions(node.state)
+                       if problem.result(node.state, a) == child)
+        node = node.child_node(problem, action)
+    return node
+
+
+def best_first_graph_search(problem, f, display=False, max_expansions=None, deadline=None, cancel=None):
     """Search the nodes with the lowest f scores first.
     You specify the function f(node) that you want to minimize; for example,
     if f is a heuristic estimate to the goal, then we have greedy best
     first search; if f is node.depth then we have breadth-first search.
     There is a subtlety: the line "f = memoize(f, 'f')" means that the f
     values will be cached on the nodes as they are computed. So after doing
-    a best first search you can examine the f values of the path returned."""
-    f = memoize(f, 'f')
-    node = Node(problem.initial)
-    frontier = PriorityQueue('min', f)
-    frontier.append(node)
-    explored = set()
-    while frontier:
-        node = frontier.pop()
-        if problem.goal_test(node.state):
-            if display:
-                print(len(explored), "paths have been expanded and", len(frontier), "paths remain in the frontier")
-            return node
-        explored.add(node.state)
-        for child in node.expand(problem):
-            if child.state not in explored and child not in frontier:
-                frontier.append(child)
-            elif child in frontier:
-                if f(child) < frontier[child]:
-                    del frontier[child]
-                    frontier.append(child)
-    return None
+    a best first search you can examine the f values of the path returned.
+    max_expansions, deadline and cancel bound the search (see SearchBudget);
+    with any of them a SearchResult is returned."""
+    return finish_search(best_first_graph_search_steps(problem, f, None, display,
+                                                       max_expansions, deadline, cancel))
 
 
-def uniform_cost_search(problem, display=False):
-    """[Figure 3.14]"""
-    return best_first_graph_search(problem, lambda node: node.path_cost, display)
+def best_first_graph_search_steps(problem, f, steps=100, display=False,
+                                  max_expansions=None, deadline=None, cancel=None):
+    """Step-wise best_first_graph_search: a generator that yields after every
+    `steps` expansions (never, if steps is None) and returns the same result."""
+    f = memoize(f, 'f')
+    budget = SearchBudget(max_expansions, deadline, cancel)
+
+    def search():
+        node = Node(problem.initial)
+        frontier = IndexedPriorityQueue('min', f)
+        frontier.append(node)
+        explored = set()
+        while frontier:
+            node = frontier.pop()
+            if problem.goal_test(node.state):
+                if display:
+                    print(len(explored), "paths have been expanded and", len(frontier), "paths remain in the frontier")
+                return node
+            budget.spend()
+            if steps and budget.expansions % steps == 0:
+                yield budget.expansions
+            explored.add(node.state)
+            for child in node.expand(problem):
+                if child.state not in explored and child not in frontier:
+                    frontier.append(child)
+                elif child in frontier:
+                    if f(child) < frontier[child]:
+                        del frontier[child]
+                        frontier.append(child)
+        return None
 
+    return (yield from budget.run_steps(search()))
 
-def depth_limited_search(problem, limit=50):
-    """[Figure 3.17]"""
 
-    def recursive_dls(node, problem, limit):
+def uniform_cost_search(problem, display=False, max_expansions=None, deadline=None, cancel=None):
+    """[Figure 3.14]"""
+    return best_first_graph_search(problem, lambda node: node.path_cost, display,
+                                   max_expansions, deadline, cancel)
+
+
+def depth_limited_search(problem, limit=50, max_expansions=None, deadline=None, cancel=None, budget=None):
+    """[Figure 3.17]
+    A SearchBudget passed as budget is shared with the caller (as in
+    iterative_deepening_search): its limits apply and the raw result
+    (Node, 'cutoff' or None) is returned."""
+    shared = budget is not None
+    if not shared:
+        budget = SearchBudget(max_expansions, deadline, cancel)
+
+    def iterative_dls(node, problem, limit):
+        # Same visiting order as the recursive Figure 3.17, with an explicit
+        # stack of [children iterator, children's limit, cutoff_occurred]
+        # frames, so the path length is not bounded by the recursion limit.
         if problem.goal_test(node.state):
             return node
         elif limit == 0:
             return 'cutoff'
-        else:
-            cutoff_occurred = False
-            for child in node.expand(problem):
-                result = recursive_dls(child, problem, limit - 1)
-                if result == 'cutoff':
-                    cutoff_occurred = True
-                elif result is not None:
-                    return result
-            return 'cutoff' if cutoff_occurred else None
+        budget.spend()
+        stack = [[iter(node.expand(problem)), limit - 1, False]]
+        while stack:
+            frame = stack[-1]
+            child = next(frame[0], None)
+            if child is None:
+                stack.pop()
+                if not stack:
+                    return 'cutoff' if frame[2] else None
+                if frame[2]:
+                    stack[-1][2] = True
+            elif problem.goal_test(child.state):
+                return child
+            elif frame[1] == 0:
+                frame[2] = True
+            else:
+                budget.spend()
+                stack.append([iter(child.expand(problem)), frame[1] - 1, False])
 
     # Body of depth_limited_search:
-    return recursive_dls(Node(problem.initial), problem, limit)
+    if shared:
+        return iterative_dls(Node(problem.initial), problem, limit)
+    return budget.run(lambda: iterative_dls(Node(problem.initial), problem, limit))
+
 
+def iterative_deepening_search(problem, max_expansions=None, deadline=None, cancel=None):
+    """[Figure 3.18]
+    max_expansions is shared by all the depth-limited iterations."""
+    budget = SearchBudget(max_expansions, deadline, cancel)
 
-def iterative_deepening_search(problem):
-    """[Figure 3.18]"""
-    for depth in range(sys.maxsize):
-        result = depth_limited_search(problem, depth)
-        if result != 'cutoff':
-            return result
+    def search():
+        for depth in range(sys.maxsize):
+            result = depth_limited_search(problem, depth, budget=budget)
+            if result != 'cutoff':
+                return result
+
+    return budget.run(search)
 
 
 # ______________________________________________________________________________
@@ -402,6 +668,118 @@ def bidirectional_search(problem):
     return np.inf
 
 
+def bidirectional_astar_search(problem, backward_problem=None, h=None, e=None):
+    """Bidirectional heuristic search (MM) that returns a solution Node.
+    Same meet-in-the-middle rule as bidirectional_search, but each direction
+    keeps its open list in heaps (by priority, by f and by g, with lazy
+    deletion) and its g-values, parents and closed set in dicts and sets.
+    backward_problem searches from the goal: its initial state is the full
+    goal state and its actions/result generate predecessors; its h estimates
+    the distance back to problem.initial. It defaults to the reversed
+    GraphProblem for graph problems. The returned node is rebuilt with
+    child_node, so solution() and path_cost cover the whole path."""
+    if backward_problem is None:
+        if not isinstance(problem, GraphProblem):
+            raise ValueError("bidirectional_astar_search needs a backward_problem.")
+        backward_problem = GraphProblem(problem.goal, problem.initial, problem.graph)
+    if e is None:
+        e = problem.find_min_edge() if isinstance(problem, GraphProblem) else 0
+    hF = h or problem.h
+    hB = backward_problem.h
+    if problem.goal_test(problem.initial):
+        return Node(problem.initial)
+
+    class Direction:
+        def __init__(self, prob, h_fn):
+            self.problem, self.h = prob, h_fn
+            self.g, self.parent, self.h_cache = {prob.initial: 0}, {prob.initial: None}, {}
+            self.open, self.closed = {prob.initial}, set()
+            self.by_pr, self.by_f, self.by_g = [], [], []
+            self.push(prob.initial)
+
+        def hv(self, state):
+            if state not in self.h_cache:
+                self.h_cache[state] = self.h(Node(state))
+            return self.h_cache[state]
+
+        def push(self, state):
+            g = self.g[state]
+            f = g + self.hv(state)
+            tie = next(counter)
+            heapq.heappush(self.by_pr, (max(f, 2 * g), g, tie, state))
+            heapq.heappush(self.by_f, (f, tie, state, g))
+            heapq.heappush(self.by_g, (g, tie, state))
+
+    # The top_* helpers drop stale heap entries (closed or improved states)
+    counter = itertools.count()
+    fwd, bwd = Direction(problem, hF), Direction(backward_problem, hB)
+    U, meet = np.inf, None
+
+    def top_pr(d):
+        while d.by_pr and (d.by_pr[0][3] not in d.open or d.g[d.by_pr[0][3]] != d.by_pr[0][1]):
+            heapq.heappop(d.by_pr)
+        return d.by_pr[0][0] if d.by_pr else np.inf
+
+    def top_f(d):
+        while d.by_f and (d.by_f[0][2] not in d.open or d.g[d.by_f[0][2]] != d.by_f[0][3]):
+            heapq.heappop(d.by_f)
+        return d.by_f[0][0] if d.by_f else np.inf
+
+    def top_g(d):
+        while d.by_g and (d.by_g[0][2] not in d.open or d.g[d.by_g[0][2]] != d.by_g[0][0]):
+            heapq.heappop(d.by_g)
+        return d.by_g[0][0] if d.by_g else np.inf
+
+    def extend(d, other, U, meet):
+        """Expand the best node of direction d, updating the best meeting point."""
+        state = heapq.heappop(d.by_pr)[3]
+        d.open.discard(state)
+        d.closed.add(state)
+        prob = d.problem
+        for action in prob.actions(state):
+            child = prob.result(state, action)
+            cost = prob.path_cost(d.g[state], state, action, child)
+            if child in d.g and d.g[child] <= cost:
+                continue
+            d.closed.discard(child)
+            d.g[child] = cost
+            d.parent[child] = (state, action)
+            d.open.add(child)
+            d.push(child)
+            if child in other.g and cost + other.g[child] < U:
+                U, meet = cost + other.g[child], child
+        return U, meet
+
+    while fwd.open and bwd.open:
+        pr_f, pr_b = top_pr(fwd), top_pr(bwd)
+        C = min(pr_f, pr_b)
+        if U <= max(C, top_f(fwd), top_f(bwd), top_g(fwd) + top_g(bwd) + e):
+            break
+        if C == pr_f:
+            U, meet = extend(fwd, bwd, U, meet)
+        else:
+            U, meet = extend(bwd, fwd, U, meet)
+
+    if meet is None:
+        return None
+    # Forward half: follow the forward parents from the meeting state
+    forward_half = []
+    state = meet
+    while fwd.parent[state] is not None:
+        state, action = fwd.parent[state]
+        forward_half.append(action)
+    node = Node(problem.initial)
+    for action in reversed(forward_half):
+        node = node.child_node(problem, action)
+    # Backward half: each backward parent is the next state towards the goal
+    while bwd.parent[node.state] is not None:
+        next_state = bwd.parent[node.state][0]
+        action = first(a for a in problem.actions(node.state)
+                       if problem.result(node.state, a) == next_state)
+        node = node.child_node(problem, action)
+    return node
+
+
 # ______________________________________________________________________________
 # Informed (Heuristic) Search
 
@@ -412,12 +790,134 @@ greedy_best_first_graph_search = best_first_graph_search
 # Greedy best-first search is accomplished by specifying f(n) = h(n).
 
 
-def astar_search(problem, h=None, display=False):
+def astar_search(problem, h=None, display=False, max_expansions=None, deadline=None, cancel=None):
     """A* search is best-first graph search with f(n) = g(n)+h(n).
     You need to specify the h function when you call astar_search, or
-    else in your Problem subclass."""
+    else in your Problem subclass. max_expansions, deadline and cancel
+    bound the search (see SearchBudget); with any of them a SearchResult
+    is returned."""
+    h = memoize(h or problem.h, 'h')
+    return best_first_graph_search(problem, lambda n: n.path_cost + h(n), display,
+                                   max_expansions, deadline, cancel)
+
+
+def astar_search_steps(problem, h=None, steps=100, max_expansions=None, deadline=None, cancel=None):
+    """Step-wise astar_search (see best_first_graph_search_steps)."""
+    h = memoize(h or problem.h, 'h')
+    return best_first_graph_search_steps(problem, lambda n: n.path_cost + h(n), steps, False,
+                                         max_expansions, deadline, cancel)
+
+
+def weighted_astar_search(problem, h=None, weight=2, display=False,
+                          max_expansions=None, deadline=None, cancel=None):
+    """Weighted A*: best-first graph search with f(n) = g(n) + weight * h(n).
+    With an admissible h the solution costs at most weight times the optimal
+    one, and usually far fewer nodes are expanded than with plain A*."""
     h = memoize(h or problem.h, 'h')
-    return best_first_graph_search(problem, lambda n: n.path_cost + h(n), display)
+    return best_first_graph_search(problem, lambda n: n.path_cost + weight * h(n), display,
+                                   max_expansions, deadline, cancel)
+
+
+def anytime_astar_search(problem, h=None, epsilon=3, epsilon_step=0.5, deadline=None,
+                         on_solution=None):
+    """Anytime Repairing A* (ARA*, Likhachev et al.). Runs weighted A* with
+    inflation epsilon, then lowers epsilon by epsilon_step and repairs the
+    search, reusing previous work: only states whose g improved after being
+    expanded (the INCONS list) are reopened. Each solution costs at most
+    epsilon times the optimal one; with epsilon = 1 it is optimal.
+    deadline is an absolute time.perf_counter() value. The first solution is
+    always completed; improvement stops once the deadline passes and the
+    best node found so far is returned (None if there is no solution).
+    on_solution(node, epsilon) is called for every improved solution."""
+    h = memoize(h or problem.h, 'h')
+    hv = {}
+
+    def h_of(state):
+        if state not in hv:
+            hv[state] = h(Node(state))
+        return hv[state]
+
+    g = {problem.initial: 0}
+    parent = {problem.initial: None}
+    open_states, closed, incons = {problem.initial}, set(), set()
+    counter = itertools.count()
+    heap = []
+    best = [None]  # goal state with the lowest g found so far
+
+    def push(state, eps):
+        heapq.heappush(heap, (g[state] + eps * h_of(state), h_of(state), next(counter), state, g[state]))
+
+    def min_f():
+        while heap and (heap[0][3] not in open_states or g[heap[0][3]] != heap[0][4]):
+            heapq.heappop(heap)
+        return heap[0][0] if heap else np.inf
+
+    def improve_path(eps, use_deadline):
+        expansions = 0
+        while open_states:
+            best_g = g[best[0]] if best[0] is not None else np.inf
+            if best_g <= min_f():
+                return True
+            expansions += 1
+            if use_deadline and expansions % 64 == 0 and time.perf_counter() > deadline:
+                return False
+            state = heapq.heappop(heap)[3]
+            open_states.discard(state)
+            closed.add(state)
+            if problem.goal_test(state):
+                if best[0] is None or g[state] < g[best[0]]:
+                    best[0] = state
+                continue
+            for action in problem.actions(state):
+                child = problem.result(state, action)
+                cost = problem.path_cost(g[state], state, action, child)
+                if child not in g or cost < g[child]:
+                    g[child] = cost
+                    parent[child] = (state, action)
+                    if problem.goal_test(child) and (best[0] is None or cost < g[best[0]]):
+                        best[0] = child
+                    if child in closed:
+                        incons.add(child)
+                    else:
+                        open_states.add(child)
+                        push(child, eps)
+        return True
+
+    def solution():
+        actions, state = [], best[0]
+        while parent[state] is not None:
+            state, action = parent[state]
+            actions.append(action)
+        node = Node(problem.initial)
+        for action in reversed(actions):
+            node = node.child_node(problem, action)
+        return node
+
+    eps = max(epsilon, 1)
+    push(problem.initial, eps)
+    improve_path(eps, use_deadline=False)
+    if best[0] is None:
+        return None
+    node = solution()
+    if on_solution:
+        on_solution(node, eps)
+    while eps > 1 and (deadline is None or time.perf_counter() < deadline):
+        eps = max(1, eps - epsilon_step)
+        open_states |= incons
+        incons.clear()
+        closed.clear()
+        heap.clear()
+        for state in open_states:
+            push(state, eps)
+        cost = g[best[0]]
+        finished = improve_path(eps, use_deadline=deadline is not None)
+        if g[best[0]] < cost:
+            node = solution()
+            if on_solution:
+                on_solution(node, eps)
+        if not finished:
+            break
+    return node
 
 
 # ______________________________________________________________________________
@@ -600,36 +1100,120 @@ class PlanRoute(Problem):
 # Other search algorithms
 
 
-def recursive_best_first_search(problem, h=None):
-    """[Figure 3.26]"""
+def recursive_best_first_search(problem, h=None, max_expansions=None, deadline=None, cancel=None):
+    """[Figure 3.26]
+    RBFS with an explicit stack of (successors, f_limit) frames instead of
+    recursion: same expansions and result, for any solution depth. Returns
+    None once every successor of the root is backed up to f = infinity."""
     h = memoize(h or problem.h, 'h')
+    budget = SearchBudget(max_expansions, deadline, cancel)
 
     def RBFS(problem, node, flimit):
-        if problem.goal_test(node.state):
-            return node, 0  # (The second value is immaterial)
-        successors = node.expand(problem)
-        if len(successors) == 0:
-            return None, np.inf
-        for s in successors:
-            s.f = max(s.path_cost + h(s), node.f)
+        frames = []
         while True:
-            # Order by lowest f value
-            successors.sort(key=lambda x: x.f)
-            best = successors[0]
-            if best.f > flimit:
-                return None, best.f
-            if len(successors) > 1:
-                alternative = successors[1].f
+            # Enter node: test it and push its successors
+            if problem.goal_test(node.state):
+                return node
+            budget.spend()
+            successors = node.expand(problem)
+            if successors:
+                for s in successors:
+                    s.f = max(s.path_cost + h(s), node.f)
+                frames.append((successors, flimit))
+                backed_up = None
             else:
-                alternative = np.inf
-            result, best.f = RBFS(problem, best, min(flimit, alternative))
-            if result is not None:
-                return result, best.f
+                backed_up = np.inf
+            # Unwind until some frame picks a best successor within its limit;
+            # backed_up is the f value returned to the frame below
+            while True:
+                if backed_up is not None:
+                    if not frames:
+                        return None
+                    frames[-1][0][0].f = backed_up
+                successors, flimit = frames[-1]
+                # Order by lowest f value
+                successors.sort(key=lambda x: x.f)
+                best = successors[0]
+                # f = infinity: no goal below any successor, not even for the
+                # root frame, whose limit is also infinity
+                if best.f > flimit or best.f == np.inf:
+                    frames.pop()
+                    backed_up = best.f
+                    continue
+                if len(successors) > 1:
+                    alternative = successors[1].f
+                else:
+                    alternative = np.inf
+                node, flimit = best, min(flimit, alternative)
+                break
+
+    def search():
+        node = Node(problem.initial)
+        node.f = h(node)
+        return RBFS(problem, node, np.inf)
+
+    return budget.run(search)
+
+
+def ida_star_search(problem, h=None, table_size=100000, max_expansions=None, deadline=None,
+                    cancel=None):
+    """Iterative deepening A*: depth-first searches bounded by f = g + h,
+    raising the bound to the smallest f that exceeded it, until a goal is
+    found. Iterative, with an explicit stack, so the path length is not
+    bounded by the recursion limit; memory grows with the path length plus
+    a transposition table of at most table_size states. The table keeps the
+    best g reached for each state in the current iteration and prunes
+    paths that reach a state again with no smaller g; once full, new states
+    are just not recorded (the table only saves work). States on the
+    current path are never revisited. Returns the solution Node, optimal if
+    h is admissible, or None."""
+    h = memoize(h or problem.h, 'h')
+    budget = SearchBudget(max_expansions, deadline, cancel)
+
+    def bounded_dfs(root, bound):
+        """(goal node or None, smallest f above bound seen in this iteration)."""
+        if problem.goal_test(root.state):
+            return root, bound
+        next_bound = np.inf
+        table = {root.state: 0}
+        path = [root]
+        on_path = {root.state}
+        budget.spend()
+        stack = [iter(root.expand(problem))]
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                on_path.discard(path.pop().state)
+                continue
+            if child.state in on_path:
+                continue
+            f = child.path_cost + h(child)
+            if f > bound:
+                next_bound = min(next_bound, f)
+                continue
+            best_g = table.get(child.state)
+            if best_g is not None and best_g <= child.path_cost:
+                continue
+            if best_g is not None or len(table) < table_size:
+                table[child.state] = child.path_cost
+            if problem.goal_test(child.state):
+                return child, bound
+            budget.spend()
+            path.append(child)
+            on_path.add(child.state)
+            stack.append(iter(child.expand(problem)))
+        return None, next_bound
+
+    def search():
+        root = Node(problem.initial)
+        bound = h(root)
+        while True:
+            node, bound = bounded_dfs(root, bound)
+            if node is not None or bound == np.inf:
+                return node
 
-    node = Node(problem.initial)
-    node.f = h(node)
-    result, bestf = RBFS(problem, node, np.inf)
-    return result
+    return budget.run(search)
 
 
 def hill_climbing(problem):
@@ -1551,6 +2135,56 @@ class InstrumentedProblem(Problem):
                                                self.states, str(self.found)[:4])
 
 
+class ProfiledProblem(InstrumentedProblem):
+    """InstrumentedProblem that also tracks the peak frontier and closed-set
+    sizes and the time spent evaluating the heuristic. The closed set is the
+    set of expanded states and the frontier is the generated states not yet
+    expanded, which is exact for the graph searches. problem.h is timed
+    automatically; wrap an explicit h with timed_h."""
+
+    def __init__(self, problem):
+        super().__init__(problem)
+        self.expanded = set()
+        self.seen = {problem.initial}
+        self.peak_frontier = 1
+        self.peak_closed = 0
+        self.h_time = 0.0
+        self.h_calls = 0
+        if hasattr(problem, 'h'):
+            # Only then: without h, searches must still see the attribute missing
+            self.h = self.timed_h(problem.h)
+
+    def actions(self, state):
+        self.expanded.add(state)
+        self.peak_closed = max(self.peak_closed, len(self.expanded))
+        return super().actions(state)
+
+    def result(self, state, action):
+        child = super().result(state, action)
+        self.seen.add(child)
+        self.peak_frontier = max(self.peak_frontier, len(self.seen) - len(self.expanded))
+        return child
+
+    def timed_h(self, h):
+        """Wrap h(node) so that its calls and running time are counted."""
+        clock = time.perf_counter
+
+        def timed(node):
+            start = clock()
+            value = h(node)
+            self.h_time += clock() - start
+            self.h_calls += 1
+            return value
+
+        return timed
+
+    def stats(self):
+        """Counters as a dict: expansions, generated nodes, goal tests, peaks and h time."""
+        return {'expansions': self.succs, 'generated': self.states, 'goal_tests': self.goal_tests,
+                'peak_frontier': self.peak_frontier, 'peak_closed': self.peak_closed,
+                'h_calls': self.h_calls, 'h_time': self.h_time}
+
+
 def compare_searchers(problems, header,
                       searchers=[breadth_first_tree_search,
                                  breadth_first_graph_search,
@@ -1567,6 +2201,164 @@ def compare_searchers(problems, header,
     print_table(table, header)
 
 
+TIMEOUT = 'timeout'
+ERROR = 'error'
+
+
+class _JobTimeout(Exception):
+    pass
+
+
+def _raise_job_timeout(signum, frame):
+    raise _JobTimeout()
+
+
+def _search_outcome(result):
+    """Map whatever a searcher returned to (status, solution node or None)."""
+    if isinstance(result, SearchResult):
+        return result.status, result.node
+    if result is None:
+        return SearchResult.NO_PATH, None
+    if isinstance(result, str) and result == 'cutoff':
+        return SearchResult.CUTOFF, None
+    return SearchResult.SOLVED, result
+
+
+def _run_with_timeout(run, timeout):
+    """Call run() and raise _JobTimeout once timeout seconds have passed.
+    Uses SIGALRM, so the limit is only enforced where signal.setitimer
+    exists (Unix); elsewhere run() goes on until it finishes."""
+    if timeout is None or not hasattr(signal, 'setitimer'):
+        return run()
+    previous = signal.signal(signal.SIGALRM, _raise_job_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return run()
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _compare_job(job):
+    """Worker side of compare_searchers_parallel: run one searcher on one
+    problem and return a plain dict (the record that goes in the report)."""
+    searcher, problem, problem_name, repeat, timeout, trace_memory = job
+    record = {'searcher': name(searcher), 'problem': problem_name, 'repeat': repeat,
+              'status': None, 'time': None, 'expansions': None, 'generated': None,
+              'goal_tests': None, 'path_cost': None, 'solution_length': None,
+              'peak_memory': None, 'error': None}
+    p = InstrumentedProblem(problem)
+    start = time.perf_counter()
+    try:
+        result = _run_with_timeout(lambda: searcher(p), timeout)
+        record['time'] = time.perf_counter() - start
+        record['status'], node = _search_outcome(result)
+        if isinstance(node, Node):
+            record['path_cost'] = node.path_cost
+            record['solution_length'] = len(node.solution())
+        if trace_memory:
+            # Separate run: tracing every allocation would distort the timing above
+            tracemalloc.start()
+            try:
+                _run_with_timeout(lambda: searcher(problem), timeout)
+                record['peak_memory'] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    except _JobTimeout:
+        if record['status'] is None:
+            record['status'], record['time'] = TIMEOUT, time.perf_counter() - start
+    except Exception as e:
+        record['status'], record['error'] = ERROR, repr(e)
+    record['expansions'], record['generated'], record['goal_tests'] = p.succs, p.states, p.goal_tests
+    return record
+
+
+def _summarize_jobs(records):
+    """One row per (searcher, problem): status counts over the repeats, the
+    mean/stdev/min/max time of the finished runs, and the counters and
+    peak memory (which do not change between repeats)."""
+    groups = {}
+    for r in records:
+        groups.setdefault((r['searcher'], r['problem']), []).append(r)
+    summary = []
+    for (searcher, problem), runs in groups.items():
+        times = [r['time'] for r in runs if r['status'] not in (TIMEOUT, ERROR)]
+        first = runs[0]
+        statuses = {}
+        for r in runs:
+            statuses[r['status']] = statuses.get(r['status'], 0) + 1
+        summary.append({
+            'searcher': searcher, 'problem': problem, 'runs': len(runs), 'statuses': statuses,
+            'time_mean': statistics.mean(times) if times else None,
+            'time_stdev': statistics.stdev(times) if len(times) > 1 else None,
+            'time_min': min(times) if times else None,
+            'time_max': max(times) if times else None,
+            'expansions': first['expansions'], 'generated': first['generated'],
+            'goal_tests': first['goal_tests'], 'path_cost': first['path_cost'],
+            'peak_memory': max((r['peak_memory'] for r in runs if r['peak_memory'] is not None),
+                               default=None),
+        })
+    return summary
+
+
+def compare_searchers_parallel(problems, header=None,
+                               searchers=[breadth_first_tree_search,
+                                          breadth_first_graph_search,
+                                          depth_first_graph_search,
+                                          iterative_deepening_search,
+                                          depth_limited_search,
+                                          recursive_best_first_search],
+                               repeats=1, timeout=None, processes=None, memory=True,
+                               report=None):
+    """Like compare_searchers, but every (searcher, problem, repeat) job runs
+    in a multiprocessing.Pool of `processes` workers (default: one per CPU).
+    Searchers and problems are pickled to the workers, so they must be
+    module-level functions (or functools.partial of them) and picklable
+    problems. Each job is stopped after `timeout` seconds (SIGALRM, Unix
+    only) and reports status, time and the InstrumentedProblem counters;
+    with memory=True the first repeat then runs the searcher a second time
+    under tracemalloc for the peak memory, so the time always comes from
+    the untraced run and the memory from the traced one. Runs `repeats`
+    times to estimate the time variance. Rows are keyed by searcher and
+    problem name, so both must be unique (ValueError otherwise). Prints a
+    table (header as in compare_searchers; problem names are taken from
+    it), writes the report as JSON to the path `report` if given, and
+    returns it: {'config': ..., 'jobs': [...], 'summary': [...]}."""
+    if header:
+        problem_names = list(header[1:])
+    else:
+        problem_names = ['{}#{}'.format(name(p), i) for i, p in enumerate(problems)]
+    searcher_names = [name(s) for s in searchers]
+    for kind, names in (('searcher', searcher_names), ('problem', problem_names)):
+        duplicates = sorted({n for n in names if names.count(n) > 1})
+        if duplicates:
+            raise ValueError("Duplicate {} names: {}".format(kind, ', '.join(duplicates)))
+    jobs = [(s, p, pname, r, timeout, memory and r == 0)
+            for r in range(repeats) for s in searchers for p, pname in zip(problems, problem_names)]
+    with multiprocessing.Pool(processes) as pool:
+        records = pool.map(_compare_job, jobs, chunksize=1)
+    summary = _summarize_jobs(records)
+
+    cells = {(row['searcher'], row['problem']): row for row in summary}
+
+    def cell(row):
+        if row['time_mean'] is None:
+            return '/'.join(row['statuses'])
+        return '<{}/{:.4f}s>'.format(row['expansions'], row['time_mean'])
+
+    table = [[sname] + [cell(cells[sname, pname]) for pname in problem_names]
+             for sname in searcher_names]
+    print_table(table, header or ['Searcher'] + problem_names)
+
+    result = {'config': {'repeats': repeats, 'timeout': timeout, 'processes': processes,
+                         'memory': memory},
+              'jobs': records, 'summary': summary}
+    if report is not None:
+        with open(report, 'w') as f:
+            json.dump(result, f, indent=1)
+    return result
+
+
 def compare_graph_searchers():
     """Prints a table of search results."""
     compare_searchers(problems=[GraphProblem('Arad', 'Bucharest', romania_map),
@@ -777,6 +777,65 @@ class PriorityQueue:
         heapq.heapify(self.heap)
 
 
+class IndexedPriorityQueue(PriorityQueue):
+    """A PriorityQueue that keeps an index from each item to its heap entry,
+    so membership, lookup and deletion take O(1) and re-insertion O(log n).
+    Deleted entries are only marked as removed (lazy deletion) and are skipped
+    when they reach the top of the heap. Items are looked up by equality, so
+    two Nodes with the same state are the same key, as in PriorityQueue.
+    Items still compare by (f(x), item), hence the pop order is the same."""
+
+    def __init__(self, order='min', f=lambda x: x):
+        super().__init__(order, f)
+        self.index = {}
+
+    def append(self, item):
+        """Insert item at its correct position, replacing an equal item."""
+        if item in self.index:
+            del self[item]
+        entry = [self.f(item), item, False]
+        self.index[item] = entry
+        heapq.heappush(self.heap, entry)
+
+    def pop(self):
+        """Pop and return the item (with min or max f(x) value)
+        depending on the order."""
+        while self.heap:
+            value, item, removed = heapq.heappop(self.heap)
+            if not removed:
+                del self.index[item]
+                return item
+        raise Exception('Trying to pop from empty PriorityQueue.')
+
+    def __len__(self):
+        """Return the number of live items in the PriorityQueue."""
+        return len(self.index)
+
+    def __contains__(self, key):
+        """Return True if the key is in PriorityQueue."""
+        return key in self.index
+
+    def __getitem__(self, key):
+        """Returns the value associated with key in PriorityQueue.
+        Raises KeyError if key is not present."""
+        try:
+            return self.index[key][0]
+        except KeyError:
+            raise KeyError(str(key) + " is not in the priority queue")
+
+    def __delitem__(self, key):
+        """Delete key, leaving a removed marker behind in the heap."""
+        try:
+            entry = self.index.pop(key)
+        except KeyError:
+            raise KeyError(str(key) + " is not in the priority queue")
+        entry[2] = True
+        # Compacts the heap once stale entries are the majority
+        if len(self.heap) > 2 * len(self.index) + 32:
+            self.heap = [e for e in self.heap if not e[2]]
+            heapq.heapify(self.heap)
+
+
 # ______________________________________________________________________________
 # Useful Shorthands
 
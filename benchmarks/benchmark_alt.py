@@ -0,0 +1,86 @@
+# Arquivo: benchmarks/benchmark_alt.py
+"""Compara as expansões do A* com a heurística Manhattan e com a ALT (marcos)
+nas pernas do agente: de uma célula livre até uma prateleira com item. Os
+alvos saem de um conjunto pequeno de prateleiras, como num turno real; a
+linha "ALT adaptativa" mede uma segunda rodada depois que avaliar_consulta
+acrescentou marcos nos alvos mal estimados da primeira.
+
+Uso: python benchmarks/benchmark_alt.py --tamanho 150 --consultas 20 --marcos 4 8 16 --alvos 6
+"""
+
+import argparse
+import random
+import time
+
+from cenarios import gerar_layout, pares_consulta
+
+from aima.search import InstrumentedProblem, Node, astar_search
+from problems.problema_almoxarifado import ProblemaAlmoxarifado
+from problems.marcos_alt import MarcosALT
+
+
+def medir(problemas, heuristicas=None):
+    """Retorna (expansões, segundos, comprimentos) somados sobre os problemas."""
+    expansoes, comprimentos, inicio = 0, [], time.perf_counter()
+    for i, prob in enumerate(problemas):
+        instrumentado = InstrumentedProblem(prob)
+        no = astar_search(instrumentado, h=heuristicas[i] if heuristicas else None)
+        expansoes += instrumentado.succs
+        comprimentos.append(len(no.solution()) if no else None)
+    return expansoes, time.perf_counter() - inicio, comprimentos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tamanho', type=int, default=150)
+    parser.add_argument('--consultas', type=int, default=20)
+    parser.add_argument('--marcos', type=int, nargs='+', default=[4, 8, 16])
+    parser.add_argument('--alvos', type=int, default=6)
+    args = parser.parse_args()
+
+    n = args.tamanho
+    layouts = [
+        ('corredores longos', gerar_layout(n, n, comprimento_bloco=n // 3)),
+        ('fileiras inteiras', gerar_layout(n, n, corredor_transversal=False)),
+        ('blocos de 8', gerar_layout(n, n)),
+    ]
+    for nome, (prateleiras, _, pos_entrega) in layouts:
+        obstaculos = set(prateleiras)
+        com_item = sorted(p for p, qtd in prateleiras.items() if qtd > 0)
+        rng = random.Random(0)
+        alvos = rng.sample(com_item, min(args.alvos, len(com_item)))
+        problemas = []
+        for origem, _ in pares_consulta(n, n, prateleiras, args.consultas):
+            alvo = rng.choice(alvos)
+            problemas.append(ProblemaAlmoxarifado(
+                (origem[0], origem[1], 0), obstaculos - {alvo}, alvo, pos_entrega, n, n))
+
+        exp_manhattan, t_manhattan, ref = medir(problemas)
+        print(f"Grade {n}x{n} ({nome}), {args.consultas} consultas")
+        print(f"  Manhattan       : {exp_manhattan:8d} expansões em {t_manhattan:7.3f}s")
+        for k in args.marcos:
+            inicio = time.perf_counter()
+            marcos = MarcosALT(obstaculos, n, n, quantidade=k)
+            t_tabelas = time.perf_counter() - inicio
+            heuristicas = [marcos.heuristica(p.alvo) for p in problemas]
+            exp_alt, t_alt, comprimentos = medir(problemas, heuristicas)
+            reducao = 100 * (1 - exp_alt / exp_manhattan)
+            print(f"  ALT {k:2d} marcos   : {exp_alt:8d} expansões em {t_alt:7.3f}s "
+                  f"({reducao:5.1f}% menos; tabelas em {t_tabelas:.2f}s; "
+                  f"custos iguais: {comprimentos == ref})")
+
+        marcos = MarcosALT(obstaculos, n, n, quantidade=min(args.marcos))
+        for prob, custo in zip(problemas, ref):
+            if custo is not None:
+                estimativa = marcos.heuristica(prob.alvo)(Node(prob.initial))
+                marcos.avaliar_consulta(prob.alvo, estimativa, custo)
+        heuristicas = [marcos.heuristica(p.alvo) for p in problemas]
+        exp_alt, t_alt, comprimentos = medir(problemas, heuristicas)
+        reducao = 100 * (1 - exp_alt / exp_manhattan)
+        print(f"  ALT adaptativa  : {exp_alt:8d} expansões em {t_alt:7.3f}s "
+              f"({reducao:5.1f}% menos; {len(marcos.marcos)} marcos; "
+              f"custos iguais: {comprimentos == ref})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# Arquivo: benchmarks/benchmark_estado_compacto.py
+"""Compara as buscas do aima com estados em tupla (x, y, status) e com
+estados compactos (um int por estado, ProblemaAlmoxarifadoCompacto): tempo
+somado e pico de memória por busca (tracemalloc), e confere que as
+soluções são as mesmas.
+
+Uso: python benchmarks/benchmark_estado_compacto.py --tamanho 150 --consultas 5
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from cenarios import gerar_layout, pares_consulta
+
+import aima.search as busca
+from problems.problema_almoxarifado import ProblemaAlmoxarifado
+
+
+def medir(buscar, problemas):
+    """Retorna (soluções, segundos somados, maior pico em bytes entre as buscas).
+
+    O tempo é medido numa passada sem tracemalloc, que deixa as alocações
+    várias vezes mais lentas; o pico, numa segunda passada.
+    """
+    inicio = time.perf_counter()
+    solucoes = [buscar(prob) for prob in problemas]
+    total = time.perf_counter() - inicio
+    pico = 0
+    for prob in problemas:
+        tracemalloc.start()
+        buscar(prob)
+        pico = max(pico, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return [no.solution() if no else None for no in solucoes], total, pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tamanho', type=int, default=150)
+    parser.add_argument('--consultas', type=int, default=5)
+    args = parser.parse_args()
+
+    n = args.tamanho
+    prateleiras, _, pos_entrega = gerar_layout(n, n)
+    obstaculos = set(prateleiras)
+    problemas = [
+        ProblemaAlmoxarifado((o[0], o[1], 0), obstaculos, d, pos_entrega, n, n)
+        for o, d in pares_consulta(n, n, prateleiras, args.consultas)
+    ]
+    compactos = [prob.compactar() for prob in problemas]
+
+    print(f"Grade {n}x{n}, {args.consultas} consultas (pico por busca, tracemalloc)")
+    buscas = [
+        ('astar_search', busca.astar_search),
+        ('uniform_cost_search', busca.uniform_cost_search),
+        ('breadth_first_graph_search', busca.breadth_first_graph_search),
+        ('bidirectional_astar_search',
+         lambda p: busca.bidirectional_astar_search(p, p.problema_inverso())),
+    ]
+    for nome, buscar in buscas:
+        sol_tupla, t_tupla, pico_tupla = medir(buscar, problemas)
+        sol_int, t_int, pico_int = medir(buscar, compactos)
+        if nome == 'bidirectional_astar_search':
+            # O ponto de encontro pode mudar com a ordem dos estados; o custo não
+            mesmas = [len(a or ()) for a in sol_tupla] == [len(b or ()) for b in sol_int]
+        else:
+            mesmas = sol_tupla == sol_int
+        print(f"  {nome}{'' if mesmas else '  (SOLUÇÕES DIFERENTES)'}")
+        print(f"    tupla (x, y, s): {pico_tupla / 2**20:8.2f} MiB  {t_tupla:7.3f}s")
+        print(f"    int compacto   : {pico_int / 2**20:8.2f} MiB  {t_int:7.3f}s"
+              f"  ({t_tupla / t_int:4.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+# Arquivo: benchmarks/benchmark_fila_prioridade.py
+"""Compara o A* com a PriorityQueue original (varredura linear) e com a
+IndexedPriorityQueue (índice estado -> entrada, remoção preguiçosa).
+
+Uso: python benchmarks/benchmark_fila_prioridade.py --tamanho 150 --consultas 20
+"""
+
+import argparse
+import time
+from contextlib import contextmanager
+
+from cenarios import gerar_layout, pares_consulta
+
+import aima.search as busca
+from aima.search import InstrumentedProblem, astar_search
+from problems.problema_almoxarifado import ProblemaAlmoxarifado
+
+
+@contextmanager
+def fila_original():
+    """Faz o best_first_graph_search usar temporariamente a PriorityQueue antiga."""
+    indexada = busca.IndexedPriorityQueue
+    busca.IndexedPriorityQueue = busca.PriorityQueue
+    try:
+        yield
+    finally:
+        busca.IndexedPriorityQueue = indexada
+
+
+def medir(problemas):
+    """Retorna (expansões, segundos) somados sobre todos os problemas."""
+    expansoes, inicio = 0, time.perf_counter()
+    for prob in problemas:
+        instrumentado = InstrumentedProblem(prob)
+        astar_search(instrumentado)
+        expansoes += instrumentado.succs
+    return expansoes, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tamanho', type=int, default=150)
+    parser.add_argument('--consultas', type=int, default=20)
+    args = parser.parse_args()
+
+    n = args.tamanho
+    prateleiras, _, pos_entrega = gerar_layout(n, n)
+    obstaculos = set(prateleiras)
+    problemas = [
+        ProblemaAlmoxarifado((o[0], o[1], 0), obstaculos, d, pos_entrega, n, n)
+        for o, d in pares_consulta(n, n, prateleiras, args.consultas)
+    ]
+
+    with fila_original():
+        exp_antes, t_antes = medir(problemas)
+    exp_depois, t_depois = medir(problemas)
+
+    print(f"Grade {n}x{n}, {args.consultas} consultas A*")
+    print(f"  PriorityQueue        : {exp_antes:8d} expansões em {t_antes:7.3f}s "
+          f"({exp_antes / t_antes:10.0f} exp/s)")
+    print(f"  IndexedPriorityQueue : {exp_depois:8d} expansões em {t_depois:7.3f}s "
+          f"({exp_depois / t_depois:10.0f} exp/s)")
+    print(f"  Aceleração: {t_antes / t_depois:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
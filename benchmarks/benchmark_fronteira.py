@@ -0,0 +1,94 @@
+# Arquivo: benchmarks/benchmark_fronteira.py
+"""Mede breadth_first_graph_search e depth_first_graph_search com o teste
+de pertinência antigo (varredura da fronteira, "child not in frontier") e
+com o conjunto de estados alcançados, em O(1), e confere que visitam os
+mesmos estados e devolvem as mesmas soluções.
+
+Uso: python benchmarks/benchmark_fronteira.py --tamanho 200 --consultas 3
+"""
+
+import argparse
+import time
+from collections import deque
+
+from cenarios import gerar_layout, pares_consulta
+
+import aima.search as busca
+from problems.problema_almoxarifado import ProblemaAlmoxarifado
+
+
+def largura_com_varredura(problem):
+    """breadth_first_graph_search como era: explored + busca linear na deque."""
+    node = busca.Node(problem.initial)
+    if problem.goal_test(node.state):
+        return node
+    frontier = deque([node])
+    explored = set()
+    while frontier:
+        node = frontier.popleft()
+        explored.add(node.state)
+        for child in node.expand(problem):
+            if child.state not in explored and child not in frontier:
+                if problem.goal_test(child.state):
+                    return child
+                frontier.append(child)
+    return None
+
+
+def profundidade_com_varredura(problem):
+    """depth_first_graph_search como era: explored + busca linear na pilha."""
+    frontier = [busca.Node(problem.initial)]
+    explored = set()
+    while frontier:
+        node = frontier.pop()
+        if problem.goal_test(node.state):
+            return node
+        explored.add(node.state)
+        frontier.extend(child for child in node.expand(problem)
+                        if child.state not in explored and child not in frontier)
+    return None
+
+
+def medir(buscar, problemas):
+    """Retorna (soluções, expansões somadas, segundos somados)."""
+    solucoes, expansoes, total = [], 0, 0.0
+    for prob in problemas:
+        instrumentado = busca.InstrumentedProblem(prob)
+        inicio = time.perf_counter()
+        no = buscar(instrumentado)
+        total += time.perf_counter() - inicio
+        solucoes.append(no.solution() if no else None)
+        expansoes += instrumentado.succs
+    return solucoes, expansoes, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tamanho', type=int, default=200)
+    parser.add_argument('--consultas', type=int, default=3)
+    args = parser.parse_args()
+
+    n = args.tamanho
+    prateleiras, _, pos_entrega = gerar_layout(n, n)
+    obstaculos = set(prateleiras)
+    problemas = [
+        ProblemaAlmoxarifado((o[0], o[1], 0), obstaculos, d, pos_entrega, n, n)
+        for o, d in pares_consulta(n, n, prateleiras, args.consultas)
+    ]
+
+    print(f"Grade {n}x{n}, {args.consultas} consultas")
+    buscas = [
+        ('breadth_first_graph_search', largura_com_varredura, busca.breadth_first_graph_search),
+        ('depth_first_graph_search', profundidade_com_varredura, busca.depth_first_graph_search),
+    ]
+    for nome, antiga, nova in buscas:
+        sol_antiga, exp_antiga, t_antiga = medir(antiga, problemas)
+        sol_nova, exp_nova, t_nova = medir(nova, problemas)
+        iguais = sol_antiga == sol_nova and exp_antiga == exp_nova
+        print(f"  {nome}{'' if iguais else '  (RESULTADOS DIFERENTES)'}")
+        print(f"    varredura da fronteira: {t_antiga:8.3f}s  {exp_antiga} expansões")
+        print(f"    conjunto alcançados   : {t_nova:8.3f}s  ({t_antiga / t_nova:5.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
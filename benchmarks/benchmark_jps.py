@@ -0,0 +1,56 @@
+# Arquivo: benchmarks/benchmark_jps.py
+"""Compara astar_search (AIMA) e Jump Point Search em layouts de corredores longos.
+
+Uso: python benchmarks/benchmark_jps.py --tamanho 150 --consultas 20
+"""
+
+import argparse
+import time
+
+from cenarios import gerar_layout, pares_consulta
+
+from aima.search import InstrumentedProblem, astar_search
+from problems.problema_almoxarifado import ProblemaAlmoxarifado
+from problems.grade_almoxarifado import GradeAlmoxarifado
+from problems.jps_almoxarifado import JumpPointSearch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tamanho', type=int, default=150)
+    parser.add_argument('--consultas', type=int, default=20)
+    args = parser.parse_args()
+
+    n = args.tamanho
+    # Fileiras inteiras de prateleiras, com poucos corredores transversais
+    prateleiras, _, pos_entrega = gerar_layout(n, n, comprimento_bloco=n // 3)
+    obstaculos = set(prateleiras)
+    pares = pares_consulta(n, n, prateleiras, args.consultas)
+
+    exp_astar, comprimentos_astar = 0, []
+    inicio = time.perf_counter()
+    for o, d in pares:
+        prob = InstrumentedProblem(
+            ProblemaAlmoxarifado((o[0], o[1], 0), obstaculos, d, pos_entrega, n, n))
+        no = astar_search(prob)
+        exp_astar += prob.succs
+        comprimentos_astar.append(len(no.solution()) if no else None)
+    t_astar = time.perf_counter() - inicio
+
+    jps = JumpPointSearch(GradeAlmoxarifado(obstaculos, n, n))
+    exp_jps, comprimentos_jps = 0, []
+    inicio = time.perf_counter()
+    for o, d in pares:
+        acoes = jps.buscar(o, d)
+        exp_jps += jps.expansoes
+        comprimentos_jps.append(len(acoes) if acoes is not None else None)
+    t_jps = time.perf_counter() - inicio
+
+    print(f"Grade {n}x{n} (corredores longos), {args.consultas} consultas")
+    print(f"  astar_search : {exp_astar:8d} expansões em {t_astar:7.3f}s")
+    print(f"  JPS          : {exp_jps:8d} expansões em {t_jps:7.3f}s")
+    print(f"  Custos ótimos iguais: {comprimentos_astar == comprimentos_jps}")
+
+
+if __name__ == '__main__':
+    main()
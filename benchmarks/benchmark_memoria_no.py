@@ -0,0 +1,82 @@
+# Arquivo: benchmarks/benchmark_memoria_no.py
+"""Mede com tracemalloc o pico de memória por busca com o Node antigo (com
+__dict__), com o Node de __slots__ e com o modo came_from (sem nós).
+
+Uso: python benchmarks/benchmark_memoria_no.py --tamanho 150 --consultas 5
+"""
+
+import argparse
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from cenarios import gerar_layout, pares_consulta
+
+import aima.search as busca
+from problems.problema_almoxarifado import ProblemaAlmoxarifado
+
+
+class NoComDict(busca.Node):
+    """Node sem __slots__ próprios: cada instância volta a ter um __dict__."""
+
+
+@contextmanager
+def no_com_dict():
+    """Faz as buscas criarem temporariamente nós com __dict__, como antes."""
+    original = busca.Node
+    busca.Node = NoComDict
+    try:
+        yield
+    finally:
+        busca.Node = original
+
+
+def medir(buscar, problemas):
+    """Retorna (maior pico em bytes entre as buscas, segundos somados)."""
+    pico, total = 0, 0.0
+    for prob in problemas:
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        buscar(prob)
+        total += time.perf_counter() - inicio
+        pico = max(pico, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return pico, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tamanho', type=int, default=150)
+    parser.add_argument('--consultas', type=int, default=5)
+    args = parser.parse_args()
+
+    n = args.tamanho
+    prateleiras, _, pos_entrega = gerar_layout(n, n)
+    obstaculos = set(prateleiras)
+    problemas = [
+        ProblemaAlmoxarifado((o[0], o[1], 0), obstaculos, d, pos_entrega, n, n)
+        for o, d in pares_consulta(n, n, prateleiras, args.consultas)
+    ]
+
+    print(f"Grade {n}x{n}, {args.consultas} consultas (pico por busca, tracemalloc)")
+    buscas = [
+        ('uniform_cost_search', busca.uniform_cost_search, None),
+        ('breadth_first_graph_search', busca.breadth_first_graph_search,
+         lambda p: busca.breadth_first_graph_search(p, came_from=True)),
+        ('depth_first_graph_search', busca.depth_first_graph_search,
+         lambda p: busca.depth_first_graph_search(p, came_from=True)),
+    ]
+    for nome, buscar, sem_nos in buscas:
+        with no_com_dict():
+            pico_dict, t_dict = medir(buscar, problemas)
+        pico_slots, t_slots = medir(buscar, problemas)
+        print(f"  {nome}")
+        print(f"    Node com __dict__ : {pico_dict / 2**20:8.2f} MiB  {t_dict:7.3f}s")
+        print(f"    Node com __slots__: {pico_slots / 2**20:8.2f} MiB  {t_slots:7.3f}s")
+        if sem_nos is not None:
+            pico_cf, t_cf = medir(sem_nos, problemas)
+            print(f"    came_from         : {pico_cf / 2**20:8.2f} MiB  {t_cf:7.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+# Arquivo: benchmarks/benchmark_motor_grade.py
+"""Compara o astar_search do AIMA sobre ProblemaAlmoxarifado com o A* nativo
+da grade (ids inteiros, g e pais em arrays pré-alocados).
+
+Uso: python benchmarks/benchmark_motor_grade.py --tamanho 150 --consultas 20
+"""
+
+import argparse
+import time
+
+from cenarios import gerar_layout, pares_consulta
+
+from aima.search import astar_search
+from problems.problema_almoxarifado import ProblemaAlmoxarifado
+from problems.grade_almoxarifado import astar_grade
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tamanho', type=int, default=150)
+    parser.add_argument('--consultas', type=int, default=20)
+    args = parser.parse_args()
+
+    n = args.tamanho
+    prateleiras, _, pos_entrega = gerar_layout(n, n)
+    obstaculos = set(prateleiras)
+    pares = pares_consulta(n, n, prateleiras, args.consultas)
+
+    inicio = time.perf_counter()
+    planos_aima = []
+    for o, d in pares:
+        prob = ProblemaAlmoxarifado((o[0], o[1], 0), obstaculos, d, pos_entrega, n, n)
+        no = astar_search(prob)
+        planos_aima.append(no.solution() if no else None)
+    t_aima = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    planos_grade = [astar_grade((o[0], o[1], 0), obstaculos, d, n, n) for o, d in pares]
+    t_grade = time.perf_counter() - inicio
+
+    print(f"Grade {n}x{n}, {args.consultas} consultas")
+    print(f"  astar_search (AIMA) : {t_aima:7.3f}s")
+    print(f"  astar_grade         : {t_grade:7.3f}s")
+    print(f"  Aceleração: {t_aima / t_grade:.1f}x  |  planos idênticos: {planos_aima == planos_grade}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+# Arquivo: benchmarks/cenarios.py
+
+import os
+import random
+import sys
+
+# Mesmo ajuste de path usado nos testes: raiz do projeto + alias do utils do AIMA
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import aima.utils
+sys.modules['utils'] = aima.utils
+
+
+def gerar_layout(largura, altura, comprimento_bloco=8, corredor_transversal=True,
+                 densidade_itens=0.3, semente=0):
+    """Gera um almoxarifado com fileiras de prateleiras separadas por corredores.
+
+    As prateleiras ficam em colunas alternadas (x ímpar), em blocos de
+    `comprimento_bloco` células interrompidos por corredores transversais.
+    Retorna (prateleiras, pos_inicial, pos_entrega), onde prateleiras segue o
+    formato {(x, y): quantidade} usado pelo ambiente e pelo agente.
+    """
+    rng = random.Random(semente)
+    prateleiras = {}
+    passo = comprimento_bloco + 1 if corredor_transversal else altura
+    for x in range(1, largura - 1, 2):
+        for y in range(1, altura - 1):
+            if corredor_transversal and y % passo == 0:
+                continue
+            qtd = 1 if rng.random() < densidade_itens else 0
+            prateleiras[(x, y)] = qtd
+    pos_inicial = (0, 0)
+    pos_entrega = (0, altura - 1)
+    return prateleiras, pos_inicial, pos_entrega
+
+
+def pares_consulta(largura, altura, prateleiras, quantidade, semente=0):
+    """Sorteia pares (origem, destino) de células livres para os benchmarks."""
+    rng = random.Random(semente)
+    livres = [
+        (x, y) for x in range(largura) for y in range(altura)
+        if (x, y) not in prateleiras
+    ]
+    return [(rng.choice(livres), rng.choice(livres)) for _ in range(quantidade)]
@@ -0,0 +1,87 @@
+# Arquivo: benchmarks/comparar_agentes.py
+"""Compara planejadores do agente em vários layouts gerados, com os
+episódios rodando em paralelo a partir de especificações compactas
+(env.episodios.comparar_agentes), e mostra média e intervalo de 95% de
+itens entregues, passos e tempo. Com --deepcopy, mede também o jeito de
+aima.agents.compare_agents: ambientes prontos copiados com deepcopy para
+cada agente e rodados em série (tempo e pico de memória, tracemalloc).
+
+Uso: python benchmarks/comparar_agentes.py --tamanho 40 --layouts 8 --planejadores astar grade --deepcopy
+"""
+
+import argparse
+import contextlib
+import copy
+import functools
+import io
+import time
+import tracemalloc
+
+from cenarios import gerar_layout
+
+from agents.agente_almoxarifado import AgenteAlmoxarifado, PLANEJADORES
+from env.episodios import EspecificacaoAmbiente, comparar_agentes
+
+
+def formatar(medida):
+    media, meia = medida
+    return f"{media:10.4g}" + (f" ± {meia:<8.3g}" if meia is not None else " " * 11)
+
+
+def em_serie_com_deepcopy(especificacoes, fabricas, passos):
+    """Ambientes montados uma vez e copiados inteiros para cada fábrica, como em compare_agents."""
+    ambientes = [e.construir() for e in especificacoes]
+    for fabrica in fabricas:
+        for especificacao, ambiente in zip(especificacoes, copy.deepcopy(ambientes)):
+            with contextlib.redirect_stdout(io.StringIO()):
+                agente = especificacao.criar_agente(fabrica)
+                ambiente.add_thing(agente, location=especificacao.pos_inicial)
+                ambiente.run(passos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tamanho', type=int, default=40)
+    parser.add_argument('--layouts', type=int, default=8)
+    parser.add_argument('--planejadores', nargs='+', choices=PLANEJADORES, default=['astar', 'grade'])
+    parser.add_argument('--passos', type=int, default=2000)
+    parser.add_argument('--processos', type=int, default=None, help='padrão: um por CPU')
+    parser.add_argument('--deepcopy', action='store_true', help='mede também a versão em série com deepcopy')
+    args = parser.parse_args()
+
+    n = args.tamanho
+    especificacoes = []
+    for semente in range(args.layouts):
+        prateleiras, pos_inicial, pos_entrega = gerar_layout(n, n, densidade_itens=0.02, semente=semente)
+        especificacoes.append(EspecificacaoAmbiente(n, n, prateleiras, pos_inicial, pos_entrega))
+    fabricas = [functools.partial(AgenteAlmoxarifado, planejador=p) for p in args.planejadores]
+
+    print(f"Grade {n}x{n}, {args.layouts} layouts, até {args.passos} passos por episódio")
+    inicio = time.perf_counter()
+    resultados = comparar_agentes(especificacoes, fabricas, args.passos, args.processos)
+    total = time.perf_counter() - inicio
+    print(f"  {'planejador':<12} {'itens entregues':>21} {'passos':>21} {'tempo (s)':>21}  concluídos")
+    for fabrica, resumo in resultados:
+        print(f"  {fabrica.keywords['planejador']:<12} {formatar(resumo['itens_entregues'])}"
+              f" {formatar(resumo['passos'])} {formatar(resumo['tempo'])}"
+              f"  {resumo['concluidos']}/{resumo['episodios']}")
+    print(f"  paralelo com especificações: {total:7.3f}s")
+
+    if args.deepcopy:
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        em_serie_com_deepcopy(especificacoes, fabricas, args.passos)
+        total = time.perf_counter() - inicio
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        tracemalloc.start()
+        comparar_agentes(especificacoes, fabricas, args.passos, args.processos)
+        pico_paralelo = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  em série com deepcopy      : {total:7.3f}s (com tracemalloc)")
+        print(f"  pico no processo principal : deepcopy {pico / 2**20:.2f} MiB,"
+              f" especificações {pico_paralelo / 2**20:.2f} MiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# Arquivo: benchmarks/comparar_buscas.py
+"""Compara as buscas do aima nas consultas de um layout, em paralelo
+(compare_searchers_parallel): um processo por job, timeout por job,
+repetições para medir a variância e relatório JSON com tempo, expansões
+e pico de memória de cada busca.
+
+Uso: python benchmarks/comparar_buscas.py --tamanho 100 --consultas 4 --repeticoes 3 --timeout 10 --relatorio buscas.json
+"""
+
+import argparse
+
+from cenarios import gerar_layout, pares_consulta
+
+import aima.search as busca
+from problems.problema_almoxarifado import ProblemaAlmoxarifado
+
+BUSCAS = {
+    'astar': busca.astar_search,
+    'custo_uniforme': busca.uniform_cost_search,
+    'largura': busca.breadth_first_graph_search,
+    'profundidade': busca.depth_first_graph_search,
+    'aprofundamento': busca.iterative_deepening_search,
+    'rbfs': busca.recursive_best_first_search,
+    'ida': busca.ida_star_search,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tamanho', type=int, default=100)
+    parser.add_argument('--consultas', type=int, default=4)
+    parser.add_argument('--buscas', nargs='+', choices=BUSCAS, default=list(BUSCAS))
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--timeout', type=float, default=10.0, help='segundos por job')
+    parser.add_argument('--processos', type=int, default=None, help='padrão: um por CPU')
+    parser.add_argument('--sem-memoria', action='store_true', help='não mede o pico com tracemalloc')
+    parser.add_argument('--compacto', action='store_true', help='estados compactos (um int por estado)')
+    parser.add_argument('--relatorio', default=None, help='arquivo JSON do relatório')
+    args = parser.parse_args()
+
+    n = args.tamanho
+    prateleiras, _, pos_entrega = gerar_layout(n, n)
+    obstaculos = set(prateleiras)
+    consultas = pares_consulta(n, n, prateleiras, args.consultas)
+    problemas = [
+        ProblemaAlmoxarifado((o[0], o[1], 0), obstaculos, d, pos_entrega, n, n)
+        for o, d in consultas
+    ]
+    if args.compacto:
+        problemas = [prob.compactar() for prob in problemas]
+
+    print(f"Grade {n}x{n}, {args.consultas} consultas, {args.repeticoes} repetições, "
+          f"timeout {args.timeout}s (<expansões/tempo médio>)")
+    cabecalho = ['Busca'] + [f'{o}->{d}' for o, d in consultas]
+    busca.compare_searchers_parallel(
+        problemas, cabecalho, searchers=[BUSCAS[b] for b in args.buscas],
+        repeats=args.repeticoes, timeout=args.timeout, processes=args.processos,
+        memory=not args.sem_memoria, report=args.relatorio)
+    if args.relatorio:
+        print(f"Relatório em {args.relatorio}")
+
+
+if __name__ == '__main__':
+    main()
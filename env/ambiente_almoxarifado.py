@@ -1,9 +1,11 @@
 # Arquivo: env/ambiente_almoxarifado.py
 
 from aima.agents import Environment
+from env.matriz_distancias import MatrizDistancias
+from env.componentes_conexas import ComponentesConexas
 
 class AmbienteAlmoxarifado(Environment):
-    def __init__(self, largura, altura, dados_prateleiras, pos_entrega):
+    def __init__(self, largura, altura, dados_prateleiras, pos_entrega, usar_matriz_distancias=False):
         super().__init__()
         self.largura = largura
         self.altura = altura
@@ -11,16 +13,88 @@ class AmbienteAlmoxarifado(Environment):
         self.prateleiras = dados_prateleiras 
         self.pos_entrega = pos_entrega
         self.dados_agentes = {}
+        # Matriz de distâncias entre pontos de interesse, entregue na percepção se ativada.
+        # versao_layout só muda quando o conjunto de células bloqueadas muda.
+        self.usar_matriz_distancias = usar_matriz_distancias
+        self.versao_layout = 0
+        self._matriz = None
+        self._posicoes_iniciais = []
+        # Componentes conexas das células livres: alcançabilidade em O(1), entregue na percepção.
+        # missao_impossivel é decidida já na carga (e a cada mudança de layout), não no meio da execução.
+        self.componentes = ComponentesConexas(largura, altura, self.prateleiras.keys())
+        self.missao_impossivel = False
+        self.prateleiras_inalcancaveis = set()
 
     def add_thing(self, agent, location=(0,0)):
         super().add_thing(agent, location)
         self.dados_agentes[agent] = {'posicao': location, 'tem_caixa': False, 'itens_entregues': 0, 'ultima_acao': None}
+        if location not in self._posicoes_iniciais:
+            self._posicoes_iniciais.append(location)
+            self._matriz = None
+        self._avaliar_missao()
+
+    def adicionar_prateleira(self, pos, quantidade):
+        """Cria (ou reabastece) uma prateleira durante a simulação."""
+        nova = pos not in self.prateleiras
+        self.prateleiras[pos] = quantidade
+        if nova:
+            # Nova célula bloqueada: as distâncias antigas deixam de valer
+            self.versao_layout += 1
+            self.componentes.atualizar_celula(pos, True)
+        elif self._matriz is not None and quantidade > 0 and pos not in self._matriz.indice:
+            # Prateleira reabastecida que não era ponto de interesse
+            self._matriz = None
+        self._avaliar_missao()
+
+    def _avaliar_missao(self):
+        """Atualiza prateleiras_inalcancaveis e missao_impossivel pelas componentes conexas.
+
+        A missão é impossível quando ainda há itens (nas prateleiras ou com
+        algum robô) e nenhum robô consegue ao mesmo tempo chegar ao balcão e
+        ter o que entregar: uma caixa na mão ou uma prateleira com item na sua
+        componente.
+        """
+        if not self.dados_agentes:
+            return
+        alcanca = self.componentes.alcanca
+        com_item = [pos for pos, qtd in self.prateleiras.items() if qtd > 0]
+        self.prateleiras_inalcancaveis = {
+            pos for pos in com_item
+            if not any(alcanca(d['posicao'], pos) for d in self.dados_agentes.values())
+        }
+        carregando = any(d['tem_caixa'] for d in self.dados_agentes.values())
+        possivel = any(
+            alcanca(d['posicao'], self.pos_entrega)
+            and (d['tem_caixa'] or any(alcanca(d['posicao'], pos) for pos in com_item))
+            for d in self.dados_agentes.values()
+        )
+        self.missao_impossivel = bool(com_item or carregando) and not possivel
+
+    def matriz_distancias(self):
+        """Retorna a MatrizDistancias do layout atual, recalculando só se o layout mudou.
+
+        Esvaziar uma prateleira não invalida a matriz: toda prateleira já
+        bloqueia a passagem, então ela apenas deixa de ser candidata.
+        """
+        if self._matriz is None or self._matriz.versao != self.versao_layout:
+            pontos = [pos for pos, qtd in self.prateleiras.items() if qtd > 0]
+            pontos.append(self.pos_entrega)
+            pontos.extend(self._posicoes_iniciais)
+            self._matriz = MatrizDistancias(
+                self.largura, self.altura, self.prateleiras.keys(), pontos, self.versao_layout
+            )
+        return self._matriz
 
     def percept(self, agent):
         """Fornece a perceção atual ao agente."""
         # O agente "olha" e atualiza a sua memória sobre onde ainda tem caixas
         agent.memoria_prateleiras = self.prateleiras.copy()
-        return self.dados_agentes[agent]
+        # Cópia: o estado físico em dados_agentes não guarda dados derivados
+        percepcao = dict(self.dados_agentes[agent],
+                         versao_layout=self.versao_layout, componentes=self.componentes)
+        if self.usar_matriz_distancias:
+            percepcao['distancias'] = self.matriz_distancias()
+        return percepcao
 
     def execute_action(self, agent, action):
         """Aplica a ação física do agente no mundo real (ambiente)."""
@@ -58,6 +132,10 @@ class AmbienteAlmoxarifado(Environment):
         # Encerra normalmente quando todos os itens foram entregues
         if total_itens_restantes == 0 and not agentes_carregando:
             return True
+        # Layout insolúvel já na carga (ou depois de uma mudança): nem chega a rodar
+        if self.missao_impossivel:
+            print("[AMBIENTE] Missão impossível: balcão ou itens fora do alcance dos robôs.")
+            return True
         # Encerra com aviso se o agente detectou que o layout é insolúvel ou entrega impossível
         if any(getattr(ag, 'missao_impossivel', False) for ag in self.agents):
             print("[AMBIENTE] Missão encerrada: layout insolúvel (alvo inacessível).")
@@ -0,0 +1,149 @@
+# Arquivo: env/componentes_conexas.py
+
+from collections import deque
+
+import numpy as np
+
+from problems.campo_distancias import grade_ocupacao
+
+# Rótulo das células bloqueadas (prateleiras)
+BLOQUEADA = -1
+
+
+def rotular_componentes(ocupacao):
+    """Rotula as componentes conexas (4-vizinhança) das células livres.
+
+    Union-find vetorizado: a cada rodada, toda aresta entre células livres
+    pendura a raiz de rótulo maior na de rótulo menor (np.minimum.at) e os
+    ponteiros são comprimidos por saltos sucessivos (rotulos[rotulos]), até
+    nenhuma aresta ligar rótulos diferentes. Retorna um array int32 plano
+    (y * largura + x) em que cada componente tem o menor id de suas
+    células como rótulo, e BLOQUEADA nas células ocupadas.
+    """
+    altura, largura = ocupacao.shape
+    livre = ~ocupacao.ravel()
+    ids = np.arange(altura * largura, dtype=np.int64).reshape(altura, largura)
+    pares = []
+    for a, b in ((ids[:, :-1], ids[:, 1:]), (ids[:-1, :], ids[1:, :])):
+        a, b = a.ravel(), b.ravel()
+        ambos = livre[a] & livre[b]
+        pares.append((a[ambos], b[ambos]))
+    a = np.concatenate([p[0] for p in pares])
+    b = np.concatenate([p[1] for p in pares])
+
+    rotulos = ids.ravel().copy()
+    while True:
+        ra, rb = rotulos[a], rotulos[b]
+        diferentes = ra != rb
+        if not diferentes.any():
+            break
+        ra, rb = ra[diferentes], rb[diferentes]
+        menor = np.minimum(ra, rb)
+        np.minimum.at(rotulos, ra, menor)
+        np.minimum.at(rotulos, rb, menor)
+        while True:
+            saltos = rotulos[rotulos]
+            if np.array_equal(saltos, rotulos):
+                break
+            rotulos = saltos
+    rotulos[~livre] = BLOQUEADA
+    return rotulos.astype(np.int32)
+
+
+class ComponentesConexas:
+    """Componentes conexas das células livres do almoxarifado, mantidas entre mudanças.
+
+    Toda prateleira bloqueia a passagem e só é acessada como destino, como no
+    ProblemaAlmoxarifado; por isso uma prateleira "pertence" às componentes
+    dos seus vizinhos livres, e a célula do robô vale o mesmo se ele estiver
+    parado numa prateleira. Com os rótulos guardados numa lista plana,
+    alcanca(a, b) compara no máximo 4 x 4 rótulos: O(1), sem nenhuma busca.
+
+    Esvaziar uma prateleira não muda nada (ela continua bloqueando). Só
+    atualizar_celula mexe nos rótulos: bloquear uma célula refaz por BFS
+    apenas a componente que pode ter se partido, e liberar uma célula junta
+    as componentes vizinhas.
+    """
+
+    def __init__(self, largura, altura, obstaculos):
+        self.largura = largura
+        self.altura = altura
+        self.rotulos = rotular_componentes(grade_ocupacao(obstaculos, largura, altura)).tolist()
+        self._proximo_rotulo = largura * altura
+
+    def _vizinhos(self, c):
+        w = self.largura
+        x, y = c % w, c // w
+        if y > 0: yield c - w
+        if y < self.altura - 1: yield c + w
+        if x > 0: yield c - 1
+        if x < w - 1: yield c + 1
+
+    def componente(self, pos):
+        """Rótulo da componente da célula livre pos, ou BLOQUEADA."""
+        return self.rotulos[pos[1] * self.largura + pos[0]]
+
+    def acessos(self, pos):
+        """Rótulos das componentes de onde se entra em pos (a própria, se livre; senão as dos vizinhos livres)."""
+        c = pos[1] * self.largura + pos[0]
+        rotulo = self.rotulos[c]
+        if rotulo != BLOQUEADA:
+            return {rotulo}
+        return {self.rotulos[v] for v in self._vizinhos(c)} - {BLOQUEADA}
+
+    def _vizinhas(self, a, b):
+        return abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+
+    def alcanca(self, origem, destino):
+        """True se existe caminho de origem até destino (qualquer um dos dois pode ser prateleira)."""
+        # Vizinhas: um passo direto, mesmo entre duas prateleiras (robô parado numa delas)
+        if origem == destino or self._vizinhas(origem, destino):
+            return True
+        return not self.acessos(origem).isdisjoint(self.acessos(destino))
+
+    def atualizar_celula(self, pos, bloqueado):
+        """Marca pos como prateleira/livre e corrige só as componentes afetadas."""
+        c = pos[1] * self.largura + pos[0]
+        rotulos = self.rotulos
+        if (rotulos[c] == BLOQUEADA) == bool(bloqueado):
+            return
+        vizinhos = [v for v in self._vizinhos(c) if rotulos[v] != BLOQUEADA]
+        if bloqueado:
+            rotulos[c] = BLOQUEADA
+            # Com até um vizinho livre a componente não se parte
+            if len(vizinhos) > 1:
+                self._rerrotular(vizinhos)
+            return
+        # Célula liberada: ela e as componentes vizinhas viram uma só
+        rotulos[c] = self._novo_rotulo()
+        if vizinhos:
+            self._rerrotular([c])
+
+    def _novo_rotulo(self):
+        self._proximo_rotulo += 1
+        return self._proximo_rotulo
+
+    def _rerrotular(self, sementes):
+        """BFS a partir de cada semente ainda não revisitada, dando um rótulo novo a cada região."""
+        rotulos = self.rotulos
+        visitadas = set()
+        for semente in sementes:
+            if semente in visitadas:
+                continue
+            rotulo = self._novo_rotulo()
+            visitadas.add(semente)
+            rotulos[semente] = rotulo
+            fila = deque([semente])
+            while fila:
+                c = fila.popleft()
+                for v in self._vizinhos(c):
+                    if v not in visitadas and rotulos[v] != BLOQUEADA:
+                        visitadas.add(v)
+                        rotulos[v] = rotulo
+                        fila.append(v)
+
+    def inalcancaveis(self, origem, destinos):
+        """Lista dos destinos sem caminho a partir de origem."""
+        acessos = self.acessos(origem)
+        return [d for d in destinos if d != origem and not self._vizinhas(origem, d)
+                and acessos.isdisjoint(self.acessos(d))]
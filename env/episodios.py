@@ -0,0 +1,143 @@
+# Arquivo: env/episodios.py
+
+import contextlib
+import io
+import math
+import multiprocessing
+import statistics
+import time
+
+from env.ambiente_almoxarifado import AmbienteAlmoxarifado
+
+# Quantis t de Student (bicaudal, 95%) para 1..30 graus de liberdade; acima disso, a normal
+T_95 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042)
+Z_95 = statistics.NormalDist().inv_cdf(0.975)
+
+# Medidas de cada episódio agregadas por comparar_agentes
+MEDIDAS = ('itens_entregues', 'passos', 'tempo')
+
+
+class EspecificacaoAmbiente:
+    """Descrição compacta de um episódio: layout, posição inicial e balcão.
+
+    É o que vai para os processos de trabalho no lugar de um
+    AmbienteAlmoxarifado inteiro: as prateleiras ficam numa tupla de
+    ((x, y), quantidade), barata de serializar, e construir() monta um
+    ambiente novo (com dicionários próprios) a cada episódio. Assim nenhum
+    ambiente precisa ser copiado com deepcopy, como em aima.agents.compare_agents.
+    """
+
+    __slots__ = ('largura', 'altura', 'prateleiras', 'pos_inicial', 'pos_entrega',
+                 'usar_matriz_distancias')
+
+    def __init__(self, largura, altura, prateleiras, pos_inicial, pos_entrega,
+                 usar_matriz_distancias=False):
+        self.largura = largura
+        self.altura = altura
+        self.prateleiras = tuple(sorted(dict(prateleiras).items()))
+        self.pos_inicial = pos_inicial
+        self.pos_entrega = pos_entrega
+        self.usar_matriz_distancias = usar_matriz_distancias
+
+    @classmethod
+    def do_ambiente(cls, ambiente, pos_inicial):
+        """Especificação do estado atual de um ambiente, com o robô partindo de pos_inicial."""
+        return cls(ambiente.largura, ambiente.altura, ambiente.prateleiras, pos_inicial,
+                   ambiente.pos_entrega, ambiente.usar_matriz_distancias)
+
+    def construir(self):
+        """Novo AmbienteAlmoxarifado, sem agentes e sem desenhar no terminal."""
+        ambiente = AmbienteAlmoxarifado(self.largura, self.altura, dict(self.prateleiras),
+                                        self.pos_entrega, self.usar_matriz_distancias)
+        ambiente.render = lambda: None
+        return ambiente
+
+    def criar_agente(self, fabrica):
+        """Chama fabrica(pos_inicial, prateleiras, pos_entrega, largura, altura).
+
+        É a assinatura de AgenteAlmoxarifado, então a própria classe (ou um
+        functools.partial dela com planejador=..., etc.) serve de fábrica.
+        """
+        return fabrica(self.pos_inicial, dict(self.prateleiras), self.pos_entrega,
+                       self.largura, self.altura)
+
+    def itens_totais(self):
+        return sum(quantidade for _, quantidade in self.prateleiras)
+
+
+def rodar_episodio(trabalho):
+    """Roda um episódio (fabrica, especificacao, passos) e devolve suas medidas.
+
+    Feito para os processos de trabalho: monta ambiente e agente a partir da
+    especificação, descarta o que eles imprimem e devolve um dict simples.
+    """
+    fabrica, especificacao, passos = trabalho
+    with contextlib.redirect_stdout(io.StringIO()):
+        ambiente = especificacao.construir()
+        agente = especificacao.criar_agente(fabrica)
+        ambiente.add_thing(agente, location=especificacao.pos_inicial)
+        inicio = time.perf_counter()
+        executados = 0
+        while executados < passos and not ambiente.is_done():
+            ambiente.step()
+            executados += 1
+        tempo = time.perf_counter() - inicio
+    entregues = ambiente.dados_agentes[agente]['itens_entregues']
+    return {
+        'itens_entregues': entregues,
+        'itens_totais': especificacao.itens_totais(),
+        'concluido': entregues == especificacao.itens_totais(),
+        'passos': executados,
+        'tempo': tempo,
+        'missao_impossivel': ambiente.missao_impossivel or getattr(agente, 'missao_impossivel', False),
+    }
+
+
+def intervalo_confianca(valores):
+    """(média, meia-largura do intervalo de 95%) pela t de Student; meia-largura None com um valor só."""
+    media = statistics.mean(valores)
+    n = len(valores)
+    if n < 2:
+        return media, None
+    quantil = T_95[n - 2] if n - 1 <= len(T_95) else Z_95
+    return media, quantil * statistics.stdev(valores) / math.sqrt(n)
+
+
+def resumir_episodios(episodios):
+    """Agrega os episódios de um agente: {medida: (média, meia-largura)} mais contagens."""
+    resumo = {medida: intervalo_confianca([e[medida] for e in episodios]) for medida in MEDIDAS}
+    resumo['episodios'] = len(episodios)
+    resumo['concluidos'] = sum(e['concluido'] for e in episodios)
+    return resumo
+
+
+def comparar_agentes(especificacoes, fabricas, passos=1000, processos=None):
+    """Versão paralela de aima.agents.compare_agents para o almoxarifado.
+
+    Cada par (fábrica, especificação) é um episódio rodado num
+    multiprocessing.Pool de `processos` processos (padrão: um por CPU); os
+    ambientes são montados lá dentro a partir das especificações. Fábricas
+    e especificações vão serializadas para os processos, então as fábricas
+    devem ser classes ou funções de módulo (ou functools.partial delas).
+    Retorna [(fabrica, resumo)], com o resumo de resumir_episodios e a
+    lista dos episódios em resumo['por_episodio'].
+    """
+    trabalhos = [(fabrica, especificacao, passos)
+                 for fabrica in fabricas for especificacao in especificacoes]
+    with multiprocessing.Pool(processos) as pool:
+        medidas = pool.map(rodar_episodio, trabalhos, chunksize=1)
+    resultados = []
+    n = len(especificacoes)
+    for i, fabrica in enumerate(fabricas):
+        episodios = medidas[i * n:(i + 1) * n]
+        resumo = resumir_episodios(episodios)
+        resumo['por_episodio'] = episodios
+        resultados.append((fabrica, resumo))
+    return resultados
+
+
+def testar_agente(fabrica, passos, especificacoes, processos=None):
+    """Como aima.agents.test_agent: o resumo de um agente nos episódios dados."""
+    return comparar_agentes(especificacoes, [fabrica], passos, processos)[0][1]
@@ -0,0 +1,140 @@
+# Arquivo: env/matriz_distancias.py
+
+import numpy as np
+
+from problems.campo_distancias import MOVIMENTOS, INALCANCAVEL, grade_ocupacao
+
+# Código de ação guardado na matriz de próximo passo (índice em MOVIMENTOS)
+SEM_PASSO = -1
+
+
+def chegadas_em_lote(ocupacao, origens, celulas_x, celulas_y):
+    """BFS vetorizada de até 64 origens ao mesmo tempo, com bits empacotados.
+
+    Cada célula guarda uma palavra uint64 em que o bit s indica que a onda da
+    origem s já passou por ali; um deslocamento do array avança as 64 frentes
+    de uma vez. Em vez de guardar 64 campos inteiros, registra só o instante
+    de chegada de cada origem nas células consultadas (celulas_x, celulas_y).
+    Retorna um array int32 (n_celulas, k) com a distância ou INALCANCAVEL.
+    Cada origem é livre no seu próprio campo, como em onda_distancias.
+    """
+    k = len(origens)
+    altura, largura = ocupacao.shape
+    permitido = np.where(ocupacao, np.uint64(0), ~np.uint64(0))
+    frente = np.zeros((altura, largura), dtype=np.uint64)
+    for s, (x, y) in enumerate(origens):
+        frente[y, x] |= np.uint64(1) << np.uint64(s)
+    visitado = frente.copy()
+    proxima = np.empty_like(frente)
+
+    chegada = np.full((len(celulas_x), 64), INALCANCAVEL, dtype=np.int32)
+
+    def registrar(palavras, d):
+        """Anota o instante d para os bits que acabaram de chegar nas células consultadas."""
+        novos = palavras[celulas_y, celulas_x]
+        linhas = np.nonzero(novos)[0]
+        if len(linhas):
+            bits = np.unpackbits(novos[linhas].view(np.uint8).reshape(-1, 8), axis=1,
+                                 bitorder='little').astype(bool)
+            bloco = chegada[linhas]
+            bloco[bits] = d
+            chegada[linhas] = bloco
+
+    registrar(frente, 0)
+    d = 0
+    while True:
+        d += 1
+        proxima[:] = 0
+        proxima[1:, :] |= frente[:-1, :]
+        proxima[:-1, :] |= frente[1:, :]
+        proxima[:, 1:] |= frente[:, :-1]
+        proxima[:, :-1] |= frente[:, 1:]
+        proxima &= permitido
+        proxima &= ~visitado
+        if not proxima.any():
+            return chegada[:, :k]
+        visitado |= proxima
+        registrar(proxima, d)
+        frente, proxima = proxima, frente
+
+
+class MatrizDistancias:
+    """Distâncias de caminho mínimo e próximo passo entre todos os pontos de interesse.
+
+    Os pontos são prateleiras com estoque, o balcão e as posições iniciais dos
+    robôs. Toda prateleira bloqueia a passagem e só é acessada como destino,
+    como no ProblemaAlmoxarifado. As tabelas são arrays NumPy P x P:
+    `distancias` (int32, -1 = inalcançável) e `proximo_passo` (int8, índice em
+    MOVIMENTOS da primeira ação de i rumo a j, -1 = nenhuma).
+    """
+
+    def __init__(self, largura, altura, obstaculos, pontos, versao=0):
+        self.largura = largura
+        self.altura = altura
+        self.versao = versao
+        self.pontos = list(dict.fromkeys(pontos))
+        self.indice = {p: i for i, p in enumerate(self.pontos)}
+        ocupacao = grade_ocupacao(obstaculos, largura, altura)
+
+        n = len(self.pontos)
+        self.distancias = np.full((n, n), INALCANCAVEL, dtype=np.int32)
+        self.proximo_passo = np.full((n, n), SEM_PASSO, dtype=np.int8)
+        if n == 0:
+            return
+
+        xs = np.array([p[0] for p in self.pontos])
+        ys = np.array([p[1] for p in self.pontos])
+        # Células consultadas: o próprio ponto e seus 4 vizinhos (fora da grade -> inválido)
+        viz_x = np.stack([xs + dx for _, dx, _ in MOVIMENTOS])
+        viz_y = np.stack([ys + dy for _, _, dy in MOVIMENTOS])
+        valido = (viz_x >= 0) & (viz_x < largura) & (viz_y >= 0) & (viz_y < altura)
+        celulas_x = np.concatenate([xs, np.clip(viz_x, 0, largura - 1).ravel()])
+        celulas_y = np.concatenate([ys, np.clip(viz_y, 0, altura - 1).ravel()])
+
+        grande = np.iinfo(np.int32).max
+        for inicio in range(0, n, 64):
+            origens = self.pontos[inicio:inicio + 64]
+            k = len(origens)
+            chegada = chegadas_em_lote(ocupacao, origens, celulas_x, celulas_y)
+            direto = chegada[:n]                                   # (n, k)
+            dv = chegada[n:].reshape(4, n, k)                      # (4, n, k)
+            dv = np.where(valido[:, :, np.newaxis] & (dv >= 0), dv, grande)
+            minimo = dv.min(axis=0)
+            # Pontos livres usam o próprio campo; prateleiras, o acesso pelo vizinho
+            dist = np.where(direto >= 0, direto,
+                            np.where(minimo < grande, minimo + 1, INALCANCAVEL))
+            self.distancias[:, inicio:inicio + k] = dist
+            # Primeiro passo de i rumo a j: vizinho com distância dist - 1
+            candidato = dv == (dist - 1)[np.newaxis]
+            passo = np.argmax(candidato, axis=0)
+            tem_passo = (dist > 0) & candidato.any(axis=0)
+            self.proximo_passo[:, inicio:inicio + k] = np.where(tem_passo, passo, SEM_PASSO)
+
+    def distancia(self, origem, destino):
+        """Número de passos entre dois pontos de interesse, ou None se inalcançável."""
+        d = int(self.distancias[self.indice[origem], self.indice[destino]])
+        return None if d == INALCANCAVEL else d
+
+    def proxima_acao(self, origem, destino):
+        """Primeira ação do caminho mínimo de origem até destino, ou None."""
+        codigo = int(self.proximo_passo[self.indice[origem], self.indice[destino]])
+        return None if codigo == SEM_PASSO else MOVIMENTOS[codigo][0]
+
+    def ordenar_por_distancia(self, origem, candidatos):
+        """Separa os candidatos em (alcançáveis por distância crescente, inalcançáveis).
+
+        Candidatos que não são pontos da matriz vão para o fim da lista de
+        alcançáveis, para que o chamador decida o que fazer com eles.
+        """
+        linha = self.distancias[self.indice[origem]]
+        alcancaveis, fora_da_matriz, inalcancaveis = [], [], []
+        for p in candidatos:
+            i = self.indice.get(p)
+            if i is None:
+                fora_da_matriz.append(p)
+            elif linha[i] == INALCANCAVEL:
+                inalcancaveis.append(p)
+            else:
+                alcancaveis.append(p)
+        alcancaveis.sort(key=lambda p: linha[self.indice[p]])
+        return alcancaveis + fora_da_matriz, inalcancaveis
@@ -51,6 +51,9 @@ class JogoSuperAlmoxarifado:
         self.pos_inicio_agente = (0, 0)
         self.em_execucao = False
         self.modo_edicao = tk.StringVar(value="prateleira")
+        # Decisão do agente em andamento (gerador) e o callback Tk que a continua
+        self.decisao = None
+        self._after_decisao = None
         
         # Variáveis de Animação
         self.pos_visual_agente = [0, 0] # Float [x, y]
@@ -267,6 +270,11 @@ class JogoSuperAlmoxarifado:
 
     def reiniciar(self):
         self.em_execucao = False
+        # Descarta a decisão pela metade: ela não pode agir sobre o cenário novo
+        if self._after_decisao is not None:
+            self.root.after_cancel(self._after_decisao)
+            self._after_decisao = None
+        self.decisao = None
         self.prateleiras = {}
         self.pos_entrega = None
         self.pos_inicio_agente = (0, 0)
@@ -298,7 +306,7 @@ class JogoSuperAlmoxarifado:
             self.em_execucao = False
             self.btn_iniciar.config(state=tk.NORMAL, bg="#27ae60", text="INICIAR MISSÃO")
             # Verifica se encerrou por layout impossível ou por sucesso real
-            layout_impossivel = any(
+            layout_impossivel = self.ambiente.missao_impossivel or any(
                 getattr(ag, 'missao_impossivel', False) for ag in self.ambiente.agents
             )
             if layout_impossivel:
@@ -311,9 +319,27 @@ class JogoSuperAlmoxarifado:
                 messagebox.showinfo("Sucesso", "Missão Cumprida!\nTodas as entregas realizadas.")
             return
 
-        # Executa 1 passo na lógica
-        self.ambiente.step()
-        
+        # Executa 1 passo na lógica. A decisão do agente avança em fatias de
+        # expansões entre callbacks do Tk, para a janela não travar numa busca longa
+        self.decisao = self.agente.decidir_em_passos(self.ambiente.percept(self.agente))
+        self.continuar_decisao()
+
+    def continuar_decisao(self):
+        self._after_decisao = None
+        if not self.em_execucao or self.decisao is None: return
+        try:
+            next(self.decisao)
+        except StopIteration as fim:
+            self.decisao = None
+            # Mesmo efeito de ambiente.step() com a ação já decidida
+            self.ambiente.execute_action(self.agente, fim.value)
+            self.ambiente.exogenous_change()
+            self.ambiente.render()
+            self.concluir_passo()
+            return
+        self._after_decisao = self.root.after(1, self.continuar_decisao)
+
+    def concluir_passo(self):
         # Sincroniza dados para visualização extraindo os dados do ambiente
         dados_agente = self.ambiente.dados_agentes[self.agente]
         pos_destino = dados_agente['posicao']
@@ -9,6 +9,7 @@ try:
     # Importações atualizadas refletindo a nova estrutura de diretórios e classes em português
     from env.ambiente_almoxarifado import AmbienteAlmoxarifado
     from agents.agente_almoxarifado import AgenteAlmoxarifado
+    from agents.perfil_buscas import VARIAVEL_PERFIL
 except ImportError as e:
     print("ERRO DE IMPORTAÇÃO:")
     print("Certifique-se de que as pastas '/env' e '/agents' existem e contêm os arquivos corretos.")
@@ -79,6 +80,15 @@ def main():
     # A cada passo, o ambiente chamará o método render() que acabamos de adicionar
     ambiente.run(steps=60)
 
+    # Perfil das buscas, ligado pela variável de ambiente ALMOXARIFADO_PERFIL=<arquivo .jsonl/.csv>
+    if agente.perfil is not None:
+        for local, totais in agente.perfil.resumo().items():
+            print(f"[PERFIL] {local}: {totais}")
+        destino = os.environ.get(VARIAVEL_PERFIL)
+        if destino:
+            agente.perfil.exportar(destino)
+            print(f"[PERFIL] {len(agente.perfil)} buscas gravadas em {destino}")
+
     print("\n===========================================================")
     print("                  FIM DA SIMULAÇÃO")
     print("===========================================================")
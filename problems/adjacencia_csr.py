@@ -0,0 +1,150 @@
+# Arquivo: problems/adjacencia_csr.py
+
+import heapq
+from array import array
+
+import numpy as np
+
+from problems.campo_distancias import grade_ocupacao
+
+
+class AdjacenciaCSR:
+    """Tabela de vizinhos da grade em formato CSR, compilada uma vez por layout.
+
+    A linha da célula c (id y * largura + x) é indices[offsets[c]:offsets[c + 1]]:
+    os vizinhos livres de c, na ordem N, S, O, L de ProblemaAlmoxarifado.actions.
+    Células bloqueadas também têm linha (seus vizinhos livres): é por ela que
+    se entra numa prateleira alvo, ou se sai de uma quando o robô está parado
+    nela. Os planejadores percorrem a tabela com
+    `for i in range(offsets[c], offsets[c + 1]): v = indices[i]`, sem montar
+    listas, tuplas nem checar limites e obstáculos a cada expansão.
+
+    offsets e indices são array('i'). atualizar_celula muda só o trecho das
+    linhas vizinhas da célula (ids c - largura .. c + largura) e desloca os
+    offsets seguintes com uma operação NumPy sobre o mesmo buffer.
+    """
+
+    def __init__(self, obstaculos, largura, altura):
+        self.largura = largura
+        self.altura = altura
+        self.total = largura * altura
+        ocupacao = grade_ocupacao(obstaculos, largura, altura).ravel()
+        self.bloqueado = bytearray(ocupacao.tobytes())
+        self.versao = 0
+
+        ids = np.arange(self.total)
+        x, y = ids % largura, ids // largura
+        candidatos = np.stack([ids - largura, ids + largura, ids - 1, ids + 1], axis=1)
+        dentro = np.stack([y > 0, y < altura - 1, x > 0, x < largura - 1], axis=1)
+        validos = dentro & ~ocupacao[np.where(dentro, candidatos, 0)]
+        self.offsets = array('i', np.concatenate([[0], np.cumsum(validos.sum(axis=1))]).astype(np.int32).tobytes())
+        self.indices = array('i', candidatos[validos].astype(np.int32).tobytes())
+
+    def vizinhos(self, c):
+        """Ids dos vizinhos livres de c (cópia; os planejadores iteram offsets/indices direto)."""
+        return self.indices[self.offsets[c]:self.offsets[c + 1]].tolist()
+
+    def _linha(self, c):
+        w = self.largura
+        x, y = c % w, c // w
+        bloqueado = self.bloqueado
+        linha = []
+        if y > 0 and not bloqueado[c - w]: linha.append(c - w)
+        if y < self.altura - 1 and not bloqueado[c + w]: linha.append(c + w)
+        if x > 0 and not bloqueado[c - 1]: linha.append(c - 1)
+        if x < w - 1 and not bloqueado[c + 1]: linha.append(c + 1)
+        return linha
+
+    def atualizar_celula(self, pos, bloqueado):
+        """Marca pos como prateleira/livre e refaz só as linhas que a citam."""
+        c = pos[1] * self.largura + pos[0]
+        if bool(self.bloqueado[c]) == bool(bloqueado):
+            return
+        self.bloqueado[c] = 1 if bloqueado else 0
+        # As linhas afetadas são as dos 4 vizinhos, todas entre c - largura e c + largura
+        primeira = max(c - self.largura, 0)
+        ultima = min(c + self.largura, self.total - 1)
+        inicio, fim = self.offsets[primeira], self.offsets[ultima + 1]
+        trecho = array('i')
+        for v in range(primeira, ultima + 1):
+            self.offsets[v] = inicio + len(trecho)
+            trecho.extend(self._linha(v))
+        self.indices[inicio:fim] = trecho
+        # Os offsets seguintes andam pela diferença de tamanho do trecho
+        np.frombuffer(self.offsets, dtype=np.int32)[ultima + 1:] += len(trecho) - (fim - inicio)
+        self.versao += 1
+
+    def acao_entre(self, origem, destino):
+        diferenca = destino - origem
+        if diferenca == -self.largura: return 'N'
+        if diferenca == self.largura: return 'S'
+        if diferenca == -1: return 'O'
+        return 'L'
+
+    def _reconstruir(self, pais, origem, destino):
+        acoes = []
+        c = destino
+        while c != origem:
+            p = pais[c]
+            acoes.append(self.acao_entre(p, c))
+            c = p
+        acoes.reverse()
+        return acoes
+
+    def astar(self, origem, alvo):
+        """A* sobre a tabela, com os mesmos desempates (e o mesmo caminho) de GradeAlmoxarifado.astar.
+
+        O alvo entra como vizinho extra das células da sua própria linha.
+        Retorna a lista de ações ou None.
+        """
+        w, h = self.largura, self.altura
+        offsets, indices = self.offsets, self.indices
+        ax, ay = alvo % w, alvo // w
+        # Células de onde se entra na prateleira alvo (a origem pode ser outra prateleira)
+        entradas = {v for v in (alvo - w, alvo + w, alvo - 1, alvo + 1)
+                    if 0 <= v < self.total and abs(v % w - ax) + abs(v // w - ay) == 1
+                    } if self.bloqueado[alvo] else ()
+        g = array('l', [-1]) * self.total
+        pais = array('l', [-1]) * self.total
+        fechado = bytearray(self.total)
+
+        g[origem] = 0
+        ox, oy = origem % w, origem // w
+        fronteira = [(abs(ox - ax) + abs(oy - ay), ox * h + oy, origem)]
+        while fronteira:
+            f, _, c = heapq.heappop(fronteira)
+            if fechado[c]:
+                continue
+            gc = g[c]
+            # Entrada obsoleta (a célula foi reinserida com g menor)
+            if f != gc + abs(c % w - ax) + abs(c // w - ay):
+                continue
+            if c == alvo:
+                return self._reconstruir(pais, origem, alvo)
+            fechado[c] = 1
+            ng = gc + 1
+            for i in range(offsets[c], offsets[c + 1] + (c in entradas)):
+                v = indices[i] if i < offsets[c + 1] else alvo
+                if fechado[v]:
+                    continue
+                if g[v] == -1 or ng < g[v]:
+                    g[v] = ng
+                    pais[v] = c
+                    vx, vy = v % w, v // w
+                    heapq.heappush(fronteira, (ng + abs(vx - ax) + abs(vy - ay), vx * h + vy, v))
+        return None
+
+    def distancias(self, origem):
+        """BFS a partir de origem: array('l') com a distância de cada célula livre, ou -1."""
+        offsets, indices = self.offsets, self.indices
+        dist = array('l', [-1]) * self.total
+        dist[origem] = 0
+        fila = [origem]
+        for c in fila:
+            d = dist[c] + 1
+            for i in range(offsets[c], offsets[c + 1]):
+                v = indices[i]
+                if dist[v] == -1:
+                    dist[v] = d
+                    fila.append(v)
+        return dist
@@ -0,0 +1,125 @@
+# Arquivo: problems/campo_distancias.py
+
+import numpy as np
+
+# Deslocamentos (dx, dy) na mesma ordem de ProblemaAlmoxarifado.actions
+MOVIMENTOS = (('N', 0, -1), ('S', 0, 1), ('O', -1, 0), ('L', 1, 0))
+INVERSA = {'N': 'S', 'S': 'N', 'O': 'L', 'L': 'O'}
+INALCANCAVEL = -1
+
+
+def grade_ocupacao(obstaculos, largura, altura):
+    """Monta a grade de ocupação (altura x largura) com True nas células bloqueadas.
+
+    `obstaculos` pode ser o dicionário de prateleiras ou qualquer coleção de (x, y).
+    """
+    ocupacao = np.zeros((altura, largura), dtype=bool)
+    for (x, y) in obstaculos:
+        if 0 <= x < largura and 0 <= y < altura:
+            ocupacao[y, x] = True
+    return ocupacao
+
+
+def onda_distancias(ocupacao, origem):
+    """BFS vetorizada (frente de onda) a partir de origem sobre a grade de ocupação.
+
+    Cada iteração expande a frente inteira de uma vez com deslocamentos de
+    arrays NumPy. Retorna um array int32 com a distância em passos de cada
+    célula livre até a origem, ou INALCANCAVEL. A origem é sempre tratada como
+    livre, mesmo que seja uma prateleira (robô parado onde acabou de pegar).
+    """
+    altura, largura = ocupacao.shape
+    ox, oy = origem
+    livre = ~ocupacao
+    livre[oy, ox] = True
+    dist = np.full((altura, largura), INALCANCAVEL, dtype=np.int32)
+    dist[oy, ox] = 0
+    frente = np.zeros_like(livre)
+    frente[oy, ox] = True
+    d = 0
+    while True:
+        d += 1
+        proxima = np.zeros_like(frente)
+        proxima[1:, :] |= frente[:-1, :]
+        proxima[:-1, :] |= frente[1:, :]
+        proxima[:, 1:] |= frente[:, :-1]
+        proxima[:, :-1] |= frente[:, 1:]
+        proxima &= livre
+        proxima &= dist == INALCANCAVEL
+        if not proxima.any():
+            return dist
+        dist[proxima] = d
+        frente = proxima
+
+
+def distancias_de_acesso(dist, ocupacao):
+    """Completa o campo com a distância para *entrar* em cada célula bloqueada.
+
+    Uma prateleira é alcançada pelo vizinho livre mais próximo, então sua
+    distância é 1 + o mínimo entre os vizinhos alcançados. Assim o campo
+    responde também para prateleiras usadas como alvo.
+    """
+    grande = np.iinfo(np.int32).max
+    base = np.where(dist >= 0, dist, grande)
+    minimo = np.full_like(base, grande)
+    minimo[1:, :] = np.minimum(minimo[1:, :], base[:-1, :])
+    minimo[:-1, :] = np.minimum(minimo[:-1, :], base[1:, :])
+    minimo[:, 1:] = np.minimum(minimo[:, 1:], base[:, :-1])
+    minimo[:, :-1] = np.minimum(minimo[:, :-1], base[:, 1:])
+    acesso = ocupacao & (dist < 0) & (minimo < grande)
+    campo = dist.copy()
+    campo[acesso] = minimo[acesso] + 1
+    return campo
+
+
+class CampoDistancias:
+    """Campo de distâncias de caminho mínimo de uma célula origem para todo o almoxarifado.
+
+    Calculado uma única vez por onda_distancias; depois responde em O(1) se
+    uma célula (livre ou prateleira) é alcançável e a que distância, e gera
+    rotas por descida de gradiente, sem nenhuma busca.
+    """
+
+    def __init__(self, obstaculos, origem, largura, altura):
+        self.origem = origem
+        self.largura = largura
+        self.altura = altura
+        self.ocupacao = grade_ocupacao(obstaculos, largura, altura)
+        self.ocupacao[origem[1], origem[0]] = False
+        self.distancias = distancias_de_acesso(onda_distancias(self.ocupacao, origem), self.ocupacao)
+
+    def distancia(self, pos):
+        """Número de passos entre a origem e pos, ou None se inalcançável."""
+        x, y = pos
+        if not (0 <= x < self.largura and 0 <= y < self.altura):
+            return None
+        d = int(self.distancias[y, x])
+        return None if d == INALCANCAVEL else d
+
+    def alcancavel(self, pos):
+        """True se existe caminho entre a origem e pos."""
+        return self.distancia(pos) is not None
+
+    def rota_ate_origem(self, pos):
+        """Lista de ações que leva de pos até a origem, descendo o gradiente do campo."""
+        d = self.distancia(pos)
+        if d is None:
+            return None
+        acoes = []
+        x, y = pos
+        while d > 0:
+            for nome, dx, dy in MOVIMENTOS:
+                nx, ny = x + dx, y + dy
+                if (0 <= nx < self.largura and 0 <= ny < self.altura
+                        and not self.ocupacao[ny, nx] and self.distancias[ny, nx] == d - 1):
+                    acoes.append(nome)
+                    x, y, d = nx, ny, d - 1
+                    break
+        return acoes
+
+    def rota_desde_origem(self, pos):
+        """Lista de ações que leva da origem até pos (a descida de pos, invertida)."""
+        volta = self.rota_ate_origem(pos)
+        if volta is None:
+            return None
+        return [INVERSA[a] for a in reversed(volta)]
@@ -0,0 +1,155 @@
+# Arquivo: problems/dstar_almoxarifado.py
+
+import heapq
+
+from problems.grade_almoxarifado import GradeAlmoxarifado
+
+MOVIMENTOS = (('N', 0, -1), ('S', 0, 1), ('O', -1, 0), ('L', 1, 0))
+INFINITO = float('inf')
+
+
+class DStarLite:
+    """D* Lite (versão otimizada de Koenig & Likhachev) para um alvo fixo na grade.
+
+    A busca cresce a partir do alvo em direção ao robô, guardando para cada
+    célula g (custo até o alvo) e rhs (estimativa de um passo à frente). Entrar
+    numa prateleira é proibido, exceto no próprio alvo; a célula do robô pode
+    ser uma prateleira (ele acabou de pegar a caixa).
+
+    A instância fica viva entre decisões: mover_inicio acompanha o robô (só
+    acumula km, sem refazer nada) e atualizar_celula avisa que uma célula passou
+    a bloquear ou foi liberada. O próximo planejar() reprocessa apenas as
+    células cujo custo mudou por causa disso, em vez de refazer a busca.
+    """
+
+    def __init__(self, obstaculos, alvo, inicio, largura, altura):
+        self.grade = GradeAlmoxarifado(obstaculos, largura, altura)
+        self.largura = largura
+        self.altura = altura
+        self.alvo = alvo
+        self.inicio = inicio
+        self.km = 0
+        self.g = {}
+        self.rhs = {alvo: 0}
+        # Fila com remoção preguiçosa: na_fila guarda a chave válida de cada célula
+        self._fila = []
+        self._na_fila = {}
+        self.expansoes = 0
+        self._inserir(alvo, (self._h(alvo), 0))
+
+    # ------------------------------------------------------------------
+    # Grafo
+    # ------------------------------------------------------------------
+
+    def _h(self, s):
+        return abs(s[0] - self.inicio[0]) + abs(s[1] - self.inicio[1])
+
+    def _vizinhos(self, s):
+        x, y = s
+        for nome, dx, dy in MOVIMENTOS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.largura and 0 <= ny < self.altura:
+                yield nome, (nx, ny)
+
+    def _custo(self, destino):
+        """Custo de entrar em destino: 1, ou infinito se for prateleira (exceto o alvo)."""
+        if destino != self.alvo and self.grade.bloqueado[destino[1] * self.largura + destino[0]]:
+            return INFINITO
+        return 1
+
+    def _chave(self, s):
+        m = min(self.g.get(s, INFINITO), self.rhs.get(s, INFINITO))
+        return (m + self._h(s) + self.km, m)
+
+    # ------------------------------------------------------------------
+    # Fila de prioridade
+    # ------------------------------------------------------------------
+
+    def _inserir(self, s, chave):
+        self._na_fila[s] = chave
+        heapq.heappush(self._fila, (chave, s))
+
+    def _topo(self):
+        """Descarta entradas obsoletas e retorna (chave, célula) do topo, ou None."""
+        while self._fila:
+            chave, s = self._fila[0]
+            if self._na_fila.get(s) == chave:
+                return chave, s
+            heapq.heappop(self._fila)
+        return None
+
+    # ------------------------------------------------------------------
+    # D* Lite
+    # ------------------------------------------------------------------
+
+    def _atualizar_vertice(self, u):
+        if u != self.alvo:
+            self.rhs[u] = min(
+                (self._custo(v) + self.g.get(v, INFINITO) for _, v in self._vizinhos(u)),
+                default=INFINITO,
+            )
+        self._na_fila.pop(u, None)
+        if self.g.get(u, INFINITO) != self.rhs.get(u, INFINITO):
+            self._inserir(u, self._chave(u))
+
+    def _calcular_caminho(self):
+        while True:
+            topo = self._topo()
+            g_inicio = self.g.get(self.inicio, INFINITO)
+            rhs_inicio = self.rhs.get(self.inicio, INFINITO)
+            if topo is None or (topo[0] >= self._chave(self.inicio) and rhs_inicio == g_inicio):
+                return
+            k_antiga, u = topo
+            k_nova = self._chave(u)
+            if k_antiga < k_nova:
+                self._inserir(u, k_nova)
+                continue
+            heapq.heappop(self._fila)
+            del self._na_fila[u]
+            self.expansoes += 1
+            if self.g.get(u, INFINITO) > self.rhs[u]:
+                self.g[u] = self.rhs[u]
+                # Só quem pode entrar em u ganha com a melhora
+                if self._custo(u) != INFINITO:
+                    for _, p in self._vizinhos(u):
+                        self._atualizar_vertice(p)
+            else:
+                self.g[u] = INFINITO
+                for _, p in self._vizinhos(u):
+                    self._atualizar_vertice(p)
+                self._atualizar_vertice(u)
+
+    def mover_inicio(self, pos):
+        """Informa a nova posição do robô (a busca existente continua valendo)."""
+        # km compensa a queda da heurística nas chaves já enfileiradas
+        self.km += abs(pos[0] - self.inicio[0]) + abs(pos[1] - self.inicio[1])
+        self.inicio = pos
+
+    def atualizar_celula(self, pos, bloqueado):
+        """Marca pos como prateleira/livre e reabre só as células que entram nela."""
+        x, y = pos
+        indice = y * self.largura + x
+        if bool(self.grade.bloqueado[indice]) == bool(bloqueado):
+            return
+        self.grade.bloqueado[indice] = 1 if bloqueado else 0
+        for _, u in self._vizinhos(pos):
+            self._atualizar_vertice(u)
+
+    def planejar(self):
+        """Repara a busca e retorna a lista de ações do início até o alvo, ou None."""
+        self._calcular_caminho()
+        if self.g.get(self.inicio, INFINITO) == INFINITO and self.inicio != self.alvo:
+            return None
+        acoes = []
+        s = self.inicio
+        while s != self.alvo:
+            melhor = None
+            for nome, v in self._vizinhos(s):
+                custo = self._custo(v) + self.g.get(v, INFINITO)
+                if melhor is None or custo < melhor[0]:
+                    melhor = (custo, nome, v)
+            if melhor is None or melhor[0] == INFINITO:
+                return None
+            acoes.append(melhor[1])
+            s = melhor[2]
+        return acoes
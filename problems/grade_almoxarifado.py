@@ -0,0 +1,176 @@
+# Arquivo: problems/grade_almoxarifado.py
+
+import heapq
+from array import array
+
+# Ações de movimento na mesma ordem de ProblemaAlmoxarifado.actions
+ACOES_MOVIMENTO = ('N', 'S', 'O', 'L')
+
+
+class GradeAlmoxarifado:
+    """Representação compacta da grade do almoxarifado.
+
+    Cada célula (x, y) vira um id inteiro `y * largura + x`, e as células
+    bloqueadas ficam num bytearray. Os algoritmos deste módulo trabalham só
+    com esses ids e com arrays pré-alocados, sem criar Nodes nem tuplas por
+    expansão. O resultado é a mesma lista de ações de Node.solution().
+    """
+
+    def __init__(self, obstaculos, largura, altura):
+        self.largura = largura
+        self.altura = altura
+        self.total = largura * altura
+        self.bloqueado = bytearray(self.total)
+        for (x, y) in obstaculos:
+            if 0 <= x < largura and 0 <= y < altura:
+                self.bloqueado[y * largura + x] = 1
+
+    def celula(self, x, y):
+        """Converte coordenadas (x, y) no id da célula."""
+        return y * self.largura + x
+
+    def coordenadas(self, c):
+        """Converte o id da célula de volta para (x, y)."""
+        return c % self.largura, c // self.largura
+
+    def vizinhos(self, c):
+        """Lista (ação, célula) das células adjacentes dentro dos limites, em ordem N, S, O, L."""
+        w = self.largura
+        x, y = c % w, c // w
+        resultado = []
+        if y > 0: resultado.append(('N', c - w))
+        if y < self.altura - 1: resultado.append(('S', c + w))
+        if x > 0: resultado.append(('O', c - 1))
+        if x < w - 1: resultado.append(('L', c + 1))
+        return resultado
+
+    def acao_entre(self, origem, destino):
+        """Retorna a ação de movimento que leva da célula origem à vizinha destino."""
+        diferenca = destino - origem
+        if diferenca == -self.largura: return 'N'
+        if diferenca == self.largura: return 'S'
+        if diferenca == -1: return 'O'
+        return 'L'
+
+    def reconstruir(self, pais, origem, destino):
+        """Percorre o array de pais de destino até origem e devolve a lista de ações."""
+        acoes = []
+        c = destino
+        while c != origem:
+            p = pais[c]
+            acoes.append(self.acao_entre(p, c))
+            c = p
+        acoes.reverse()
+        return acoes
+
+    def astar(self, origem, alvo):
+        """A* sobre ids de célula com g e pais em arrays pré-alocados.
+
+        O alvo é sempre atravessável, mesmo que esteja marcado como bloqueado
+        (é a prateleira de onde o robô vai pegar o item). Os empates em f são
+        desempatados por (x, y), como na fila de Nodes do aima, de modo que o
+        caminho devolvido é o mesmo do astar_search sobre ProblemaAlmoxarifado.
+        Retorna a lista de ações ou None se o alvo for inalcançável.
+        """
+        w, h = self.largura, self.altura
+        bloqueado = self.bloqueado
+        ax, ay = alvo % w, alvo // w
+        g = array('l', [-1]) * self.total
+        pais = array('l', [-1]) * self.total
+        fechado = bytearray(self.total)
+
+        g[origem] = 0
+        ox, oy = origem % w, origem // w
+        fronteira = [(abs(ox - ax) + abs(oy - ay), ox * h + oy, origem)]
+        while fronteira:
+            f, _, c = heapq.heappop(fronteira)
+            if fechado[c]:
+                continue
+            gc = g[c]
+            x, y = c % w, c // w
+            # Entrada obsoleta (a célula foi reinserida com g menor)
+            if f != gc + abs(x - ax) + abs(y - ay):
+                continue
+            if c == alvo:
+                return self.reconstruir(pais, origem, alvo)
+            fechado[c] = 1
+            ng = gc + 1
+            for dentro, v, vx, vy in ((y > 0, c - w, x, y - 1),
+                                      (y < h - 1, c + w, x, y + 1),
+                                      (x > 0, c - 1, x - 1, y),
+                                      (x < w - 1, c + 1, x + 1, y)):
+                if not dentro or fechado[v] or (bloqueado[v] and v != alvo):
+                    continue
+                if g[v] == -1 or ng < g[v]:
+                    g[v] = ng
+                    pais[v] = c
+                    heapq.heappush(fronteira, (ng + abs(vx - ax) + abs(vy - ay), vx * h + vy, v))
+        return None
+
+    def mais_proximo(self, origem, alvos):
+        """BFS única a partir de origem que para no primeiro id de alvos alcançado.
+
+        Os alvos são atravessáveis só como destino (prateleiras com item); as
+        demais células bloqueadas barram a passagem. Como todo passo custa 1,
+        o primeiro alvo gerado é o mais próximo pelo caminho real.
+        Retorna (alvo, ações, inalcançáveis): alvo é None se nenhum foi
+        alcançado, e então todos os alvos são inalcançáveis; senão os
+        inalcançáveis são os que já se sabe que estão cercados (nenhum
+        vizinho livre e não vizinhos da origem, que pode ser uma prateleira),
+        sem custo extra para a varredura.
+        """
+        w, h = self.largura, self.altura
+        bloqueado = self.bloqueado
+        alvos = set(alvos)
+        # Um alvo só é alcançado a partir de uma célula livre ou da própria origem
+        junto_da_origem = {v for _, v in self.vizinhos(origem)} | {origem}
+        cercados = {c for c in alvos - junto_da_origem
+                    if not any(not bloqueado[v] for _, v in self.vizinhos(c))}
+        if origem in alvos:
+            return origem, [], cercados
+        pais = array('l', [-1]) * self.total
+        pais[origem] = origem
+        fila = [origem]
+        for c in fila:
+            x, y = c % w, c // w
+            for dentro, v in ((y > 0, c - w), (y < h - 1, c + w),
+                              (x > 0, c - 1), (x < w - 1, c + 1)):
+                if not dentro or pais[v] != -1:
+                    continue
+                if v in alvos:
+                    pais[v] = c
+                    return v, self.reconstruir(pais, origem, v), cercados
+                if bloqueado[v]:
+                    continue
+                pais[v] = c
+                fila.append(v)
+        return None, None, alvos
+
+
+def prateleira_mais_proxima(estado_inicial, obstaculos, candidatos, largura, altura):
+    """Escolhe, numa única varredura, a prateleira candidata mais próxima pelo caminho real.
+
+    Recebe o estado (x, y, status), as prateleiras (obstáculos, candidatas
+    incluídas) e as candidatas (x, y). Retorna (alvo, ações, inalcançáveis)
+    com alvo e inalcançáveis em coordenadas (x, y); veja
+    GradeAlmoxarifado.mais_proximo.
+    """
+    grade = GradeAlmoxarifado(obstaculos, largura, altura)
+    origem = grade.celula(estado_inicial[0], estado_inicial[1])
+    alvo, acoes, inalcancaveis = grade.mais_proximo(
+        origem, [grade.celula(x, y) for x, y in candidatos]
+    )
+    if alvo is not None:
+        alvo = grade.coordenadas(alvo)
+    return alvo, acoes, {grade.coordenadas(c) for c in inalcancaveis}
+
+
+def astar_grade(estado_inicial, obstaculos, alvo, largura, altura):
+    """Atalho com as mesmas entradas de ProblemaAlmoxarifado.
+
+    Recebe o estado (x, y, status), o conjunto de obstáculos e o alvo (x, y)
+    e devolve a lista de ações (como Node.solution()) ou None.
+    """
+    grade = GradeAlmoxarifado(obstaculos, largura, altura)
+    origem = grade.celula(estado_inicial[0], estado_inicial[1])
+    return grade.astar(origem, grade.celula(*alvo))
@@ -0,0 +1,78 @@
+# Arquivo: problems/heuristica_perfeita.py
+
+from array import array
+from collections import OrderedDict
+
+from problems.campo_distancias import INALCANCAVEL, CampoDistancias
+
+
+class HeuristicaPerfeita:
+    """Heurística exata para alvos frequentes, a partir de campos de distância reversos.
+
+    Para cada alvo guarda o CampoDistancias com origem no alvo: como os
+    movimentos são reversíveis, o valor em cada célula é exatamente o custo
+    de ir dela até o alvo. Os campos são criados na primeira consulta ao
+    alvo, ficam num cache LRU de `capacidade` alvos e são todos descartados
+    quando o conjunto de obstáculos muda (detectado ao consultar um alvo
+    guardado com outros obstáculos).
+
+    Com h exata, todo nó fora de um caminho ótimo tem f >= custo ótimo + 1.
+    h é multiplicada por (1 + epsilon), com epsilon * h < 1: os empates de f
+    passam a favorecer o nó mais fundo, o A* expande só o caminho, e nenhum
+    nó fora dele ultrapassa os do caminho (o plano continua ótimo).
+    Uso: astar_search(problema, h=cache.para(problema)).
+    """
+
+    def __init__(self, capacidade=8):
+        self.capacidade = capacidade
+        # (alvo, largura, altura) -> (obstáculos usados, tabela)
+        self._campos = OrderedDict()
+        self.construidos = 0
+
+    def __len__(self):
+        return len(self._campos)
+
+    def _tabela(self, obstaculos, alvo, largura, altura):
+        """Tabela plana de distâncias até alvo (y * largura + x), criada sob demanda."""
+        # O alvo é sempre a origem livre do campo, então fica fora dos obstáculos
+        obstaculos = frozenset(obstaculos) - {alvo}
+        chave = (alvo, largura, altura)
+        if self._campos:
+            # Compara com o campo mais recente, ignorando os dois alvos (cada um
+            # fica fora dos próprios obstáculos): diferença = layout novo
+            (alvo_recente, _, _), (obstaculos_recentes, _) = next(reversed(self._campos.items()))
+            if obstaculos - {alvo_recente} != obstaculos_recentes - {alvo}:
+                self._campos.clear()
+        guardado = self._campos.get(chave)
+        if guardado is not None and guardado[0] != obstaculos:
+            # Mesmo alvo com outros obstáculos: só a célula de algum alvo mudou
+            self._campos.clear()
+            guardado = None
+        if guardado is None:
+            campo = CampoDistancias(obstaculos, alvo, largura, altura)
+            guardado = (obstaculos, array('i', campo.distancias.ravel().tolist()))
+            self.construidos += 1
+            self._campos[chave] = guardado
+            while len(self._campos) > self.capacidade:
+                self._campos.popitem(last=False)
+        else:
+            self._campos.move_to_end(chave)
+        return guardado[1]
+
+    def heuristica(self, obstaculos, alvo, largura, altura):
+        """Função h(node) exata rumo a alvo, para o h= do astar_search."""
+        tabela = self._tabela(obstaculos, alvo, largura, altura)
+        # Fator de desempate: epsilon * h < 1 para qualquer distância na grade
+        fator = 1 + 1 / (largura * altura + 1)
+        infinito = float('inf')
+
+        def h(node):
+            x, y = node.state[0], node.state[1]
+            d = tabela[y * largura + x]
+            return infinito if d == INALCANCAVEL else d * fator
+
+        return h
+
+    def para(self, problema):
+        """Atalho para um ProblemaAlmoxarifado (usa seus obstáculos, alvo e dimensões)."""
+        return self.heuristica(problema.obstaculos, problema.alvo, problema.largura, problema.altura)
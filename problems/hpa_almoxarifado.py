@@ -0,0 +1,266 @@
+# Arquivo: problems/hpa_almoxarifado.py
+
+import heapq
+from collections import deque
+
+from problems.grade_almoxarifado import GradeAlmoxarifado
+
+MOVIMENTOS = (('N', 0, -1), ('S', 0, 1), ('O', -1, 0), ('L', 1, 0))
+NOME_DIRECAO = {(dx, dy): nome for nome, dx, dy in MOVIMENTOS}
+
+# Entradas com pelo menos este comprimento ganham duas transições (uma em cada ponta)
+ENTRADA_LONGA = 6
+
+
+class HierarquiaAlmoxarifado:
+    """Planejador hierárquico (HPA*) sobre a grade de prateleiras.
+
+    O piso é dividido em clusters quadrados de `tamanho_cluster` células. Em
+    cada fronteira entre clusters vizinhos, os trechos contínuos livres dos
+    dois lados viram entradas, representadas por transições (pares de células
+    adjacentes, uma em cada cluster). O grafo abstrato liga as transições
+    (custo 1) e, dentro de cada cluster, todas as células de transição entre
+    si pelo custo de uma BFS restrita ao cluster.
+
+    A consulta insere origem e alvo no grafo abstrato, busca nele com A* e
+    refina só os trechos do caminho escolhido. Alterar uma célula
+    (atualizar_celula) recalcula apenas as fronteiras do cluster dela e os
+    clusters vizinhos, nunca a hierarquia inteira. Os planos são quase
+    ótimos (o custo pode passar um pouco do ótimo).
+    """
+
+    def __init__(self, obstaculos, largura, altura, tamanho_cluster=10):
+        self.grade = GradeAlmoxarifado(obstaculos, largura, altura)
+        self.largura = largura
+        self.altura = altura
+        self.tamanho = tamanho_cluster
+        self.colunas = (largura + tamanho_cluster - 1) // tamanho_cluster
+        self.linhas = (altura + tamanho_cluster - 1) // tamanho_cluster
+        # fronteira (cluster_a, cluster_b) -> lista de transições (celula_a, celula_b)
+        self.entradas = {}
+        # cluster -> {celula: {celula: custo}} com as arestas internas
+        self.intra = {}
+        # celula -> conjunto de células ligadas por transição (custo 1)
+        self.inter = {}
+        for c in self._clusters():
+            for viz in self._vizinhos_a_frente(c):
+                self._calcular_entradas(c, viz)
+        for c in self._clusters():
+            self._calcular_arestas_internas(c)
+
+    # ------------------------------------------------------------------
+    # Estrutura dos clusters
+    # ------------------------------------------------------------------
+
+    def _clusters(self):
+        return [(cx, cy) for cy in range(self.linhas) for cx in range(self.colunas)]
+
+    def cluster_de(self, pos):
+        """Cluster (cx, cy) que contém a célula pos."""
+        return pos[0] // self.tamanho, pos[1] // self.tamanho
+
+    def _limites(self, cluster):
+        """Retângulo (x0, y0, x1, y1) do cluster, com x1/y1 exclusivos."""
+        cx, cy = cluster
+        x0, y0 = cx * self.tamanho, cy * self.tamanho
+        return x0, y0, min(x0 + self.tamanho, self.largura), min(y0 + self.tamanho, self.altura)
+
+    def _vizinhos_a_frente(self, cluster):
+        """Clusters à direita e abaixo (cada fronteira é visitada uma vez)."""
+        cx, cy = cluster
+        if cx + 1 < self.colunas:
+            yield (cx + 1, cy)
+        if cy + 1 < self.linhas:
+            yield (cx, cy + 1)
+
+    def _vizinhos_cluster(self, cluster):
+        cx, cy = cluster
+        for nx, ny in ((cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1)):
+            if 0 <= nx < self.colunas and 0 <= ny < self.linhas:
+                yield (nx, ny)
+
+    def _livre(self, x, y):
+        return not self.grade.bloqueado[y * self.largura + x]
+
+    def _calcular_entradas(self, a, b):
+        """Recalcula as transições da fronteira entre os clusters a e b (b à direita ou abaixo de a)."""
+        for ca, cb in self.entradas.get((a, b), []):
+            self.inter[ca].discard(cb)
+            self.inter[cb].discard(ca)
+        x0, y0, x1, y1 = self._limites(a)
+        if b[0] > a[0]:
+            pares = [((x1 - 1, y), (x1, y)) for y in range(y0, y1)]
+        else:
+            pares = [((x, y1 - 1), (x, y1)) for x in range(x0, x1)]
+
+        transicoes, trecho = [], []
+        for par in pares + [None]:
+            if par is not None and self._livre(*par[0]) and self._livre(*par[1]):
+                trecho.append(par)
+                continue
+            if trecho:
+                if len(trecho) >= ENTRADA_LONGA:
+                    transicoes.extend([trecho[0], trecho[-1]])
+                else:
+                    transicoes.append(trecho[len(trecho) // 2])
+                trecho = []
+        self.entradas[(a, b)] = transicoes
+        for ca, cb in transicoes:
+            self.inter.setdefault(ca, set()).add(cb)
+            self.inter.setdefault(cb, set()).add(ca)
+
+    def _nos_do_cluster(self, cluster):
+        """Células de transição que ficam dentro do cluster."""
+        nos = set()
+        for viz in self._vizinhos_cluster(cluster):
+            if (cluster, viz) in self.entradas:
+                nos.update(ca for ca, _ in self.entradas[(cluster, viz)])
+            if (viz, cluster) in self.entradas:
+                nos.update(cb for _, cb in self.entradas[(viz, cluster)])
+        return nos
+
+    def _bfs_local(self, origem, cluster, alvo=None):
+        """BFS restrita ao cluster. Retorna (distâncias, pais) a partir de origem.
+
+        A origem é sempre livre e o alvo, se informado, pode ser entrado mesmo
+        bloqueado (prateleira de destino).
+        """
+        x0, y0, x1, y1 = self._limites(cluster)
+        dist, pais = {origem: 0}, {origem: None}
+        fila = deque([origem])
+        while fila:
+            atual = fila.popleft()
+            if atual == alvo and atual != origem:
+                continue  # o alvo é entrado, mas não atravessado
+            x, y = atual
+            for _, dx, dy in MOVIMENTOS:
+                nx, ny = x + dx, y + dy
+                if (x0 <= nx < x1 and y0 <= ny < y1 and (nx, ny) not in dist
+                        and (self._livre(nx, ny) or (nx, ny) == alvo)):
+                    dist[(nx, ny)] = dist[atual] + 1
+                    pais[(nx, ny)] = atual
+                    fila.append((nx, ny))
+        return dist, pais
+
+    def _calcular_arestas_internas(self, cluster):
+        nos = self._nos_do_cluster(cluster)
+        arestas = {}
+        for u in nos:
+            dist, _ = self._bfs_local(u, cluster)
+            arestas[u] = {v: dist[v] for v in nos if v != u and v in dist}
+        self.intra[cluster] = arestas
+
+    def atualizar_celula(self, pos, bloqueado):
+        """Marca pos como bloqueada/livre e refaz só a parte afetada da hierarquia."""
+        x, y = pos
+        self.grade.bloqueado[y * self.largura + x] = 1 if bloqueado else 0
+        c = self.cluster_de(pos)
+        for viz in self._vizinhos_cluster(c):
+            self._calcular_entradas(*sorted((c, viz)))
+        for afetado in [c] + list(self._vizinhos_cluster(c)):
+            self._calcular_arestas_internas(afetado)
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+
+    def _pontos_de_acesso(self, pos):
+        """Células por onde pos entra na hierarquia: (célula, cluster, custo extra).
+
+        Além da própria célula, inclui os vizinhos livres em clusters vizinhos,
+        pois uma prateleira (origem ou alvo bloqueado) pode ser acessada por eles.
+        """
+        pontos = [(pos, self.cluster_de(pos), 0)]
+        x, y = pos
+        for _, dx, dy in MOVIMENTOS:
+            nx, ny = x + dx, y + dy
+            if (0 <= nx < self.largura and 0 <= ny < self.altura and self._livre(nx, ny)
+                    and self.cluster_de((nx, ny)) != pontos[0][1]):
+                pontos.append(((nx, ny), self.cluster_de((nx, ny)), 1))
+        return pontos
+
+    def buscar(self, origem, alvo):
+        """Planeja de origem até alvo. Retorna a lista de ações ou None."""
+        if origem == alvo:
+            return []
+        # Ligações temporárias: aresta abstrata -> (custo, pontos intermediários)
+        temporarias = {}
+
+        def ligar(u, v, custo, pontos):
+            if (u, v) not in temporarias or custo < temporarias[(u, v)][0]:
+                temporarias[(u, v)] = (custo, pontos)
+
+        if abs(origem[0] - alvo[0]) + abs(origem[1] - alvo[1]) == 1:
+            ligar(origem, alvo, 1, [origem, alvo])
+        acessos_alvo = self._pontos_de_acesso(alvo)
+        for e, cluster, k0 in self._pontos_de_acesso(origem):
+            dist, _ = self._bfs_local(e, cluster, alvo)
+            for v in self.intra[cluster]:
+                if v in dist and v != origem:
+                    ligar(origem, v, k0 + dist[v], [origem, e, v])
+            # Caminho direto, sem passar por nenhuma transição
+            for f, cluster_f, k1 in acessos_alvo:
+                if cluster_f == cluster and f in dist:
+                    ligar(origem, alvo, k0 + dist[f] + k1, [origem, e, f, alvo])
+        for f, cluster, k1 in acessos_alvo:
+            dist, _ = self._bfs_local(f, cluster)
+            for u in self.intra[cluster]:
+                if u in dist and u != alvo:
+                    ligar(u, alvo, dist[u] + k1, [u, f, alvo])
+
+        caminho = self._astar_abstrato(origem, alvo, temporarias)
+        if caminho is None:
+            return None
+        return self._refinar(caminho, alvo, temporarias)
+
+    def _astar_abstrato(self, origem, alvo, temporarias):
+        extras = {}
+        for (u, v), (custo, _) in temporarias.items():
+            extras.setdefault(u, []).append((v, custo))
+        ax, ay = alvo
+        g, pais = {origem: 0}, {origem: None}
+        fechados = set()
+        fronteira = [(abs(origem[0] - ax) + abs(origem[1] - ay), origem)]
+        while fronteira:
+            _, u = heapq.heappop(fronteira)
+            if u in fechados:
+                continue
+            if u == alvo:
+                caminho = []
+                while u is not None:
+                    caminho.append(u)
+                    u = pais[u]
+                return caminho[::-1]
+            fechados.add(u)
+            vizinhos = list(self.intra[self.cluster_de(u)].get(u, {}).items())
+            vizinhos.extend((v, 1) for v in self.inter.get(u, ()))
+            vizinhos.extend(extras.get(u, ()))
+            for v, custo in vizinhos:
+                if v in fechados:
+                    continue
+                ng = g[u] + custo
+                if v not in g or ng < g[v]:
+                    g[v] = ng
+                    pais[v] = u
+                    heapq.heappush(fronteira, (ng + abs(v[0] - ax) + abs(v[1] - ay), v))
+        return None
+
+    def _refinar(self, caminho, alvo, temporarias):
+        """Transforma o caminho abstrato em ações, com BFS local só nos trechos usados."""
+        acoes = []
+        for u, v in zip(caminho, caminho[1:]):
+            pontos = temporarias[(u, v)][1] if (u, v) in temporarias else [u, v]
+            pontos = [p for i, p in enumerate(pontos) if i == 0 or p != pontos[i - 1]]
+            for a, b in zip(pontos, pontos[1:]):
+                if abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1:
+                    acoes.append(NOME_DIRECAO[(b[0] - a[0], b[1] - a[1])])
+                    continue
+                _, pais = self._bfs_local(a, self.cluster_de(a), b if b == alvo else None)
+                trecho = []
+                c = b
+                while pais[c] is not None:
+                    p = pais[c]
+                    trecho.append(NOME_DIRECAO[(c[0] - p[0], c[1] - p[1])])
+                    c = p
+                acoes.extend(reversed(trecho))
+        return acoes
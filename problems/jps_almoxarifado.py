@@ -0,0 +1,113 @@
+# Arquivo: problems/jps_almoxarifado.py
+
+import heapq
+
+from problems.grade_almoxarifado import GradeAlmoxarifado
+
+DIRECOES = (('N', 0, -1), ('S', 0, 1), ('O', -1, 0), ('L', 1, 0))
+NOME_DIRECAO = {(dx, dy): nome for nome, dx, dy in DIRECOES}
+
+
+class JumpPointSearch:
+    """Jump Point Search para a grade 4-conectada de custo uniforme (N/S/O/L).
+
+    Em corredores longos o A* com Manhattan expande quase todas as células por
+    causa dos empates simétricos. O JPS só coloca na fronteira os "pontos de
+    salto": células onde o caminho ótimo pode precisar virar (vizinho forçado
+    por uma quina de prateleira) ou o próprio alvo. Os trechos entre pontos de
+    salto são retas, expandidas em ações no final. Regras de poda e de salto
+    da variante sem diagonais (movimento vertical verifica saltos horizontais).
+    """
+
+    def __init__(self, grade):
+        self.grade = grade
+        self.expansoes = 0
+
+    def _livre(self, x, y):
+        g = self.grade
+        return (0 <= x < g.largura and 0 <= y < g.altura
+                and (not g.bloqueado[y * g.largura + x] or (x, y) == self._alvo))
+
+    def _salto(self, x, y, dx, dy):
+        """Anda de (x, y) na direção (dx, dy) até o próximo ponto de salto, ou None."""
+        livre = self._livre
+        while True:
+            x += dx
+            y += dy
+            if not livre(x, y):
+                return None
+            if (x, y) == self._alvo:
+                return x, y
+            if dx:
+                if ((livre(x, y - 1) and not livre(x - dx, y - 1))
+                        or (livre(x, y + 1) and not livre(x - dx, y + 1))):
+                    return x, y
+            else:
+                if ((livre(x - 1, y) and not livre(x - 1, y - dy))
+                        or (livre(x + 1, y) and not livre(x + 1, y - dy))):
+                    return x, y
+                # Andando na vertical, qualquer salto horizontal torna esta célula um ponto de salto
+                if self._salto(x, y, 1, 0) is not None or self._salto(x, y, -1, 0) is not None:
+                    return x, y
+
+    def _direcoes(self, x, y, pai):
+        """Direções a explorar a partir de (x, y), podadas pela direção de chegada."""
+        if pai is None:
+            return [(dx, dy) for _, dx, dy in DIRECOES]
+        dx = (x > pai[0]) - (x < pai[0])
+        dy = (y > pai[1]) - (y < pai[1])
+        if dx:
+            candidatas = [(0, -1), (0, 1), (dx, 0)]
+        else:
+            candidatas = [(-1, 0), (1, 0), (0, dy)]
+        return [(ddx, ddy) for ddx, ddy in candidatas if self._livre(x + ddx, y + ddy)]
+
+    def buscar(self, origem, alvo):
+        """A* sobre pontos de salto. Retorna a lista de ações (como Node.solution()) ou None."""
+        self._alvo = alvo
+        self.expansoes = 0
+        ax, ay = alvo
+        g = {origem: 0}
+        pais = {origem: None}
+        fechados = set()
+        fronteira = [(abs(origem[0] - ax) + abs(origem[1] - ay), origem)]
+        while fronteira:
+            _, atual = heapq.heappop(fronteira)
+            if atual in fechados:
+                continue
+            if atual == alvo:
+                return self._reconstruir(pais, atual)
+            fechados.add(atual)
+            self.expansoes += 1
+            x, y = atual
+            for dx, dy in self._direcoes(x, y, pais[atual]):
+                salto = self._salto(x, y, dx, dy)
+                if salto is None or salto in fechados:
+                    continue
+                ng = g[atual] + abs(salto[0] - x) + abs(salto[1] - y)
+                if salto not in g or ng < g[salto]:
+                    g[salto] = ng
+                    pais[salto] = atual
+                    heapq.heappush(fronteira, (ng + abs(salto[0] - ax) + abs(salto[1] - ay), salto))
+        return None
+
+    def _reconstruir(self, pais, fim):
+        """Expande a cadeia de pontos de salto em ações unitárias."""
+        pontos = []
+        p = fim
+        while p is not None:
+            pontos.append(p)
+            p = pais[p]
+        pontos.reverse()
+        acoes = []
+        for (x0, y0), (x1, y1) in zip(pontos, pontos[1:]):
+            dx = (x1 > x0) - (x1 < x0)
+            dy = (y1 > y0) - (y1 < y0)
+            acoes.extend([NOME_DIRECAO[(dx, dy)]] * (abs(x1 - x0) + abs(y1 - y0)))
+        return acoes
+
+
+def jps_busca(estado_inicial, obstaculos, alvo, largura, altura):
+    """Atalho com as mesmas entradas de ProblemaAlmoxarifado; devolve a lista de ações ou None."""
+    grade = GradeAlmoxarifado(obstaculos, largura, altura)
+    return JumpPointSearch(grade).buscar((estado_inicial[0], estado_inicial[1]), alvo)
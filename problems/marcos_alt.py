@@ -0,0 +1,163 @@
+# Arquivo: problems/marcos_alt.py
+
+from array import array
+
+import numpy as np
+
+from problems.campo_distancias import (
+    INALCANCAVEL, grade_ocupacao, onda_distancias, distancias_de_acesso,
+)
+
+# Uma consulta com h(origem) abaixo desta fração do custo real ganha um marco no alvo
+FRACAO_ACEITAVEL = 0.75
+
+
+class MarcosALT:
+    """Heurística ALT (A*, Landmarks, Triangle inequality) para o almoxarifado.
+
+    Para cada marco L guarda a distância exata d(L, c) até toda célula c
+    (prateleiras incluídas, pelo vizinho livre mais próximo, como no
+    CampoDistancias). Pela desigualdade triangular, |d(L, alvo) - d(L, c)| é
+    um limite inferior de d(c, alvo); a heurística é o máximo disso entre os
+    marcos e a distância Manhattan, o que continua admissível e consistente.
+    Nos layouts com fileiras longas ela enxerga o desvio que a Manhattan
+    ignora, e o A* deixa de inundar os corredores.
+
+    As tabelas são calculadas uma vez por layout (BFS vetorizada) e guardadas
+    como array('i') planos, indexados por y * largura + x. Sem marcos
+    informados, os marcos são escolhidos automaticamente por amostragem do
+    ponto mais distante (adicionar_marco). Depois, avaliar_consulta acrescenta
+    sozinha um marco no alvo de uma consulta mal estimada: um marco no próprio
+    alvo dá a distância exata, e o agente repete sempre os mesmos alvos.
+    """
+
+    def __init__(self, obstaculos, largura, altura, marcos=None, quantidade=4, maximo=16):
+        self.largura = largura
+        self.altura = altura
+        self.maximo = maximo
+        self.ocupacao = grade_ocupacao(obstaculos, largura, altura)
+        self.marcos = []
+        self.tabelas = []
+        # Menor distância de cada célula livre até algum marco (guia a escolha automática)
+        self._mais_proximo = None
+        for pos in marcos or []:
+            self.adicionar_marco(pos)
+        while marcos is None and len(self.marcos) < quantidade:
+            if self.adicionar_marco() is None:
+                break
+
+    def adicionar_marco(self, pos=None):
+        """Acrescenta um marco e sua tabela. Retorna a posição usada, ou None.
+
+        pos pode ser uma prateleira: a tabela vale a partir dela, como origem
+        ou alvo de uma perna. Sem pos, escolhe a célula livre mais distante
+        dos marcos atuais (o primeiro marco é a célula mais distante do canto
+        (0, 0), ou de qualquer célula livre se o canto for prateleira).
+        Células em regiões que nenhum marco alcança têm prioridade, para
+        cobrir cada componente.
+        """
+        if pos is None:
+            pos = self._escolher_automatico()
+            if pos is None:
+                return None
+        campo = onda_distancias(self.ocupacao, pos)
+        livres = (~self.ocupacao) & (campo >= 0)
+        self.marcos.append(pos)
+        self.tabelas.append(array('i', distancias_de_acesso(campo, self.ocupacao).ravel().tolist()))
+
+        grande = np.iinfo(np.int32).max
+        distancia = np.where(livres, campo, grande)
+        if self._mais_proximo is None:
+            self._mais_proximo = distancia
+        else:
+            self._mais_proximo = np.minimum(self._mais_proximo, distancia)
+        return pos
+
+    def _escolher_automatico(self):
+        livre = ~self.ocupacao
+        if not livre.any():
+            return None
+        if self._mais_proximo is None:
+            ys, xs = np.nonzero(livre)
+            semente = (0, 0) if livre[0, 0] else (int(xs[0]), int(ys[0]))
+            campo = onda_distancias(self.ocupacao, semente)
+            y, x = np.unravel_index(np.argmax(campo), campo.shape)
+            return int(x), int(y)
+        candidatos = np.where(livre, self._mais_proximo, -1)
+        # Nenhum marco alcança essa célula: o valor "grande" a coloca primeiro
+        y, x = np.unravel_index(np.argmax(candidatos), candidatos.shape)
+        if candidatos[y, x] <= 0:
+            return None
+        return int(x), int(y)
+
+    def avaliar_consulta(self, alvo, estimativa, custo, fracao=FRACAO_ACEITAVEL):
+        """Acrescenta um marco em alvo se a heurística da origem ficou abaixo de fracao * custo.
+
+        Retorna True se o marco foi criado. Nada muda quando o limite de
+        marcos já foi atingido ou o alvo já é marco.
+        """
+        if custo <= 0 or estimativa >= fracao * custo:
+            return False
+        if len(self.marcos) >= self.maximo or alvo in self.marcos:
+            return False
+        self.adicionar_marco(alvo)
+        return True
+
+    def distancia(self, indice_marco, pos):
+        """Distância exata do marco até pos, ou None se inalcançável."""
+        d = self.tabelas[indice_marco][pos[1] * self.largura + pos[0]]
+        return None if d == INALCANCAVEL else d
+
+    def _limites_do_alvo(self, tabela, alvo):
+        """(baixo, alto) de d(L, alvo) para a desigualdade triangular, ou None.
+
+        Para alvo livre os dois são d(L, alvo). Uma prateleira alvo não pode ser
+        atravessada, então o caminho L -> alvo -> c não existe; vale só
+        d(c, alvo) >= d(L, c) - (max d(L, vizinho livre) - 1), e o limite alto
+        usa o vizinho livre mais distante do marco.
+        """
+        ax, ay = alvo
+        dt = tabela[ay * self.largura + ax]
+        if dt == INALCANCAVEL:
+            return None
+        if not self.ocupacao[ay, ax]:
+            return dt, dt
+        if dt == 0:
+            return 0, 0  # o alvo é o próprio marco: d(c, alvo) = d(L, c)
+        vizinhos = [
+            tabela[ny * self.largura + nx]
+            for nx, ny in ((ax, ay - 1), (ax, ay + 1), (ax - 1, ay), (ax + 1, ay))
+            if 0 <= nx < self.largura and 0 <= ny < self.altura and not self.ocupacao[ny, nx]
+        ]
+        vizinhos = [d for d in vizinhos if d != INALCANCAVEL]
+        if not vizinhos:
+            return dt, float('inf')  # nenhuma célula livre chega ao alvo
+        return dt, max(vizinhos) - 1
+
+    def heuristica(self, alvo):
+        """Função h(node) para astar_search(problem, h=...) rumo a alvo."""
+        largura = self.largura
+        ax, ay = alvo
+        # d(L, alvo) é fixo para a consulta; só servem os marcos que alcançam o alvo
+        termos = []
+        for tabela in self.tabelas:
+            limites = self._limites_do_alvo(tabela, alvo)
+            if limites is not None:
+                termos.append((tabela, limites[0], limites[1]))
+
+        def h(node):
+            x, y = node.state[0], node.state[1]
+            melhor = abs(x - ax) + abs(y - ay)
+            if not melhor:
+                return 0
+            c = y * largura + x
+            for tabela, baixo, alto in termos:
+                ds = tabela[c]
+                if ds != INALCANCAVEL:
+                    if baixo - ds > melhor:
+                        melhor = baixo - ds
+                    elif ds - alto > melhor:
+                        melhor = ds - alto
+            return melhor
+
+        return h
@@ -57,4 +57,173 @@ class ProblemaAlmoxarifado(Problem):
         """Heurística simples: Distância Manhattan até o alvo atual."""
         x, y, status = node.state
         def distancia(p1, p2): return abs(p1[0] - p2[0]) + abs(p1[1] - p2[1])
-        return distancia((x, y), self.alvo)
\ No newline at end of file
+        return distancia((x, y), self.alvo)
+
+    def problema_inverso(self):
+        """Problema de busca no sentido contrário, para a busca bidirecional.
+
+        Parte do alvo (com o mesmo status do estado inicial, pois andar não muda
+        o status) e tem como objetivo a posição inicial. Como os movimentos da
+        grade são reversíveis, as ações do inverso geram os predecessores de
+        cada célula; a posição inicial pode ser entrada mesmo sendo prateleira.
+        """
+        x, y, status = self.initial
+        return ProblemaAlmoxarifado(
+            (self.alvo[0], self.alvo[1], status), self.obstaculos, (x, y),
+            self.pos_entrega, self.largura, self.altura
+        )
+
+    def compactar(self):
+        """O mesmo problema com estados inteiros (veja ProblemaAlmoxarifadoCompacto)."""
+        return ProblemaAlmoxarifadoCompacto(
+            self.initial, self.obstaculos, self.alvo, self.pos_entrega, self.largura, self.altura
+        )
+
+
+class CodecEstado:
+    """Converte estados (x, y, status) em um único int e de volta.
+
+    O código é (x * altura + y) << 2 | status: a célula nos bits altos e o
+    status (0, 1 ou 2) nos 2 bits baixos. A célula é numerada por coluna para
+    que os códigos tenham a mesma ordem das tuplas (x, y, status), e os
+    desempates das buscas (que comparam estados) não mudem. Inteiros pequenos
+    têm hash e comparação bem mais baratos que tuplas, e ocupam menos nos
+    conjuntos explored e nas filas das buscas.
+    """
+
+    def __init__(self, largura, altura):
+        self.largura = largura
+        self.altura = altura
+
+    def codificar(self, estado):
+        x, y, status = estado
+        return (x * self.altura + y) << 2 | status
+
+    def decodificar(self, codigo):
+        x, y = divmod(codigo >> 2, self.altura)
+        return x, y, codigo & 3
+
+    def posicao(self, codigo):
+        """Só a célula (x, y) do estado codificado."""
+        return divmod(codigo >> 2, self.altura)
+
+
+class ProblemaAlmoxarifadoCompacto(ProblemaAlmoxarifado):
+    """ProblemaAlmoxarifado com estados codificados por CodecEstado.
+
+    Aceita o estado inicial como tupla ou já codificado; todos os estados
+    que emite (initial, result, nós da busca) são inteiros, e `codec` os
+    converte de volta para o agente. Ações, custos, heurística Manhattan e
+    ordem dos estados são os mesmos, então qualquer busca do aima devolve a
+    mesma solução. Os obstáculos viram um bytearray por célula, consultado
+    sem criar tuplas.
+    """
+
+    def __init__(self, estado_inicial, obstaculos, alvo, pos_entrega, largura=10, altura=10):
+        self.codec = CodecEstado(largura, altura)
+        if isinstance(estado_inicial, tuple):
+            estado_inicial = self.codec.codificar(estado_inicial)
+        super().__init__(estado_inicial, obstaculos, alvo, pos_entrega, largura, altura)
+        self._celula_alvo = alvo[0] * altura + alvo[1]
+        self._bloqueada = bytearray(largura * altura)
+        for (x, y) in obstaculos:
+            if 0 <= x < largura and 0 <= y < altura:
+                self._bloqueada[x * altura + y] = 1
+        self._bloqueada[self._celula_alvo] = 0
+        self._deslocamentos = {'N': -4, 'S': 4, 'O': -altura << 2, 'L': altura << 2}
+
+    def actions(self, state):
+        c = state >> 2
+        h = self.altura
+        x, y = divmod(c, h)
+        bloqueada = self._bloqueada
+        acoes_possiveis = []
+        if y > 0 and not bloqueada[c - 1]: acoes_possiveis.append('N')
+        if y < h - 1 and not bloqueada[c + 1]: acoes_possiveis.append('S')
+        if x > 0 and not bloqueada[c - h]: acoes_possiveis.append('O')
+        if x < self.largura - 1 and not bloqueada[c + h]: acoes_possiveis.append('L')
+        if c == self._celula_alvo:
+            status = state & 3
+            if status == 0: acoes_possiveis.append('Pegar')
+            if status == 1: acoes_possiveis.append('Entregar')
+        return acoes_possiveis
+
+    def result(self, state, action):
+        if action == 'Pegar':
+            return state & ~3 | 1
+        if action == 'Entregar':
+            return state & ~3 | 2
+        return state + self._deslocamentos[action]
+
+    def goal_test(self, state):
+        return state >> 2 == self._celula_alvo
+
+    def h(self, node):
+        """Distância Manhattan até o alvo, lida direto do código."""
+        x, y = divmod(node.state >> 2, self.altura)
+        return abs(x - self.alvo[0]) + abs(y - self.alvo[1])
+
+    def problema_inverso(self):
+        x, y, status = self.codec.decodificar(self.initial)
+        return ProblemaAlmoxarifadoCompacto(
+            (self.alvo[0], self.alvo[1], status), self.obstaculos, (x, y),
+            self.pos_entrega, self.largura, self.altura
+        )
+
+    def compactar(self):
+        return self
+
+
+def faces_de_acesso(pos, obstaculos, largura, altura):
+    """Células livres adjacentes a pos (N, S, O, L), de onde se acessa uma prateleira ou o balcão."""
+    x, y = pos
+    return [
+        (nx, ny) for nx, ny in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y))
+        if 0 <= nx < largura and 0 <= ny < altura and (nx, ny) not in obstaculos
+    ]
+
+
+class ProblemaMultiAlvo(ProblemaAlmoxarifado):
+    """Navegação até o mais próximo de vários alvos, numa única busca.
+
+    O objetivo é um conjunto de células (`alvos`, todas atravessáveis como
+    destino, mesmo sendo prateleiras) e/ou um predicado `objetivo(x, y)`.
+    A heurística padrão é a menor distância Manhattan até os alvos, que é
+    admissível e consistente para o conjunto; com só um predicado, passe uma
+    heurística admissível em `h` (o padrão nesse caso é 0, busca uniforme).
+    Só há ações de movimento: Pegar/Entregar ficam para o planejamento seguinte.
+    Uso: astar_search(ProblemaMultiAlvo(estado, obstaculos, faces_de_acesso(...))).
+    """
+
+    def __init__(self, estado_inicial, obstaculos, alvos=(), pos_entrega=None,
+                 largura=10, altura=10, objetivo=None, h=None):
+        self.alvos = frozenset(alvos)
+        if not self.alvos and objetivo is None:
+            raise ValueError("Informe ao menos um alvo ou um predicado objetivo.")
+        super().__init__(estado_inicial, set(obstaculos) - self.alvos, None,
+                         pos_entrega, largura, altura)
+        self.objetivo = objetivo
+        self._h = h
+
+    def goal_test(self, state):
+        pos = state[0:2]
+        return pos in self.alvos or (self.objetivo is not None and self.objetivo(*pos))
+
+    def h(self, node):
+        """Menor distância Manhattan até algum alvo (ou a heurística informada)."""
+        if self._h is not None:
+            return self._h(node)
+        if not self.alvos:
+            return 0
+        x, y = node.state[0], node.state[1]
+        return min(abs(x - ax) + abs(y - ay) for ax, ay in self.alvos)
+
+    def problema_inverso(self):
+        """Não existe: a busca de volta partiria de todos os alvos ao mesmo tempo."""
+        raise ValueError("ProblemaMultiAlvo não tem problema inverso; "
+                         "a busca bidirecional precisa de um único alvo.")
+
+    def compactar(self):
+        """Não existe: ProblemaAlmoxarifadoCompacto codifica um único alvo."""
+        raise ValueError("ProblemaMultiAlvo não tem versão compacta; "
+                         "os estados compactos precisam de um único alvo.")
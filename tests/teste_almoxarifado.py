@@ -1,6 +1,9 @@
 # Arquivo: tests/teste_almoxarifado.py
 
 import pytest
+import csv
+import functools
+import json
 import sys
 import os
 
@@ -13,8 +16,21 @@ sys.modules['utils'] = aima.utils
 
 from problems.problema_almoxarifado import ProblemaAlmoxarifado
 from env.ambiente_almoxarifado import AmbienteAlmoxarifado
-from agents.agente_almoxarifado import AgenteAlmoxarifado
-from aima.search import astar_search, Node
+from agents.agente_almoxarifado import AgenteAlmoxarifado, MAX_BUSCAS_DSTAR, MAX_CAMPOS, ORCAMENTO_ESGOTADO
+from agents.cache_caminhos import CacheCaminhos
+from aima.search import astar_search, Node, InstrumentedProblem, interleave_searches, finish_search
+from problems.grade_almoxarifado import GradeAlmoxarifado, astar_grade, prateleira_mais_proxima
+from problems.jps_almoxarifado import JumpPointSearch, jps_busca
+from problems.hpa_almoxarifado import HierarquiaAlmoxarifado
+from problems.adjacencia_csr import AdjacenciaCSR
+from problems.dstar_almoxarifado import DStarLite
+from problems.marcos_alt import MarcosALT
+from problems.heuristica_perfeita import HeuristicaPerfeita
+from problems.campo_distancias import CampoDistancias
+from env.matriz_distancias import MatrizDistancias
+from env.componentes_conexas import ComponentesConexas, BLOQUEADA
+from env import episodios
+from env.episodios import EspecificacaoAmbiente, comparar_agentes, intervalo_confianca
 
 # =============================================================================
 # FIXTURES (Cenários Automáticos de Teste)
@@ -127,4 +143,836 @@ def test_deliberacao_agente(setup_padrao):
     
     # O agente deve ter decidido uma ação (pois há uma caixa em 2,2)
     assert acao != 'NoOp'
-    assert len(agente.plano) > 0 # O plano deve ter sido populado pelo A*
\ No newline at end of file
+    assert len(agente.plano) > 0 # O plano deve ter sido populado pelo A*
+
+# =============================================================================
+# TESTES DO MOTOR DE GRADE (A* com ids inteiros)
+# =============================================================================
+
+def test_motor_grade_mesmo_plano_do_astar(setup_padrao):
+    """O A* da grade deve devolver exatamente o plano de astar_search"""
+    prateleiras, pos_inicial, pos_entrega = setup_padrao
+    alvo = (2, 2)
+    obstaculos = set(prateleiras.keys()) - {alvo}
+
+    problema = ProblemaAlmoxarifado((0, 0, 0), obstaculos, alvo, pos_entrega)
+    esperado = astar_search(problema).solution()
+
+    assert astar_grade((0, 0, 0), obstaculos, alvo, 10, 10) == esperado
+    # Saindo de cima de uma prateleira (após 'Pegar') rumo ao balcão
+    obstaculos_entrega = set(prateleiras.keys())
+    problema = ProblemaAlmoxarifado((2, 2, 1), obstaculos_entrega, pos_entrega, pos_entrega)
+    assert astar_grade((2, 2, 1), obstaculos_entrega, pos_entrega, 10, 10) == astar_search(problema).solution()
+
+def test_motor_grade_alvo_inalcancavel():
+    """Alvo cercado por obstáculos deve resultar em None, e alvo == origem em plano vazio"""
+    obstaculos = {(4, 3), (4, 5), (3, 4), (5, 4)}
+    assert astar_grade((0, 0, 0), obstaculos, (4, 4), 10, 10) is None
+    assert astar_grade((4, 4, 0), obstaculos, (4, 4), 10, 10) == []
+
+def test_agente_com_planejador_grade(setup_padrao):
+    """O agente configurado com planejador='grade' gera o mesmo plano do A* padrão"""
+    prateleiras, pos_inicial, pos_entrega = setup_padrao
+    percepcao = {'posicao': (0, 0), 'tem_caixa': False}
+
+    agente_ref = AgenteAlmoxarifado(pos_inicial, prateleiras.copy(), pos_entrega, 10, 10)
+    agente_grade = AgenteAlmoxarifado(pos_inicial, prateleiras.copy(), pos_entrega, 10, 10,
+                                      planejador='grade')
+
+    assert agente_grade.programa_agente(percepcao) == agente_ref.programa_agente(percepcao)
+    assert agente_grade.plano == agente_ref.plano
+
+    with pytest.raises(ValueError):
+        AgenteAlmoxarifado(pos_inicial, prateleiras.copy(), pos_entrega, 10, 10, planejador='dfs')
+
+# =============================================================================
+# TESTES DO CAMPO DE DISTÂNCIAS (BFS vetorizada)
+# =============================================================================
+
+def test_campo_distancias_igual_ao_astar(setup_padrao):
+    """A distância do campo deve ser o comprimento do plano ótimo do A*, inclusive para prateleiras"""
+    prateleiras, pos_inicial, pos_entrega = setup_padrao
+    campo = CampoDistancias(prateleiras.keys(), pos_entrega, 10, 10)
+
+    for destino in [(0, 0), (2, 2), (9, 9), (0, 1)]:
+        obstaculos = set(prateleiras.keys()) - {destino}
+        problema = ProblemaAlmoxarifado((destino[0], destino[1], 1), obstaculos, pos_entrega, pos_entrega)
+        esperado = len(astar_search(problema).solution())
+        assert campo.distancia(destino) == esperado
+        # A descida de gradiente leva ao balcão com o mesmo número de passos
+        assert len(campo.rota_ate_origem(destino)) == esperado
+
+def test_campo_distancias_inalcancavel():
+    """Células cercadas devem ser reportadas como inalcançáveis em O(1)"""
+    obstaculos = {(4, 3), (4, 5), (3, 4), (5, 4), (4, 4)}
+    campo = CampoDistancias(obstaculos, (0, 0), 10, 10)
+    assert not campo.alcancavel((4, 4))
+    assert campo.rota_desde_origem((4, 4)) is None
+    # Uma prateleira da parede é alcançável pelo lado de fora
+    assert campo.distancia((4, 3)) == 7
+
+def test_agente_com_planejador_campo(setup_padrao):
+    """O planejador 'campo' gera um plano de mesmo custo do A* e reaproveita o campo do balcão"""
+    prateleiras, pos_inicial, pos_entrega = setup_padrao
+    agente_ref = AgenteAlmoxarifado(pos_inicial, prateleiras.copy(), pos_entrega, 10, 10)
+    agente = AgenteAlmoxarifado(pos_inicial, prateleiras.copy(), pos_entrega, 10, 10,
+                                planejador='campo')
+
+    for tem_caixa, pos in [(False, (0, 0)), (True, (2, 2))]:
+        percepcao = {'posicao': pos, 'tem_caixa': tem_caixa}
+        agente_ref.plano, agente.plano = [], []
+        agente_ref.programa_agente(percepcao)
+        agente.programa_agente(percepcao)
+        assert len(agente.plano) == len(agente_ref.plano)
+        assert agente.plano[-1] == agente_ref.plano[-1]
+
+    assert pos_entrega in agente._campos
+
+def test_campos_descartam_o_usado_ha_mais_tempo(setup_padrao):
+    """Cheio, o cache de campos descarta o menos usado, não o mais antigo"""
+    prateleiras, pos_inicial, pos_entrega = setup_padrao
+    agente = AgenteAlmoxarifado(pos_inicial, prateleiras.copy(), pos_entrega, 10, 10,
+                                planejador='campo')
+    origens = [(0, y) for y in range(MAX_CAMPOS)]
+    for origem in origens:
+        agente._campo(origem)
+    reusado = agente._campo(origens[0])
+    agente._campo((9, 9))
+    assert origens[0] in agente._campos and agente._campo(origens[0]) is reusado
+    assert origens[1] not in agente._campos
+    assert len(agente._campos) == MAX_CAMPOS
+
+# =============================================================================
+# TESTES DA MATRIZ DE DISTÂNCIAS ENTRE PONTOS DE INTERESSE
+# =============================================================================
+
+def test_matriz_distancias_igual_ao_astar(setup_padrao):
+    """Distâncias entre prateleira, balcão e início devem bater com o A*, e o próximo passo ser válido"""
+    prateleiras, pos_inicial, pos_entrega = setup_padrao
+    matriz = MatrizDistancias(10, 10, prateleiras.keys(), [(2, 2), pos_entrega, pos_inicial])
+
+    obstaculos = set(prateleiras.keys()) - {(2, 2)}
+    problema = ProblemaAlmoxarifado((0, 0, 0), obstaculos, (2, 2), pos_entrega)
+    plano = astar_search(problema).solution()
+
+    assert matriz.distancia(pos_inicial, (2, 2)) == len(plano)
+    assert matriz.distancia((2, 2), pos_inicial) == len(plano)
+    assert matriz.proxima_acao(pos_inicial, (2, 2)) == 'S'  # (1,0) é parede: só dá para descer
+    assert matriz.proxima_acao(pos_inicial, pos_inicial) is None
+    assert matriz.distancias.dtype.itemsize == 4
+
+def test_matriz_invalida_apenas_com_mudanca_de_layout(setup_padrao):
+    """Esvaziar prateleira não recalcula a matriz; adicionar prateleira nova sim"""
+    prateleiras, pos_inicial, pos_entrega = setup_padrao
+    ambiente = AmbienteAlmoxarifado(10, 10, prateleiras.copy(), pos_entrega, usar_matriz_distancias=True)
+    agente = AgenteAlmoxarifado(pos_inicial, prateleiras.copy(), pos_entrega, 10, 10)
+    ambiente.add_thing(agente, location=pos_inicial)
+
+    matriz = ambiente.percept(agente)['distancias']
+    ambiente.prateleiras[(2, 2)] = 0
+    assert ambiente.matriz_distancias() is matriz
+
+    # Prateleira nova em (0,3) fecha a única saída do canto onde o robô começou
+    ambiente.adicionar_prateleira((0, 3), 0)
+    nova = ambiente.matriz_distancias()
+    assert nova is not matriz
+    assert matriz.distancia(pos_inicial, pos_entrega) == 8
+    assert nova.distancia(pos_inicial, pos_entrega) is None
+
+def test_agente_ordena_pela_matriz():
+    """Com a matriz, o agente escolhe a prateleira mais próxima por caminho real, não por Manhattan"""
+    # Parede em y=1 de x=0 a x=8: a prateleira (1,2) está perto em Manhattan, mas longe de fato
+    prateleiras = {(x, 1): 0 for x in range(0, 9)}
+    prateleiras.update({(1, 2): 1, (6, 0): 1})
+    ambiente = AmbienteAlmoxarifado(10, 10, prateleiras.copy(), (9, 9), usar_matriz_distancias=True)
+    agente = AgenteAlmoxarifado((0, 0), prateleiras.copy(), (9, 9), 10, 10)
+    ambiente.add_thing(agente, location=(0, 0))
+
+    agente.programa_agente(ambiente.percept(agente))
+    assert agente.alvo_atual == (6, 0)
+
+# =============================================================================
+# TESTES DO JUMP POINT SEARCH
+# =============================================================================
+
+def test_jps_custo_otimo_igual_ao_astar(setup_padrao):
+    """O JPS deve encontrar planos válidos com o mesmo custo ótimo do A*"""
+    prateleiras, pos_inicial, pos_entrega = setup_padrao
+    for estado, alvo in [((0, 0, 0), (2, 2)), ((2, 2, 1), pos_entrega), ((0, 0, 0), (9, 0))]:
+        obstaculos = set(prateleiras.keys()) - {alvo}
+        problema = ProblemaAlmoxarifado(estado, obstaculos, alvo, pos_entrega)
+        esperado = astar_search(problema).solution()
+        acoes = jps_busca(estado, obstaculos, alvo, 10, 10)
+
+        assert len(acoes) == len(esperado)
+        # Reexecuta o plano no próprio problema para garantir que é válido
+        s = estado
+        for a in acoes:
+            assert a in problema.actions(s)
+            s = problema.result(s, a)
+        assert problema.goal_test(s)
+
+def test_jps_expande_menos_em_corredor():
+    """Num corredor aberto, o JPS só expande pontos de salto"""
+    obstaculos = {(x, 1) for x in range(1, 29)}
+    jps = JumpPointSearch(GradeAlmoxarifado(obstaculos, 30, 3))
+    assert len(jps.buscar((0, 0), (29, 2))) == 31
+    assert jps.expansoes <= 3
+    assert jps.buscar((0, 0), (15, 1)) is not None
+    assert JumpPointSearch(GradeAlmoxarifado(obstaculos | {(0, 1), (1, 0)}, 30, 3)).buscar((0, 0), (29, 2)) is None
+
+# =============================================================================
+# TESTES DO PLANEJADOR HIERÁRQUICO (HPA*)
+# =============================================================================
+
+def test_hpa_plano_valido_entre_clusters(setup_padrao):
+    """O HPA* deve gerar planos executáveis no ProblemaAlmoxarifado, atravessando clusters"""
+    prateleiras, pos_inicial, pos_entrega = setup_padrao
+    hierarquia = HierarquiaAlmoxarifado(prateleiras.keys(), 10, 10, tamanho_cluster=3)
+    for estado, alvo in [((0, 0, 0), (2, 2)), ((2, 2, 1), pos_entrega), ((0, 0, 0), (9, 9))]:
+        problema = ProblemaAlmoxarifado(estado, set(prateleiras.keys()) - {alvo}, alvo, pos_entrega)
+        otimo = len(astar_search(problema).solution())
+        acoes = hierarquia.buscar((estado[0], estado[1]), alvo)
+
+        s = estado
+        for a in acoes:
+            assert a in problema.actions(s)
+            s = problema.result(s, a)
+        assert problema.goal_test(s)
+        assert otimo <= len(acoes) <= otimo + 4
+
+def test_hpa_atualizacao_local():
+    """Bloquear uma célula refaz só a vizinhança do cluster e dá o mesmo resultado de reconstruir"""
+    obstaculos = {(x, 5) for x in range(0, 11)}
+    hierarquia = HierarquiaAlmoxarifado(obstaculos, 12, 12, tamanho_cluster=4)
+    assert hierarquia.buscar((0, 0), (0, 11)) is not None
+
+    antes = dict(hierarquia.intra)
+    hierarquia.atualizar_celula((11, 5), True)  # fecha a última passagem da parede
+    assert hierarquia.buscar((0, 0), (0, 11)) is None
+    # Só o cluster (2, 1) da célula e seus vizinhos foram recalculados
+    afetados = {(2, 1), (1, 1), (2, 0), (2, 2)}
+    assert all(hierarquia.intra[c] is antes[c] for c in antes if c not in afetados)
+    assert all(hierarquia.intra[c] is not antes[c] for c in afetados)
+
+    reconstruida = HierarquiaAlmoxarifado(obstaculos | {(11, 5)}, 12, 12, tamanho_cluster=4)
+    assert reconstruida.entradas == hierarquia.entradas
+    assert reconstruida.intra == hierarquia.intra
+
+def test_agente_hpa_completa_missao(setup_padrao):
+    """O agente com planejador='hpa' entrega o item usando a hierarquia mantida entre decisões"""
+    prateleiras, pos_inicial, pos_entrega = setup_padrao
+    ambiente = AmbienteAlmoxarifado(10, 10, prateleiras.copy(), pos_entrega)
+    ambiente.render = lambda: None
+    agente = AgenteAlmoxarifado(pos_inicial, prateleiras.copy(), pos_entrega, 10, 10, planejador='hpa')
+    ambiente.add_thing(agente, location=pos_inicial)
+    ambiente.run(steps=60)
+
+    assert ambiente.dados_agentes[agente]['itens_entregues'] == 1
+    assert agente._hierarquia is not None
+
+# =============================================================================
+# TESTES DO PLANEJADOR INCREMENTAL (D* Lite)
+# =============================================================================
+
+def test_dstar_igual_ao_astar_apos_mudancas():
+    """Depois de mover o robô e alterar células, o reparo deve dar o mesmo custo do A* do zero"""
+    obstaculos = {(x, y) for x in range(1, 11, 2) for y in range(1, 11) if y != 6}
+    alvo = (11, 11)
+    busca = DStarLite(obstaculos, alvo, (0, 0), 12, 12)
+    assert len(busca.planejar()) == len(astar_grade((0, 0, 0), obstaculos, alvo, 12, 12))
+
+    busca.mover_inicio((0, 3))
+    for pos in [(1, 6), (5, 6)]:  # fecha trechos do corredor transversal
+        obstaculos.add(pos)
+        busca.atualizar_celula(pos, True)
+    obstaculos.discard((3, 10))
+    busca.atualizar_celula((3, 10), False)
+
+    acoes = busca.planejar()
+    assert len(acoes) == len(astar_grade((0, 3, 0), obstaculos, alvo, 12, 12))
+    problema = ProblemaAlmoxarifado((0, 3, 0), obstaculos, alvo, (0, 0), 12, 12)
+    s = problema.initial
+    for a in acoes:
+        assert a in problema.actions(s)
+        s = problema.result(s, a)
+    assert problema.goal_test(s)
+
+def test_dstar_reparo_expande_menos_que_do_zero():
+    """Uma mudança longe do caminho não deve custar uma busca nova"""
+    obstaculos = {(x, y) for x in range(2, 28, 3) for y in range(2, 28) if y % 9}
+    busca = DStarLite(obstaculos, (29, 29), (0, 0), 30, 30)
+    busca.planejar()
+    do_zero = busca.expansoes
+
+    busca.expansoes = 0
+    busca.atualizar_celula((0, 29), True)
+    assert busca.planejar() is not None
+    assert busca.expansoes < do_zero // 10
+
+def test_agente_dstar_replaneja_quando_layout_muda(setup_padrao):
+    """Uma prateleira criada no caminho em curso faz o agente reparar a rota e ainda entregar"""
+    prateleiras, pos_inicial, pos_entrega = setup_padrao
+    ambiente = AmbienteAlmoxarifado(10, 10, prateleiras.copy(), pos_entrega)
+    ambiente.render = lambda: None
+    agente = AgenteAlmoxarifado(pos_inicial, prateleiras.copy(), pos_entrega, 10, 10, planejador='dstar')
+    ambiente.add_thing(agente, location=pos_inicial)
+    ambiente.run(steps=8)
+    assert agente.plano or ambiente.dados_agentes[agente]['tem_caixa']
+
+    ambiente.adicionar_prateleira((2, 4), 0)  # bem à frente do robô
+    ambiente.run(steps=60)
+    assert ambiente.dados_agentes[agente]['itens_entregues'] == 1
+    assert pos_entrega in agente._buscas_dstar
+
+def test_buscas_dstar_descartam_a_usada_ha_mais_tempo(setup_padrao):
+    """Cheio, o agente 'dstar' descarta a busca viva menos usada, não a mais antiga"""
+    prateleiras, pos_inicial, pos_entrega = setup_padrao
+    agente = AgenteAlmoxarifado(pos_inicial, prateleiras.copy(), pos_entrega, 10, 10, planejador='dstar')
+    alvos = [(9, y) for y in range(MAX_BUSCAS_DSTAR)]
+    for alvo in alvos:
+        agente._busca_dstar((0, 0), alvo)
+    reusada = agente._busca_dstar((0, 1), alvos[0])
+    agente._busca_dstar((0, 0), (8, 9))
+    assert agente._buscas_dstar[alvos[0]] is reusada
+    assert alvos[1] not in agente._buscas_dstar
+    assert len(agente._buscas_dstar) == MAX_BUSCAS_DSTAR
+
+# =============================================================================
+# TESTES DO CACHE DE ROTAS
+# =============================================================================
+
+def test_cache_lru_copias_e_contadores():
+    """O cache devolve cópias, conta acertos/faltas e descarta a entrada menos usada"""
+    cache = CacheCaminhos(capacidade=2)
+    cache.guardar((0, 0), (3, 0), 0, ['L', 'L', 'L'])
+    cache.guardar((0, 0), (0, 3), 0, None)
+
+    encontrado, plano = cache.obter((0, 0), (3, 0), 0)
+    assert encontrado and plano == ['L', 'L', 'L']
+    plano.pop(0)
+    assert cache.obter((0, 0), (3, 0), 0)[1] == ['L', 'L', 'L']
+    assert cache.obter((0, 0), (0, 3), 0) == (True, None)
+    assert cache.obter((0, 0), (3, 0), 1) == (False, None)  # outra versão do layout
+
+    cache.obter((0, 0), (3, 0), 0)
+    cache.guardar((5, 5), (3, 0), 0, ['O', 'O'])  # expulsa (0,0)->(0,3), o menos usado
+    assert ((0, 0), (0, 3), 0) not in cache
+    assert len(cache) == 2
+    assert (cache.acertos, cache.faltas) == (4, 1)
+
+def test_agente_reaproveita_rotas_ate_o_layout_mudar():
+    """Pernas repetidas saem do cache; uma prateleira nova muda a versão e força novo cálculo"""
+    prateleiras = {(2, 0): 3, (2, 1): 0, (2, 2): 0}
+    ambiente = AmbienteAlmoxarifado(6, 6, prateleiras, (0, 5))
+    ambiente.render = lambda: None
+    agente = AgenteAlmoxarifado((0, 5), prateleiras.copy(), (0, 5), 6, 6)
+    ambiente.add_thing(agente, location=(0, 5))
+    ambiente.run(steps=60)
+
+    assert ambiente.dados_agentes[agente]['itens_entregues'] == 3
+    assert agente.cache_caminhos.acertos >= 2  # balcão->prateleira e volta, repetidos
+    faltas = agente.cache_caminhos.faltas
+
+    ambiente.adicionar_prateleira((1, 3), 1)
+    ambiente.run(steps=30)
+    assert agente.cache_caminhos.faltas > faltas
+    assert ambiente.dados_agentes[agente]['itens_entregues'] == 4
+
+# =============================================================================
+# TESTES DA HEURÍSTICA ALT (MARCOS)
+# =============================================================================
+
+def test_alt_admissivel_e_mesmo_custo():
+    """A ALT nunca passa da distância real (alvo prateleira) e o A* continua ótimo"""
+    obstaculos = {(x, y) for x in range(1, 11, 2) for y in range(1, 12)}  # só a linha y=0 liga os corredores
+    alvo = (5, 9)
+    marcos = MarcosALT(obstaculos, 12, 12, quantidade=4)
+    assert len(marcos.marcos) == 4 and len(marcos.tabelas[0]) == 12 * 12
+    h = marcos.heuristica(alvo)
+    campo = CampoDistancias(obstaculos - {alvo}, alvo, 12, 12)
+    for x in range(12):
+        for y in range(12):
+            if (x, y) not in obstaculos:
+                assert h(Node((x, y, 0))) <= campo.distancia((x, y))
+
+    problema = ProblemaAlmoxarifado((2, 9, 0), obstaculos - {alvo}, alvo, (0, 11), 12, 12)
+    assert astar_search(problema, h=h).path_cost == astar_search(problema).path_cost
+    assert h(Node((2, 9, 0))) > problema.h(Node((2, 9, 0)))  # enxerga o desvio pela ponta
+
+def test_alt_marco_automatico_no_alvo():
+    """Uma consulta mal estimada cria um marco no alvo, que passa a dar a distância exata"""
+    obstaculos = {(x, y) for x in range(1, 11, 2) for y in range(1, 12)}
+    alvo = (5, 9)
+    marcos = MarcosALT(obstaculos, 12, 12, quantidade=1, maximo=2)
+    assert marcos.avaliar_consulta(alvo, estimativa=3, custo=10)
+    assert marcos.marcos[-1] == alvo
+    assert marcos.heuristica(alvo)(Node((2, 9, 0))) == 21  # sobe até y=0 e desce de novo
+    assert not marcos.avaliar_consulta((9, 9), estimativa=3, custo=10)  # limite de marcos
+
+def test_agente_alt_completa_missao(setup_padrao):
+    """O agente com planejador='alt' entrega o item"""
+    prateleiras, pos_inicial, pos_entrega = setup_padrao
+    ambiente = AmbienteAlmoxarifado(10, 10, prateleiras.copy(), pos_entrega)
+    ambiente.render = lambda: None
+    agente = AgenteAlmoxarifado(pos_inicial, prateleiras.copy(), pos_entrega, 10, 10, planejador='alt')
+    ambiente.add_thing(agente, location=pos_inicial)
+    ambiente.run(steps=60)
+    assert ambiente.dados_agentes[agente]['itens_entregues'] == 1
+    assert agente._marcos is not None
+
+# =============================================================================
+# TESTES DA HEURÍSTICA PERFEITA (CAMPOS REVERSOS)
+# =============================================================================
+
+def test_heuristica_perfeita_expande_so_o_caminho():
+    """Com h exata o A* expande apenas os nós do caminho ótimo"""
+    obstaculos = {(x, y) for x in range(1, 11, 2) for y in range(1, 11) if y != 6}
+    problema = ProblemaAlmoxarifado((0, 0, 0), obstaculos - {(9, 9)}, (9, 9), (0, 11), 12, 12)
+    cache = HeuristicaPerfeita()
+    instrumentado = InstrumentedProblem(problema)
+    no = astar_search(instrumentado, h=cache.para(problema))
+    assert no.path_cost == astar_search(problema).path_cost
+    assert instrumentado.succs == len(no.solution())
+
+def test_heuristica_perfeita_cache_limitado_e_invalidado():
+    """Campos são criados sob demanda, limitados por LRU e descartados se o layout muda"""
+    obstaculos = {(2, y) for y in range(5)}
+    cache = HeuristicaPerfeita(capacidade=2)
+    for alvo in [(0, 0), (4, 0), (0, 0)]:
+        cache.heuristica(obstaculos, alvo, 6, 6)
+    assert (len(cache), cache.construidos) == (2, 2)
+    cache.heuristica(obstaculos, (5, 5), 6, 6)  # expulsa (4, 0), o menos usado
+    cache.heuristica(obstaculos, (4, 0), 6, 6)
+    assert cache.construidos == 4
+
+    h = cache.heuristica(obstaculos | {(2, 5)}, (0, 0), 6, 6)  # parede fechada
+    assert len(cache) == 1
+    assert h(Node((4, 0, 0))) == float('inf')
+
+# =============================================================================
+# TESTES DO PLANEJADOR ANYTIME (ARA*)
+# =============================================================================
+
+def test_agente_anytime_configuravel(setup_padrao):
+    """O agente 'anytime' aceita prazo e epsilon e completa a missão"""
+    prateleiras, pos_inicial, pos_entrega = setup_padrao
+    ambiente = AmbienteAlmoxarifado(10, 10, prateleiras.copy(), pos_entrega)
+    ambiente.render = lambda: None
+    agente = AgenteAlmoxarifado(pos_inicial, prateleiras.copy(), pos_entrega, 10, 10,
+                                planejador='anytime', prazo_decisao=0.01, epsilon=1.5)
+    ambiente.add_thing(agente, location=pos_inicial)
+    ambiente.run(steps=60)
+    assert (agente.prazo_decisao, agente.epsilon) == (0.01, 1.5)
+    assert ambiente.dados_agentes[agente]['itens_entregues'] == 1
+
+def test_anytime_so_guarda_no_cache_o_plano_com_epsilon_1(setup_padrao):
+    """Plano cortado pelo prazo (epsilon > 1) é refeito na próxima decisão; com tempo de sobra, vem do cache"""
+    prateleiras, pos_inicial, pos_entrega = setup_padrao
+    obstaculos = set(prateleiras)
+    for prazo, guardado in ((0.0, False), (10.0, True)):
+        agente = AgenteAlmoxarifado(pos_inicial, prateleiras.copy(), pos_entrega, 10, 10,
+                                    planejador='anytime', prazo_decisao=prazo, epsilon=3)
+        acoes = finish_search(agente._buscar_caminho_passos((0, 0, 1), obstaculos, pos_entrega))
+        assert acoes is not None
+        assert agente._rota_provisoria is not guardado
+        assert len(agente.cache_caminhos) == int(guardado)
+
+
+# =============================================================================
+# TESTES DO LIMITE DE EXPANSÕES POR CANDIDATA
+# =============================================================================
+
+def test_agente_adia_alvo_que_estoura_o_limite():
+    """Um alvo cuja busca estoura max_expansoes não é dado como inacessível: vai para o fim, sem limite"""
+    # (8, 6) é a mais próxima, mas a parede em y = 7 faz o A* inundar o bolsão
+    # embaixo dela; (0, 15), um passo mais longe, sai dentro do limite
+    prateleiras = {(x, 7): 0 for x in range(3, 14)}
+    prateleiras.update({(8, 6): 1, (0, 15): 1})
+    ambiente = AmbienteAlmoxarifado(16, 16, prateleiras.copy(), (15, 15), usar_matriz_distancias=True)
+    ambiente.render = lambda: None
+    agente = AgenteAlmoxarifado((8, 8), prateleiras.copy(), (15, 15), 16, 16,
+                                planejador='alt', max_expansoes=20, perfil=True)
+    ambiente.add_thing(agente, location=(8, 8))
+
+    ambiente.step()
+    assert agente.alvo_atual == (0, 15)
+    adiada, escolhida = agente.perfil.registros
+    assert (adiada['alvo'], adiada['status']) == ((8, 6), ORCAMENTO_ESGOTADO)
+    assert (escolhida['alvo'], escolhida['status']) == ((0, 15), 'ok')
+    assert not agente._inacessiveis
+
+    ambiente.run(steps=100)
+    assert ambiente.dados_agentes[agente]['itens_entregues'] == 2
+
+def test_alvo_unico_da_varredura_busca_sem_limite():
+    """Sem a matriz, a varredura entrega um só alvo já alcançável: nada a adiar, busca direto sem limite"""
+    prateleiras = {(x, 7): 0 for x in range(3, 14)}
+    prateleiras.update({(8, 6): 1, (0, 15): 1})
+    agente = AgenteAlmoxarifado((8, 8), prateleiras.copy(), (15, 15), 16, 16,
+                                max_expansoes=20, perfil=True)
+    agente.programa_agente({'posicao': (8, 8), 'tem_caixa': False})
+    registro, = agente.perfil.registros
+    assert (registro['alvo'], registro['status']) == ((8, 6), 'ok')
+    assert registro['expansoes'] > 20
+
+# =============================================================================
+# TESTES DA VARREDURA MULTIALVO (PRÓXIMA PRATELEIRA)
+# =============================================================================
+
+def test_varredura_escolhe_a_mais_proxima_pelo_caminho():
+    """A mais próxima em Manhattan fica atrás de uma parede; a varredura escolhe a outra"""
+    parede = {(x, 2) for x in range(0, 9)}
+    prateleiras = parede | {(1, 3), (6, 0)}
+    alvo, acoes, inalcancaveis = prateleira_mais_proxima(
+        (0, 0, 0), prateleiras, [(1, 3), (6, 0)], 10, 10
+    )
+    assert alvo == (6, 0)
+    assert acoes == ['L'] * 6
+    assert not inalcancaveis
+
+    alvo, acoes, inalcancaveis = prateleira_mais_proxima(
+        (0, 0, 0), prateleiras | {(9, 2)}, [(1, 3)], 10, 10
+    )
+    assert (alvo, acoes, inalcancaveis) == (None, None, {(1, 3)})
+
+def test_rota_ate_vizinho_do_balcao_passa_pelo_planejador_cache_e_perfil():
+    """A perna multialvo até um vizinho livre do balcão usa o planejador, o cache e o perfil"""
+    obstaculos = {(x, 4) for x in range(1, 10)} | {(4, 8), (4, 9)}
+    vizinhos = [(3, 9), (5, 9), (3, 8), (5, 8)]
+    for planejador, esperado in (('astar', (3, 8)), ('bidirecional', (3, 8)), ('grade', (3, 8))):
+        agente = AgenteAlmoxarifado((0, 0), {}, (4, 9), 10, 10, planejador=planejador, perfil=True)
+        alvo, acoes = finish_search(agente._buscar_mais_proximo_passos((0, 0, 1), obstaculos, vizinhos))
+        assert alvo == esperado and len(acoes) == 11
+        registro, = agente.perfil.registros
+        assert registro['local'] == 'entrega' and registro['alvo'] == tuple(sorted(vizinhos))
+        assert (registro['expansoes'] is None) == (planejador == 'grade')
+        # A mesma perna outra vez vem do cache, sem nova busca
+        assert finish_search(agente._buscar_mais_proximo_passos((0, 0, 1), obstaculos, vizinhos)) == (alvo, acoes)
+        assert len(agente.perfil.registros) == 1 and agente.cache_caminhos.acertos == 1
+
+def test_varredura_com_robo_sobre_prateleira_vizinha_do_alvo():
+    """Alvo sem vizinho livre, mas vizinho da prateleira onde o robô está: é alcançável"""
+    # (0,0) robô sobre prateleira; alvo (1,0) cercado por (2,0) e (1,1); (3,3) cercado de verdade
+    prateleiras = {(0, 0), (1, 0), (2, 0), (1, 1), (3, 3), (2, 3), (3, 2)}
+    alvo, acoes, inalcancaveis = prateleira_mais_proxima(
+        (0, 0, 0), prateleiras, [(1, 0), (3, 3)], 4, 4
+    )
+    assert (alvo, acoes) == ((1, 0), ['L'])
+    assert inalcancaveis == {(3, 3)}
+
+    dados = {(0, 0): 0, (1, 0): 1, (2, 0): 0, (1, 1): 0}
+    ambiente = AmbienteAlmoxarifado(4, 4, dados.copy(), (3, 3))
+    ambiente.render = lambda: None
+    agente = AgenteAlmoxarifado((0, 0), dados.copy(), (3, 3), 4, 4)
+    ambiente.add_thing(agente, location=(0, 0))
+    ambiente.step()
+    assert agente.alvo_atual == (1, 0) and not agente._inacessiveis
+
+def test_agente_descarta_cercadas_sem_buscar():
+    """Prateleiras cercadas saem da lista na mesma varredura que escolhe o alvo"""
+    prateleiras = {(2, 1): 0, (1, 2): 0, (3, 2): 0, (2, 3): 0, (2, 2): 1, (7, 0): 1}
+    ambiente = AmbienteAlmoxarifado(10, 10, prateleiras.copy(), (0, 9))
+    ambiente.render = lambda: None
+    agente = AgenteAlmoxarifado((0, 0), prateleiras.copy(), (0, 9), 10, 10)
+    ambiente.add_thing(agente, location=(0, 0))
+
+    ambiente.step()
+    assert agente.alvo_atual == (7, 0)
+    assert agente._inacessiveis == {(2, 2)}
+    assert len(agente.cache_caminhos) == 1  # só a rota até a escolhida foi planejada
+
+# =============================================================================
+# TESTES DAS COMPONENTES CONEXAS
+# =============================================================================
+
+def test_componentes_rotulos_e_alcance():
+    """Rótulos iguais dentro de cada região livre; prateleira alcançável pelos vizinhos livres"""
+    parede = {(2, y) for y in range(5)}  # separa x < 2 de x > 2 numa grade 5x5
+    componentes = ComponentesConexas(5, 5, parede | {(0, 4)})
+    assert componentes.componente((0, 0)) == componentes.componente((1, 3))
+    assert componentes.componente((0, 0)) != componentes.componente((4, 4))
+    assert componentes.componente((2, 2)) == BLOQUEADA
+    assert componentes.alcanca((0, 0), (0, 4))      # prateleira da mesma região
+    assert componentes.alcanca((0, 0), (2, 2))      # a parede é acessada pela esquerda
+    assert not componentes.alcanca((0, 0), (4, 4))
+    assert componentes.inalcancaveis((0, 0), [(0, 4), (3, 0)]) == [(3, 0)]
+
+    # Robô parado numa prateleira entra direto na prateleira vizinha, mesmo cercada
+    cercada = ComponentesConexas(4, 4, {(0, 0), (1, 0), (2, 0), (1, 1)})
+    assert cercada.alcanca((0, 0), (1, 0))
+    assert cercada.inalcancaveis((0, 0), [(1, 0)]) == []
+    assert not cercada.alcanca((0, 1), (1, 0))  # de uma célula livre, continua cercada
+
+def test_componentes_atualizacao_incremental():
+    """Bloquear uma célula parte a componente; liberar junta de novo"""
+    obstaculos = {(2, y) for y in range(1, 5)}
+    componentes = ComponentesConexas(5, 5, obstaculos)
+    assert componentes.alcanca((0, 4), (4, 4))
+    componentes.atualizar_celula((2, 0), True)
+    assert not componentes.alcanca((0, 4), (4, 4))
+    assert componentes.alcanca((0, 4), (1, 0))
+    componentes.atualizar_celula((2, 3), False)
+    assert componentes.alcanca((0, 4), (4, 4))
+
+def test_ambiente_detecta_missao_impossivel_na_carga():
+    """Balcão cercado: o ambiente encerra antes do primeiro passo, sem busca do agente"""
+    prateleiras = {(4, 3): 0, (4, 5): 0, (3, 4): 0, (5, 4): 0, (0, 2): 1}
+    ambiente = AmbienteAlmoxarifado(8, 8, prateleiras.copy(), (4, 4))
+    ambiente.render = lambda: None
+    agente = AgenteAlmoxarifado((0, 0), prateleiras.copy(), (4, 4), 8, 8)
+    ambiente.add_thing(agente, location=(0, 0))
+    assert ambiente.missao_impossivel
+    assert ambiente.is_done()
+
+    possivel = AmbienteAlmoxarifado(8, 8, {(0, 2): 1, (7, 7): 1, (6, 7): 0, (7, 6): 0}, (0, 0))
+    possivel.add_thing(AgenteAlmoxarifado((0, 0), {}, (0, 0), 8, 8), location=(0, 0))
+    assert not possivel.missao_impossivel
+    assert possivel.prateleiras_inalcancaveis == {(7, 7)}
+
+def test_agente_descarta_fora_da_componente():
+    """Com as componentes na percepção, a prateleira isolada é descartada antes de qualquer busca"""
+    prateleiras = {(6, 5): 0, (6, 7): 0, (5, 6): 0, (7, 6): 0, (6, 6): 2, (3, 0): 1}
+    ambiente = AmbienteAlmoxarifado(10, 10, prateleiras.copy(), (0, 9))
+    ambiente.render = lambda: None
+    agente = AgenteAlmoxarifado((0, 0), prateleiras.copy(), (0, 9), 10, 10)
+    ambiente.add_thing(agente, location=(0, 0))
+    ambiente.run(steps=60)
+    assert ambiente.dados_agentes[agente]['itens_entregues'] == 1
+    assert agente._inacessiveis == {(6, 6)}
+
+def test_missao_encerra_quando_so_restam_prateleiras_fora_da_componente():
+    """Entregues os itens alcançáveis, o agente encerra em vez de ficar em NoOp até o limite de passos"""
+    prateleiras = {(x, 4): 0 for x in range(8)}  # parede que isola a parte de baixo
+    prateleiras.update({(0, 0): 1, (3, 0): 1, (2, 2): 1, (4, 2): 1})
+    for pos in [(0, 6), (2, 6), (4, 6), (6, 6), (1, 7), (3, 7), (5, 7), (7, 7), (0, 8), (2, 8)]:
+        prateleiras[pos] = 2
+    for planejador in ('astar', 'campo'):
+        ambiente = AmbienteAlmoxarifado(8, 9, prateleiras.copy(), (6, 1))
+        ambiente.render = lambda: None
+        agente = AgenteAlmoxarifado((7, 0), prateleiras.copy(), (6, 1), 8, 9, planejador=planejador)
+        ambiente.add_thing(agente, location=(7, 0))
+        assert not ambiente.missao_impossivel
+        passos = 0
+        while not ambiente.is_done() and passos < 200:
+            ambiente.step()
+            passos += 1
+        assert passos < 200
+        assert ambiente.dados_agentes[agente]['itens_entregues'] == 4
+        assert agente.missao_impossivel
+
+def test_percepcao_nao_altera_dados_do_agente():
+    """percept devolve uma cópia com os dados derivados; dados_agentes guarda só o estado físico"""
+    ambiente = AmbienteAlmoxarifado(6, 6, {(3, 3): 1}, (0, 5), usar_matriz_distancias=True)
+    agente = AgenteAlmoxarifado((0, 0), {(3, 3): 1}, (0, 5), 6, 6)
+    ambiente.add_thing(agente, location=(0, 0))
+    percepcao = ambiente.percept(agente)
+    assert percepcao is not ambiente.dados_agentes[agente]
+    assert {'versao_layout', 'componentes', 'distancias'} <= percepcao.keys()
+    assert set(ambiente.dados_agentes[agente]) == {'posicao', 'tem_caixa', 'itens_entregues', 'ultima_acao'}
+    assert percepcao['posicao'] == (0, 0)
+
+# =============================================================================
+# TESTES DA DECISÃO EM PASSOS (GERADORES)
+# =============================================================================
+
+def test_decisao_em_passos_igual_a_direta():
+    """decidir_em_passos pausa durante o A* e termina com a mesma ação de programa_agente"""
+    prateleiras = {(x, y): 0 for x in range(1, 11, 2) for y in range(1, 11) if y != 6}
+    prateleiras[(11, 11)] = 1
+    ambiente = AmbienteAlmoxarifado(12, 12, prateleiras.copy(), (0, 11))
+    direto = AgenteAlmoxarifado((0, 0), prateleiras.copy(), (0, 11), 12, 12, tamanho_cache=0)
+    em_passos = AgenteAlmoxarifado((0, 0), prateleiras.copy(), (0, 11), 12, 12,
+                                   tamanho_cache=0, expansoes_por_fatia=5)
+    ambiente.add_thing(direto, location=(0, 0))
+    percepcao = dict(ambiente.percept(direto))
+
+    decisao = em_passos.decidir_em_passos(percepcao)
+    pausas = 0
+    while True:
+        try:
+            next(decisao)
+            pausas += 1
+        except StopIteration as fim:
+            acao = fim.value
+            break
+    assert pausas > 1
+    assert acao == direto.programa_agente(percepcao)
+    assert em_passos.plano == direto.plano
+
+def test_decisoes_intercaladas_numa_thread(setup_padrao):
+    """interleave_searches alterna as decisões de vários agentes e entrega cada ação ao terminar"""
+    prateleiras, pos_inicial, pos_entrega = setup_padrao
+    ambiente = AmbienteAlmoxarifado(10, 10, prateleiras.copy(), pos_entrega)
+    agentes = [AgenteAlmoxarifado(pos, prateleiras.copy(), pos_entrega, 10, 10, expansoes_por_fatia=2)
+               for pos in [(0, 0), (9, 9)]]
+    for agente, pos in zip(agentes, [(0, 0), (9, 9)]):
+        ambiente.add_thing(agente, location=pos)
+    decisoes = {agente: agente.decidir_em_passos(ambiente.percept(agente)) for agente in agentes}
+    acoes = dict(interleave_searches(decisoes))
+    assert set(acoes) == set(agentes)
+    assert all(acao in ('N', 'S', 'O', 'L') for acao in acoes.values())
+
+# =============================================================================
+# TESTES DO PERFIL DAS BUSCAS DO AGENTE
+# =============================================================================
+
+def test_perfil_por_perna_e_exportacao(setup_padrao, tmp_path):
+    """Com o perfil ligado, cada perna planejada vira um registro; exporta JSON lines e CSV"""
+    prateleiras, pos_inicial, pos_entrega = setup_padrao
+    ambiente = AmbienteAlmoxarifado(10, 10, prateleiras.copy(), pos_entrega)
+    ambiente.render = lambda: None
+    agente = AgenteAlmoxarifado(pos_inicial, prateleiras.copy(), pos_entrega, 10, 10, perfil=False)
+    assert agente.perfil is None
+    perfil = agente.ativar_perfil()
+    ambiente.add_thing(agente, location=pos_inicial)
+    ambiente.run(steps=60)
+
+    resumo = perfil.resumo()
+    assert set(resumo) == {'coleta', 'entrega'}
+    assert resumo['coleta']['buscas'] == 1 and resumo['coleta']['expansoes'] > 0
+    assert resumo['entrega']['pico_fronteira'] > 0
+    registro = perfil.registros[0]
+    assert registro['status'] == 'ok' and registro['comprimento'] > 0
+    assert registro['tempo'] >= registro['tempo_heuristica'] > 0
+
+    perfil.exportar(tmp_path / 'perfil.jsonl')
+    linhas = (tmp_path / 'perfil.jsonl').read_text(encoding='utf-8').splitlines()
+    assert [json.loads(l)['local'] for l in linhas] == ['coleta', 'entrega']
+    perfil.exportar(tmp_path / 'perfil.csv')
+    with open(tmp_path / 'perfil.csv', encoding='utf-8') as arquivo:
+        assert [r['local'] for r in csv.DictReader(arquivo)] == ['coleta', 'entrega']
+    assert agente.desativar_perfil() is perfil and agente.perfil is None
+
+def test_perfil_planejador_sem_problema_registra_tempo(setup_padrao):
+    """Planejadores próprios da grade registram só tempo e comprimento"""
+    prateleiras, pos_inicial, pos_entrega = setup_padrao
+    agente = AgenteAlmoxarifado(pos_inicial, prateleiras.copy(), pos_entrega, 10, 10,
+                                planejador='grade', perfil=True)
+    agente.programa_agente({'posicao': pos_inicial, 'tem_caixa': False})
+    registro, = agente.perfil.registros
+    assert registro['expansoes'] is None and registro['comprimento'] > 0
+
+def test_agente_ida_completa_missao(setup_padrao):
+    """O planejador 'ida' (IDA* com tabela limitada) faz as mesmas pernas ótimas do 'astar'"""
+    prateleiras, pos_inicial, pos_entrega = setup_padrao
+    percepcao = {'posicao': pos_inicial, 'tem_caixa': False}
+    astar = AgenteAlmoxarifado(pos_inicial, prateleiras.copy(), pos_entrega, 10, 10)
+    ida = AgenteAlmoxarifado(pos_inicial, prateleiras.copy(), pos_entrega, 10, 10, planejador='ida')
+    ida.programa_agente(percepcao)
+    astar.programa_agente(percepcao)
+    assert len(ida.plano) == len(astar.plano)
+
+    ambiente = AmbienteAlmoxarifado(10, 10, prateleiras.copy(), pos_entrega)
+    ambiente.render = lambda: None
+    agente = AgenteAlmoxarifado(pos_inicial, prateleiras.copy(), pos_entrega, 10, 10, planejador='ida')
+    ambiente.add_thing(agente, location=pos_inicial)
+    ambiente.run(steps=60)
+    assert ambiente.dados_agentes[agente]['itens_entregues'] == 1
+
+def test_agente_com_estados_compactos_faz_as_mesmas_rotas(setup_padrao):
+    """estados_compactos não muda as rotas dos planejadores que o aceitam"""
+    prateleiras, pos_inicial, pos_entrega = setup_padrao
+    for planejador in ('astar', 'bidirecional'):
+        percepcao = {'posicao': pos_inicial, 'tem_caixa': False}
+        normal = AgenteAlmoxarifado(pos_inicial, prateleiras.copy(), pos_entrega, 10, 10,
+                                    planejador=planejador)
+        compacto = AgenteAlmoxarifado(pos_inicial, prateleiras.copy(), pos_entrega, 10, 10,
+                                      planejador=planejador, estados_compactos=True)
+        assert compacto.programa_agente(percepcao) == normal.programa_agente(percepcao)
+        assert compacto.plano == normal.plano
+
+    ambiente = AmbienteAlmoxarifado(10, 10, prateleiras.copy(), pos_entrega)
+    ambiente.render = lambda: None
+    agente = AgenteAlmoxarifado(pos_inicial, prateleiras.copy(), pos_entrega, 10, 10,
+                                estados_compactos=True)
+    ambiente.add_thing(agente, location=pos_inicial)
+    ambiente.run(steps=60)
+    assert ambiente.dados_agentes[agente]['itens_entregues'] == 1
+
+# =============================================================================
+# TESTES DA TABELA DE VIZINHOS CSR
+# =============================================================================
+
+def test_csr_linhas_e_correcao_incremental():
+    """Linhas N, S, O, L só com vizinhos livres; a correção fica igual a recompilar"""
+    obstaculos = {(1, 0), (1, 1), (3, 2)}
+    adjacencia = AdjacenciaCSR(obstaculos, 5, 4)
+    assert adjacencia.vizinhos(0) == [5]                # (0,0): só o Sul está livre
+    assert adjacencia.vizinhos(1 * 5 + 1) == [2 * 5 + 1, 1 * 5 + 0, 1 * 5 + 2]  # prateleira também tem linha
+    for pos, bloqueado in [((2, 2), True), ((1, 1), False), ((4, 3), True), ((0, 0), True)]:
+        adjacencia.atualizar_celula(pos, bloqueado)
+        obstaculos = obstaculos | {pos} if bloqueado else obstaculos - {pos}
+        recompilada = AdjacenciaCSR(obstaculos, 5, 4)
+        assert adjacencia.offsets == recompilada.offsets
+        assert adjacencia.indices == recompilada.indices
+    assert adjacencia.versao == 4
+
+def test_csr_astar_e_bfs_iguais_aos_da_grade():
+    """A* sobre a tabela devolve o mesmo caminho do A* da grade; a BFS bate com o campo"""
+    obstaculos = {(x, y) for x in range(1, 11, 2) for y in range(1, 11) if y != 6}
+    adjacencia = AdjacenciaCSR(obstaculos, 12, 12)
+    grade = GradeAlmoxarifado(obstaculos, 12, 12)
+    for origem, alvo in [((0, 0), (11, 11)), ((0, 0), (5, 9)), ((3, 3), (3, 3)), ((5, 2), (9, 9))]:
+        o, a = grade.celula(*origem), grade.celula(*alvo)
+        assert adjacencia.astar(o, a) == grade.astar(o, a)
+    campo = CampoDistancias(obstaculos, (0, 0), 12, 12)
+    distancias = adjacencia.distancias(0)
+    assert all(distancias[y * 12 + x] == campo.distancias[y, x]
+               for x in range(12) for y in range(12) if (x, y) not in obstaculos)
+
+def test_agente_grade_corrige_a_tabela_quando_o_layout_muda():
+    """O planejador 'grade' compila a tabela uma vez e só a corrige depois de uma prateleira nova"""
+    prateleiras = {(2, 0): 3, (2, 1): 0, (2, 2): 0}
+    ambiente = AmbienteAlmoxarifado(6, 6, prateleiras.copy(), (0, 5))
+    ambiente.render = lambda: None
+    agente = AgenteAlmoxarifado((0, 5), prateleiras.copy(), (0, 5), 6, 6, planejador='grade')
+    ambiente.add_thing(agente, location=(0, 5))
+    ambiente.run(steps=30)
+    tabela = agente._adjacencia
+    assert tabela is not None and tabela.versao == 0
+
+    ambiente.adicionar_prateleira((1, 3), 1)
+    ambiente.run(steps=60)
+    assert agente._adjacencia is tabela and tabela.versao == 1
+    assert ambiente.dados_agentes[agente]['itens_entregues'] == 4
+
+# =============================================================================
+# TESTES DA COMPARAÇÃO DE AGENTES EM PARALELO
+# =============================================================================
+
+def test_especificacao_monta_ambientes_independentes(setup_padrao):
+    """Cada construir() cria um ambiente com prateleiras próprias, igual ao original"""
+    prateleiras, pos_inicial, pos_entrega = setup_padrao
+    ambiente = AmbienteAlmoxarifado(10, 10, prateleiras.copy(), pos_entrega)
+    especificacao = EspecificacaoAmbiente.do_ambiente(ambiente, pos_inicial)
+    a, b = especificacao.construir(), especificacao.construir()
+    assert a.prateleiras == b.prateleiras == prateleiras
+    a.prateleiras[(2, 2)] = 0
+    assert b.prateleiras[(2, 2)] == 1 and especificacao.itens_totais() == 1
+
+def test_intervalo_confianca_t_de_student():
+    """Meia-largura t(0,975; n-1) * s / sqrt(n); nenhuma com um valor só"""
+    media, meia = intervalo_confianca([1.0, 2.0, 3.0])
+    assert media == 2.0 and meia == pytest.approx(4.303 * 1.0 / 3 ** 0.5)
+    assert intervalo_confianca([5]) == (5, None)
+
+def test_comparar_agentes_em_paralelo(setup_padrao):
+    """Episódios em processos separados, um resumo por fábrica de agentes"""
+    prateleiras, pos_inicial, pos_entrega = setup_padrao
+    especificacoes = [EspecificacaoAmbiente(10, 10, prateleiras, pos_inicial, pos_entrega),
+                      EspecificacaoAmbiente(10, 10, prateleiras, (9, 9), pos_entrega)]
+    fabricas = [AgenteAlmoxarifado, functools.partial(AgenteAlmoxarifado, planejador='grade')]
+    resultados = comparar_agentes(especificacoes, fabricas, passos=60, processos=2)
+
+    assert [fabrica for fabrica, _ in resultados] == fabricas
+    (_, astar), (_, grade) = resultados
+    assert astar['episodios'] == astar['concluidos'] == 2
+    assert astar['itens_entregues'] == (1, 0.0)
+    # Planejadores ótimos: os mesmos passos em cada episódio
+    assert [e['passos'] for e in astar['por_episodio']] == [e['passos'] for e in grade['por_episodio']]
+    media, meia = astar['passos']
+    assert meia > 0 and media == sum(e['passos'] for e in astar['por_episodio']) / 2
+
+    sozinho = episodios.testar_agente(AgenteAlmoxarifado, 60, especificacoes[:1], processos=1)
+    assert sozinho['passos'][0] == astar['por_episodio'][0]['passos']
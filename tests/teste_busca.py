@@ -0,0 +1,450 @@
+# Arquivo: tests/teste_busca.py
+
+import pytest
+import json
+import sys
+import os
+import threading
+import time
+
+# Adiciona a raiz do projeto ao path para que o pytest encontre as pastas env, agents, etc.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Resolve dependências internas do AIMA para os testes
+import aima.utils
+sys.modules['utils'] = aima.utils
+
+import aima.search as busca
+from aima.utils import PriorityQueue, IndexedPriorityQueue
+from aima.search import astar_search, Node
+from problems.problema_almoxarifado import (ProblemaAlmoxarifado, ProblemaMultiAlvo, faces_de_acesso,
+                                           CodecEstado, ProblemaAlmoxarifadoCompacto)
+
+# =============================================================================
+# FIXTURES (Cenários Automáticos de Teste)
+# =============================================================================
+
+@pytest.fixture
+def problema_corredores():
+    """Grade 12x12 com fileiras de prateleiras em x ímpar e um corredor em y=6."""
+    obstaculos = {(x, y) for x in range(1, 11, 2) for y in range(1, 11) if y != 6}
+    return ProblemaAlmoxarifado((0, 0, 0), obstaculos, (11, 11), (0, 11), 12, 12)
+
+# =============================================================================
+# TESTES DA FILA DE PRIORIDADE INDEXADA
+# =============================================================================
+
+def test_fila_indexada_operacoes_basicas():
+    """Pertinência, consulta, remoção e pop devem seguir a API da PriorityQueue"""
+    fila = IndexedPriorityQueue('min', lambda n: n.path_cost)
+    fila.extend([Node('a', path_cost=3), Node('b', path_cost=1), Node('c', path_cost=2)])
+
+    assert len(fila) == 3
+    assert Node('a') in fila
+    assert fila[Node('a')] == 3
+
+    del fila[Node('b')]
+    assert Node('b') not in fila
+    assert len(fila) == 2
+    with pytest.raises(KeyError):
+        fila[Node('b')]
+
+    # Reinserir com custo menor substitui a entrada anterior (decrease-key)
+    fila.append(Node('a', path_cost=0))
+    assert len(fila) == 2
+    assert fila.pop().state == 'a'
+    assert fila.pop().state == 'c'
+    with pytest.raises(Exception):
+        fila.pop()
+
+def test_fila_indexada_mesma_ordem_da_original():
+    """Com empates de f, a ordem de saída deve ser a mesma da PriorityQueue"""
+    itens = [(5, 'e'), (1, 'b'), (1, 'a'), (3, 'c'), (1, 'd')]
+    original = PriorityQueue('min', lambda x: x[0])
+    indexada = IndexedPriorityQueue('min', lambda x: x[0])
+    original.extend(itens)
+    indexada.extend(itens)
+    assert [original.pop() for _ in itens] == [indexada.pop() for _ in itens]
+
+def test_astar_igual_com_as_duas_filas(problema_corredores):
+    """Trocar a fila não pode alterar o plano devolvido pelo A*"""
+    plano_indexado = astar_search(problema_corredores).solution()
+
+    busca.IndexedPriorityQueue = PriorityQueue
+    try:
+        plano_original = astar_search(problema_corredores).solution()
+    finally:
+        busca.IndexedPriorityQueue = IndexedPriorityQueue
+
+    assert plano_indexado == plano_original
+    assert len(plano_indexado) == 22
+
+# =============================================================================
+# TESTES DA BUSCA BIDIRECIONAL COM HEAPS
+# =============================================================================
+
+def test_bidirecional_mesmo_custo_da_referencia():
+    """Em grafos do AIMA, o custo deve coincidir com bidirectional_search (versão de listas)"""
+    for inicio, fim in [('Arad', 'Bucharest'), ('Oradea', 'Eforie'), ('Timisoara', 'Neamt')]:
+        prob = busca.GraphProblem(inicio, fim, busca.romania_map)
+        no = busca.bidirectional_astar_search(prob)
+        assert no.path_cost == busca.bidirectional_search(prob)
+        assert no.path_cost == astar_search(prob).path_cost
+        assert no.path()[0].state == inicio and no.state == fim
+
+
+def test_bidirecional_almoxarifado(problema_corredores):
+    """O caminho devolvido deve ser válido e tão curto quanto o do A*"""
+    prob = problema_corredores
+    no = busca.bidirectional_astar_search(prob, prob.problema_inverso())
+    assert len(no.solution()) == len(astar_search(prob).solution())
+
+    estado = prob.initial
+    for acao in no.solution():
+        assert acao in prob.actions(estado)
+        estado = prob.result(estado, acao)
+    assert prob.goal_test(estado)
+
+
+def test_bidirecional_sem_caminho():
+    """Alvo cercado: a busca termina e devolve None"""
+    obstaculos = {(2, 1), (1, 2), (3, 2), (2, 3)}
+    prob = ProblemaAlmoxarifado((0, 0, 0), obstaculos, (2, 2), (0, 4), 5, 5)
+    assert busca.bidirectional_astar_search(prob, prob.problema_inverso()) is None
+
+# =============================================================================
+# TESTES DO NÓ COMPACTO E DO MODO CAME_FROM
+# =============================================================================
+
+def test_no_sem_dict_com_f_e_h():
+    """Node usa __slots__; o memoize de f/h continua funcionando"""
+    no = Node((0, 0, 0))
+    assert not hasattr(no, '__dict__')
+    assert not hasattr(no, 'f')
+    no.f = 3
+    assert no.f == 3
+
+
+def test_came_from_igual_aos_nos(problema_corredores):
+    """Os modos com e sem nós devolvem o mesmo caminho, com solution()/path() intactos"""
+    for buscar in (busca.breadth_first_graph_search, busca.depth_first_graph_search):
+        com_nos = buscar(problema_corredores)
+        sem_nos = buscar(problema_corredores, came_from=True)
+        assert sem_nos.solution() == com_nos.solution()
+        assert [n.state for n in sem_nos.path()] == [n.state for n in com_nos.path()]
+        assert sem_nos.path_cost == com_nos.path_cost
+
+    cercado = ProblemaAlmoxarifado((0, 0, 0), {(1, 0), (0, 1)}, (3, 3), (0, 0), 4, 4)
+    assert busca.breadth_first_graph_search(cercado, came_from=True) is None
+
+def test_busca_em_grafo_sem_estados_repetidos_na_fronteira():
+    """Com o conjunto de alcançados, cada estado é gerado para a fronteira uma vez só"""
+    problema = busca.GraphProblem('Arad', 'Bucharest', busca.romania_map)
+    for buscar, esperado in ((busca.breadth_first_graph_search, ['Sibiu', 'Fagaras', 'Bucharest']),
+                             (busca.depth_first_graph_search, None)):
+        instrumentado = busca.InstrumentedProblem(problema)
+        no = buscar(instrumentado)
+        estados = [n.state for n in no.path()]
+        assert len(estados) == len(set(estados)) and estados[-1] == 'Bucharest'
+        assert instrumentado.succs <= len(busca.romania_map.locations)
+        if esperado:
+            assert no.solution() == esperado
+
+# =============================================================================
+# TESTES DO A* PONDERADO E DO ARA* (ANYTIME)
+# =============================================================================
+
+def test_ponderado_respeita_o_limite(problema_corredores):
+    """O custo do A* ponderado fica dentro de weight vezes o ótimo"""
+    otimo = astar_search(problema_corredores).path_cost
+    assert otimo <= busca.weighted_astar_search(problema_corredores, weight=2).path_cost <= 2 * otimo
+
+
+def test_anytime_melhora_ate_o_otimo(problema_corredores):
+    """Sem prazo, o ARA* desce epsilon até 1 e termina com o custo ótimo"""
+    otimo = astar_search(problema_corredores).path_cost
+    solucoes = []
+    no = busca.anytime_astar_search(problema_corredores, epsilon=3,
+                                    on_solution=lambda n, e: solucoes.append((n.path_cost, e)))
+    assert no.path_cost == otimo
+    assert all(custo <= e * otimo for custo, e in solucoes)
+    assert [c for c, _ in solucoes] == sorted({c for c, _ in solucoes}, reverse=True)
+
+
+def test_anytime_prazo_vencido_devolve_primeira_solucao(problema_corredores):
+    """Com o prazo já vencido, devolve a primeira solução (limitada por epsilon) sem melhorar"""
+    solucoes = []
+    no = busca.anytime_astar_search(problema_corredores, epsilon=3, deadline=0,
+                                    on_solution=lambda n, e: solucoes.append(e))
+    assert solucoes == [3]
+    assert no.path_cost <= 3 * astar_search(problema_corredores).path_cost
+
+
+# =============================================================================
+# TESTES DAS BUSCAS LIMITADAS (EXPANSÕES, PRAZO E CANCELAMENTO)
+# =============================================================================
+
+def test_sem_limites_devolve_no_como_antes(problema_corredores):
+    """Sem max_expansions/deadline/cancel o retorno continua sendo o Node (ou None)"""
+    assert isinstance(astar_search(problema_corredores), Node)
+    assert isinstance(busca.breadth_first_graph_search(problema_corredores), Node)
+
+
+def test_limite_de_expansoes_esgota(problema_corredores):
+    """Com poucas expansões a busca desiste com BUDGET_EXHAUSTED, sem solução"""
+    for resultado in (astar_search(problema_corredores, max_expansions=5),
+                      busca.breadth_first_graph_search(problema_corredores, max_expansions=5),
+                      busca.depth_first_graph_search(problema_corredores, True, max_expansions=5),
+                      busca.iterative_deepening_search(problema_corredores, max_expansions=5)):
+        assert resultado.status == busca.SearchResult.BUDGET_EXHAUSTED
+        assert not resultado and resultado.node is None
+        assert resultado.expansions == 5
+
+
+def test_limite_folgado_resolve(problema_corredores):
+    """Com orçamento suficiente o resultado é SOLVED e traz o mesmo caminho"""
+    resultado = astar_search(problema_corredores, max_expansions=10 ** 6)
+    assert resultado and resultado.status == busca.SearchResult.SOLVED
+    assert resultado.solution() == astar_search(problema_corredores).solution()
+
+
+def test_sem_caminho_e_cancelamento():
+    """Alvo cercado dá NO_PATH; um evento já sinalizado dá CANCELLED; prazo vencido esgota"""
+    cerco = {(4, 3), (4, 5), (3, 4), (5, 4)}
+    prob = ProblemaAlmoxarifado((0, 0, 0), cerco, (4, 4), (0, 0), 8, 8)
+    assert astar_search(prob, max_expansions=1000).status == busca.SearchResult.NO_PATH
+
+    cancelar = threading.Event()
+    cancelar.set()
+    assert astar_search(prob, cancel=cancelar).status == busca.SearchResult.CANCELLED
+    assert astar_search(prob, deadline=0).status == busca.SearchResult.BUDGET_EXHAUSTED
+
+# =============================================================================
+# TESTES DA BUSCA MULTIALVO
+# =============================================================================
+
+def test_multialvo_acha_o_mais_proximo_numa_busca(problema_corredores):
+    """Uma A* sobre o conjunto custa o mínimo das A* individuais"""
+    obstaculos = problema_corredores.obstaculos
+    alvos = [(11, 11), (0, 11), (4, 0)]
+    individuais = {
+        alvo: astar_search(ProblemaAlmoxarifado((6, 6, 0), obstaculos - {alvo}, alvo, (0, 11), 12, 12)).path_cost
+        for alvo in alvos
+    }
+    no = astar_search(ProblemaMultiAlvo((6, 6, 0), obstaculos, alvos, (0, 11), 12, 12))
+    assert no.path_cost == min(individuais.values())
+    assert no.state[0:2] in alvos
+    assert individuais[no.state[0:2]] == no.path_cost
+
+
+def test_multialvo_faces_e_predicado(problema_corredores):
+    """Faces de acesso de uma prateleira como alvos, ou um predicado com heurística própria"""
+    obstaculos = problema_corredores.obstaculos
+    faces = faces_de_acesso((5, 9), obstaculos, 12, 12)
+    assert faces == [(4, 9), (6, 9)]
+    no = astar_search(ProblemaMultiAlvo((0, 0, 0), obstaculos, faces, None, 12, 12))
+    assert no.state[0:2] == (4, 9)
+
+    na_ultima_linha = ProblemaMultiAlvo((0, 0, 0), obstaculos, objetivo=lambda x, y: y == 11,
+                                        largura=12, altura=12, h=lambda n: 11 - n.state[1])
+    assert astar_search(na_ultima_linha).path_cost == 11
+    with pytest.raises(ValueError):
+        ProblemaMultiAlvo((0, 0, 0), obstaculos)
+    with pytest.raises(ValueError, match='inverso'):
+        ProblemaMultiAlvo((0, 0, 0), obstaculos, faces, None, 12, 12).problema_inverso()
+    with pytest.raises(ValueError, match='compacta'):
+        ProblemaMultiAlvo((0, 0, 0), obstaculos, faces, None, 12, 12).compactar()
+
+# =============================================================================
+# TESTES DAS BUSCAS EM PASSOS (GERADORES)
+# =============================================================================
+
+def test_astar_em_passos_igual_ao_direto(problema_corredores):
+    """O gerador pausa a cada `steps` expansões e retorna o mesmo nó do astar_search"""
+    busca_em_passos = busca.astar_search_steps(problema_corredores, steps=10)
+    pausas = list(iter(lambda: next(busca_em_passos, None), None))
+    assert pausas[:3] == [10, 20, 30]
+    instrumentado = busca.InstrumentedProblem(problema_corredores)
+    astar_search(instrumentado)
+    assert len(pausas) == instrumentado.succs // 10
+
+    no = busca.finish_search(busca.astar_search_steps(problema_corredores, steps=10))
+    assert no.solution() == astar_search(problema_corredores).solution()
+    limitado = busca.finish_search(busca.astar_search_steps(problema_corredores, steps=10,
+                                                            max_expansions=25))
+    assert limitado.status == busca.SearchResult.BUDGET_EXHAUSTED
+
+
+def test_intercalar_buscas_termina_todas(problema_corredores):
+    """interleave_searches devolve o resultado de cada busca, as curtas primeiro"""
+    perto = ProblemaAlmoxarifado((0, 0, 0), problema_corredores.obstaculos, (0, 3), (0, 11), 12, 12)
+    resultados = list(busca.interleave_searches({
+        'longe': busca.astar_search_steps(problema_corredores, steps=5),
+        'perto': busca.astar_search_steps(perto, steps=5),
+    }))
+    assert [chave for chave, _ in resultados] == ['perto', 'longe']
+    assert resultados[1][1].path_cost == astar_search(problema_corredores).path_cost
+
+# =============================================================================
+# TESTES DO PROBLEMA COM PERFIL (ProfiledProblem)
+# =============================================================================
+
+def test_perfil_conta_expansoes_picos_e_heuristica(problema_corredores):
+    """Contadores de InstrumentedProblem mais picos de fronteira/fechados e tempo de h"""
+    perfilado = busca.ProfiledProblem(problema_corredores)
+    no = astar_search(perfilado)
+    estatisticas = perfilado.stats()
+    assert no.path_cost == astar_search(problema_corredores).path_cost
+    assert estatisticas['expansions'] == estatisticas['peak_closed'] == len(perfilado.expanded)
+    assert estatisticas['generated'] >= len(perfilado.seen) - 1
+    assert 1 <= estatisticas['peak_frontier'] <= len(perfilado.seen)
+    assert estatisticas['h_calls'] > 0 and estatisticas['h_time'] > 0
+
+    perfilado = busca.ProfiledProblem(problema_corredores)
+    chamadas = []
+    astar_search(perfilado, h=perfilado.timed_h(lambda n: chamadas.append(n) or 0))
+    assert perfilado.h_calls == len(chamadas)
+
+class CorredorSemHeuristica(busca.Problem):
+    """Corredor 0..objetivo sem h: passos de +1 ou -1."""
+
+    def actions(self, state):
+        return [d for d in (1, -1) if 0 <= state + d <= self.goal]
+
+    def result(self, state, action):
+        return state + action
+
+def test_perfil_sem_heuristica_no_problema():
+    """Sem problem.h o perfil também não tem h, e a h informada continua medida"""
+    perfilado = busca.ProfiledProblem(CorredorSemHeuristica(0, 5))
+    assert not hasattr(perfilado, 'h')
+    no = astar_search(perfilado, h=perfilado.timed_h(lambda n: perfilado.goal - n.state))
+    assert no.solution() == [1] * 5 and perfilado.h_calls > 0
+
+# =============================================================================
+# TESTES DOS ESTADOS COMPACTOS (um int por estado)
+# =============================================================================
+
+def test_codec_ida_e_volta():
+    """(x * H + y) << 2 | status, e de volta para (x, y, status), na mesma ordem das tuplas"""
+    codec = CodecEstado(12, 10)
+    assert codec.codificar((3, 2, 1)) == (3 * 10 + 2) << 2 | 1
+    for estado in [(0, 0, 0), (11, 0, 2), (0, 9, 1), (7, 5, 0)]:
+        assert codec.decodificar(codec.codificar(estado)) == estado
+        assert codec.posicao(codec.codificar(estado)) == estado[:2]
+    estados = sorted((x, y, s) for x in range(12) for y in range(10) for s in range(3))
+    assert [codec.codificar(e) for e in estados] == sorted(codec.codificar(e) for e in estados)
+
+def test_problema_compacto_tem_as_mesmas_solucoes(problema_corredores):
+    """As buscas do aima devolvem as mesmas ações com estados em tupla ou compactos"""
+    compacto = problema_corredores.compactar()
+    assert isinstance(compacto.initial, int)
+    assert compacto.codec.decodificar(compacto.initial) == problema_corredores.initial
+    for buscar in (astar_search, busca.breadth_first_graph_search, busca.uniform_cost_search):
+        esperado, obtido = buscar(problema_corredores), buscar(compacto)
+        assert obtido.solution() == esperado.solution()
+        assert obtido.path_cost == esperado.path_cost
+    inverso = compacto.problema_inverso()
+    no = busca.bidirectional_astar_search(compacto, inverso)
+    assert no.path_cost == astar_search(problema_corredores).path_cost
+    assert compacto.codec.posicao(no.state) == problema_corredores.alvo
+
+def test_problema_compacto_pega_e_entrega_no_alvo():
+    """No alvo, Pegar/Entregar só trocam os bits de status"""
+    problema = ProblemaAlmoxarifadoCompacto((1, 1, 0), {(1, 2), (2, 1)}, (1, 2), (0, 0), 4, 4)
+    abaixo = problema.result(problema.initial, 'S')
+    assert problema.goal_test(abaixo)
+    assert 'Pegar' in problema.actions(abaixo)
+    pegou = problema.result(abaixo, 'Pegar')
+    assert problema.codec.decodificar(pegou) == (1, 2, 1)
+    assert problema.actions(pegou)[-1] == 'Entregar'
+    assert problema.actions(problema.initial) == ['N', 'S', 'O']
+
+# =============================================================================
+# TESTES DA COMPARAÇÃO PARALELA DE BUSCAS
+# =============================================================================
+
+def busca_que_nao_termina(problema):
+    while True:
+        time.sleep(0.01)
+
+def busca_que_falha(problema):
+    raise RuntimeError('falhou')
+
+def test_comparacao_paralela_com_timeout_erros_e_relatorio(problema_corredores, tmp_path, capsys):
+    """Cada job vira um registro; o timeout corta a busca sem travar o pool"""
+    perto = ProblemaAlmoxarifado((0, 0, 0), problema_corredores.obstaculos, (0, 3), (0, 11), 12, 12)
+    relatorio = tmp_path / 'relatorio.json'
+    resultado = busca.compare_searchers_parallel(
+        [problema_corredores, perto], header=['Busca', 'corredores', 'perto'],
+        searchers=[astar_search, busca_que_nao_termina, busca_que_falha],
+        repeats=2, timeout=0.2, processes=2, report=relatorio)
+
+    assert len(resultado['jobs']) == 3 * 2 * 2
+    linhas = {(r['searcher'], r['problem']): r for r in resultado['summary']}
+    astar = linhas['astar_search', 'corredores']
+    assert astar['statuses'] == {busca.SearchResult.SOLVED: 2}
+    assert astar['path_cost'] == astar_search(problema_corredores).path_cost
+    assert astar['expansions'] > 0 and astar['peak_memory'] > 0
+    assert astar['time_min'] <= astar['time_mean'] <= astar['time_max']
+    assert linhas['busca_que_nao_termina', 'perto']['statuses'] == {busca.TIMEOUT: 2}
+    assert linhas['busca_que_falha', 'perto']['statuses'] == {busca.ERROR: 2}
+    assert "RuntimeError" in resultado['jobs'][-1]['error']
+
+    assert json.loads(relatorio.read_text()) == json.loads(json.dumps(resultado))
+    assert 'corredores' in capsys.readouterr().out
+
+def test_comparacao_paralela_recusa_nomes_repetidos(problema_corredores):
+    """Buscas ou problemas com o mesmo nome fundiriam linhas do resumo"""
+    with pytest.raises(ValueError, match='astar_search'):
+        busca.compare_searchers_parallel([problema_corredores], searchers=[astar_search, astar_search])
+    with pytest.raises(ValueError, match='corredores'):
+        busca.compare_searchers_parallel([problema_corredores, problema_corredores],
+                                         header=['Busca', 'corredores', 'corredores'],
+                                         searchers=[astar_search])
+
+# =============================================================================
+# TESTES DAS BUSCAS EM PROFUNDIDADE SEM RECURSÃO (DLS, RBFS, IDA*)
+# =============================================================================
+
+def test_rbfs_e_ida_em_caminhos_longos():
+    """RBFS e IDA* não recursivos vão além de sys.getrecursionlimit() passos"""
+    comprimento = sys.getrecursionlimit() + 500
+    corredor = ProblemaAlmoxarifado((0, 0, 0), set(), (comprimento, 0), (0, 0), comprimento + 1, 1)
+    for buscar in (busca.recursive_best_first_search, busca.ida_star_search):
+        no = buscar(corredor)
+        assert no.path_cost == comprimento and no.solution() == ['L'] * comprimento
+
+def test_rbfs_sem_solucao_termina():
+    """Sucessores da raiz sem saída (f infinito) encerram o RBFS com None"""
+    # Robô sobre a prateleira (1, 0): as duas células livres vizinhas são becos e
+    # o alvo (4, 0) só se alcança pela parede (3, 0)
+    sem_saida = ProblemaAlmoxarifado((1, 0, 0), {(1, 0), (3, 0), (4, 0)}, (4, 0), (0, 0), 5, 1)
+    assert busca.recursive_best_first_search(sem_saida) is None
+    limitado = busca.recursive_best_first_search(sem_saida, max_expansions=100)
+    assert limitado.status == busca.SearchResult.NO_PATH
+
+def test_busca_limitada_em_profundidade_iterativa(problema_corredores):
+    """Mesmos resultados da versão recursiva: 'cutoff' abaixo do custo ótimo, solução a partir dele"""
+    perto = ProblemaAlmoxarifado((0, 0, 0), problema_corredores.obstaculos, (0, 3), (0, 11), 12, 12)
+    assert busca.depth_limited_search(perto, 2) == 'cutoff'
+    no = busca.depth_limited_search(perto, 3)
+    assert no.solution() == ['S', 'S', 'S']
+    fechado = ProblemaAlmoxarifado((0, 0, 0), {(1, 0), (0, 1)}, (5, 5), (0, 0), 6, 6)
+    assert busca.depth_limited_search(fechado, 4) is None
+    assert busca.iterative_deepening_search(perto).solution() == ['S', 'S', 'S']
+
+def test_ida_com_tabela_limitada_continua_otimo(problema_corredores):
+    """A tabela de transposição só poupa trabalho: cheia ou não, o custo é o do A*"""
+    # Parede em x = 3 com passagem só embaixo: muitos caminhos equivalentes no desvio
+    desvio = ProblemaAlmoxarifado((0, 0, 0), {(3, y) for y in range(5)}, (5, 0), (0, 0), 6, 6)
+    otimo = astar_search(desvio).path_cost
+    com_tabela = busca.InstrumentedProblem(desvio)
+    assert busca.ida_star_search(com_tabela).path_cost == otimo
+    quase_sem_tabela = busca.InstrumentedProblem(desvio)
+    assert busca.ida_star_search(quase_sem_tabela, table_size=2).path_cost == otimo
+    assert com_tabela.succs < quase_sem_tabela.succs
+    fechado = ProblemaAlmoxarifado((0, 0, 0), {(1, 0), (0, 1)}, (5, 5), (0, 0), 6, 6)
+    assert busca.ida_star_search(fechado) is None
+    limitado = busca.ida_star_search(problema_corredores, max_expansions=10)
+    assert limitado.status == busca.SearchResult.BUDGET_EXHAUSTED